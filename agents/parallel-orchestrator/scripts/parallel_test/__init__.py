@@ -20,7 +20,7 @@ from .config import (
 from .hypothesis_manager import HypothesisManager
 from .worktree_orchestrator import WorktreeOrchestrator, WorktreeConfig
 from .test_executor import TestExecutor
-from .results_analyzer import ResultsAnalyzer
+from .results_analyzer import ResultsAnalyzer, IncrementalAnalysis
 from . import utils
 
 __version__ = "1.0.0"
@@ -36,5 +36,6 @@ __all__ = [
     "WorktreeConfig",
     "TestExecutor",
     "ResultsAnalyzer",
+    "IncrementalAnalysis",
     "utils"
 ]
@@ -4,67 +4,629 @@ Async Test Execution Module
 
 AsyncIO-based test executor for 30-40% performance improvement on I/O-bound operations.
 Maintains same public API as ThreadPoolExecutor version with async implementation.
+
+At most `max_concurrent_tests` tests run at once; the rest wait in a priority
+queue and start as soon as a slot frees: highest ranking score first, shortest
+estimated test time first among equal scores. Each result reports its queue
+wait in `metrics["queue_wait"]` and start position in `metrics["dispatch_rank"]`.
+
+Every test runs in its own session (process group). On timeout or
+cancellation the whole group gets SIGTERM, then SIGKILL after
+`kill_grace_period` seconds, and is waited for, so no test processes outlive
+their result. With early stopping enabled, outstanding tests are cancelled
+this way once their results cannot change ResultsAnalyzer's recommendation,
+and partial results are returned. The opt-in heuristic policies
+(early_stop_rank_cutoff, early_stop_after) may stop before that point; runs
+they cut short are flagged in `provisional`.
+
+Results can be consumed as they complete with `async for result in
+executor.stream(hypotheses, worktrees)` (or an `on_result` callback), e.g.
+to feed ResultsAnalyzer.incremental() during long runs.
+
+Test output is streamed to `.falsification/test_<id>.stdout.log` / `.stderr.log`
+in the worktree; results keep only a bounded head and tail of each stream in
+memory and reference the full logs by path.
+
+With `collect_resource_usage` enabled, tests are launched through
+rusage_runner.py, which reaps them with os.wait4(); each result's metrics then
+include cpu_user, cpu_system, max_rss_mb, io_read_blocks and io_write_blocks.
+
+Given a DurationModel, completed test durations are recorded per test command
+and predictions replace Hypothesis.estimated_test_time in scheduling and in
+should_parallelize (which also uses learned worktree overhead).
+
+Given a ResultCache, a test whose script, worktree HEAD, uncommitted changes
+and environment match a stored PASS/FAIL result is not run again; the stored
+result is returned with metrics["cache_hit"] set.
+
+With `batch_max_seconds` set, plan_batches() bin-packs short tests so several
+hypotheses share one worktree. Tests sharing a worktree never run at the same
+time, and before each test after the first one the worktree is reset (if
+dirty, keeping the .falsification harness files and materialized dependency
+environments such as .venv), so each test sees a clean tree; metrics["reset_paths"] reports paths restored. Callers running a batch
+through execute_single pass reset=True for every test after the first.
+
+The synchronous wrappers (execute_parallel, execute_single) submit to one
+persistent event loop running in a background thread instead of calling
+asyncio.run() per call, so repeated calls don't pay loop start-up and they
+also work when the caller is already inside a running event loop.
 """
 
 import asyncio
+import atexit
+import heapq
+import json
 import logging
+import os
+import signal
+import sqlite3
+import sys
+import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, AsyncIterator, BinaryIO, Callable, Coroutine, List, Dict, Optional, Sequence, Set, Tuple
 from .config import Hypothesis, TestResult, TestExecutionResult, FalsificationConfig
+from .env_cache import EnvironmentCache
+from .result_cache import ResultCache
+from .utils import pack_hypotheses
+
+# Use shared infrastructure
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.duration_model import DurationModel
+from shared.git_utils import reset_dirty_paths, GitOperationError
 
 logger = logging.getLogger(__name__)
 
+RUSAGE_RUNNER = Path(__file__).parent / "rusage_runner.py"
+
+# Harness files that survive resets between tests sharing a worktree
+HARNESS_DIR = ".falsification"
+
+
+class OutputCapture:
+    """
+    Streams one output pipe to a log file, keeping a bounded head and tail
+
+    Memory use is at most `limit` bytes regardless of how much the test
+    prints; text() marks where output was elided and points at the log.
+    """
+
+    def __init__(self, log_path: Path, limit: int):
+        """
+        Initialize capture
+
+        Args:
+            log_path: File receiving the full output
+            limit: Bytes kept in memory (split evenly between head and tail)
+        """
+        self.log_path = log_path
+        self.head_limit = limit // 2
+        self.tail_limit = limit - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total_bytes = 0
+        self._file: BinaryIO = open(log_path, "wb")
+
+    def feed(self, chunk: bytes) -> None:
+        """Append a chunk of output"""
+        self._file.write(chunk)
+        self.total_bytes += len(chunk)
+
+        if len(self.head) < self.head_limit:
+            take = self.head_limit - len(self.head)
+            self.head += chunk[:take]
+            chunk = chunk[take:]
+
+        if chunk and self.tail_limit:
+            self.tail += chunk
+            if len(self.tail) > self.tail_limit:
+                del self.tail[:len(self.tail) - self.tail_limit]
+
+    async def pump(self, stream: asyncio.StreamReader, chunk_size: int = 65536) -> None:
+        """Read a pipe until EOF"""
+        while True:
+            chunk = await stream.read(chunk_size)
+            if not chunk:
+                break
+            self.feed(chunk)
+
+    def close(self) -> None:
+        """Flush and close the log file"""
+        if not self._file.closed:
+            self._file.close()
+
+    def text(self) -> str:
+        """Captured output, with a marker where the middle was dropped"""
+        elided = self.total_bytes - len(self.head) - len(self.tail)
+        if elided <= 0:
+            return (bytes(self.head) + bytes(self.tail)).decode("utf-8", errors="replace")
+        return (
+            self.head.decode("utf-8", errors="replace") +
+            f"\n... [{elided} bytes omitted, full log: {self.log_path}] ...\n" +
+            self.tail.decode("utf-8", errors="replace")
+        )
+
+
+class BackgroundLoop:
+    """
+    Event loop running forever in a daemon thread
+
+    One instance is shared by all executors in the process (see get()), so
+    synchronous callers reuse the same loop. The loop is stopped at exit.
+    """
+
+    _instance: Optional["BackgroundLoop"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        """Create the loop and start its thread"""
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self._run, name="async-test-executor-loop", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self) -> None:
+        """Thread body: run the loop until stop() is called"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @classmethod
+    def get(cls) -> "BackgroundLoop":
+        """
+        Get the process-wide loop, starting it on first use
+
+        Returns:
+            Running BackgroundLoop
+        """
+        with cls._instance_lock:
+            if cls._instance is None or not cls._instance.thread.is_alive():
+                cls._instance = cls()
+                atexit.register(cls._instance.stop)
+            return cls._instance
+
+    def run(self, coro: Coroutine) -> Any:
+        """
+        Run a coroutine on the loop and block until it finishes
+
+        If the caller is interrupted (e.g. KeyboardInterrupt), the coroutine
+        is cancelled, which kills any running test process groups.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the loop's own thread (would deadlock)
+        """
+        if threading.current_thread() is self.thread:
+            coro.close()
+            raise RuntimeError("Synchronous executor API called from its event loop; await the async API")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the loop and wait for its thread
+
+        Args:
+            timeout: Maximum seconds to wait for the thread
+        """
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+        if not self.thread.is_alive():
+            self.loop.close()
+
 
 class AsyncTestExecutor:
     """Executes tests in parallel worktrees using AsyncIO"""
 
-    def __init__(self, config: Optional[FalsificationConfig] = None):
+    def __init__(
+        self,
+        config: Optional[FalsificationConfig] = None,
+        duration_model: Optional[DurationModel] = None,
+        result_cache: Optional[ResultCache] = None,
+        env_dirs: Sequence[str] = EnvironmentCache.DEFAULT_ENV_DIRS
+    ):
         """
         Initialize async test executor
 
         Args:
             config: Optional FalsificationConfig instance
+            duration_model: Optional learned durations (records and predicts
+                test times; without it estimated_test_time is used)
+            result_cache: Optional cache of results for unchanged tests
+                (None disables caching)
+            env_dirs: Dependency environment directories materialized into
+                worktrees; kept when a shared worktree is reset between tests
         """
         self.config = config or FalsificationConfig()
+        self.duration_model = duration_model
+        self.result_cache = result_cache
+        self.reset_keep = (HARNESS_DIR,) + tuple(env_dirs)
         self.timeout_seconds = self.config.test_timeout
         self.min_parallel_time = self.config.min_parallel_time
+        self.max_concurrent = max(1, self.config.max_concurrent_tests)
+        self.output_limit = self.config.output_buffer_bytes
+        self.kill_grace_period = self.config.kill_grace_period
+        self.collect_resource_usage = self.config.collect_resource_usage
+        self.early_stop = self.config.early_stop
+        self.early_stop_rank_cutoff = self.config.early_stop_rank_cutoff
+        self.early_stop_after = self.config.early_stop_after
+        self.batch_max_seconds = self.config.batch_max_seconds
+
+        # Outcome of the last execute_parallel_async run
+        self.early_stop_reason: Optional[str] = None
+        self.cancelled_ids: List[str] = []
+        # True if a heuristic policy stopped it while the recommendation could still change
+        self.provisional = False
 
     async def execute_parallel_async(
-        self, hypotheses: List[Hypothesis], worktrees: Dict[str, Path]
+        self,
+        hypotheses: List[Hypothesis],
+        worktrees: Dict[str, Path],
+        on_result: Optional[Callable[[TestExecutionResult], None]] = None
     ) -> List[TestExecutionResult]:
         """
         Execute tests in parallel across worktrees using asyncio (FR3.1)
 
+        Collects stream() into a list; see stream() for scheduling and early
+        stopping.
+
         Args:
             hypotheses: List of hypotheses to test
             worktrees: Mapping of hypothesis_id -> worktree_path
+            on_result: Optional callback invoked with each result as it arrives
 
         Returns:
-            List of test results
+            List of test results (in completion order)
         """
-        logger.info(f"Starting async parallel execution of {len(hypotheses)} tests")
+        results = []
+        async for result in self.stream(hypotheses, worktrees):
+            if on_result:
+                on_result(result)
+            results.append(result)
+        return results
+
+    async def stream(
+        self, hypotheses: List[Hypothesis], worktrees: Dict[str, Path]
+    ) -> AsyncIterator[TestExecutionResult]:
+        """
+        Execute tests in parallel, yielding each result as it completes
+
+        max_concurrent workers pull hypotheses from a priority queue (see
+        _dispatch_key), so the most valuable, quickest tests start first and
+        the next test starts as soon as a worker frees. The timeout covers
+        only the run itself, not time spent queued. Hypotheses mapped to the
+        same worktree (see plan_batches) run one after another: a worker
+        takes the best queued test whose worktree is idle, waiting for a
+        worktree to free up if none is.
+
+        If the early-stop policy fires (see _early_stop_reason), queued tests
+        are dropped and running ones are cancelled; their ids are recorded
+        in cancelled_ids (and provisional is set if the stop was heuristic)
+        and only completed results are yielded. Leaving the
+        `async for` early cancels all outstanding tests.
+
+        Usage:
+            async for result in executor.stream(hypotheses, worktrees):
+                analysis.add(result)
+
+        Args:
+            hypotheses: List of hypotheses to test
+            worktrees: Mapping of hypothesis_id -> worktree_path
+
+        Yields:
+            Test results in completion order
+        """
+        logger.info(
+            f"Starting async parallel execution of {len(hypotheses)} tests "
+            f"(max {self.max_concurrent} concurrent)"
+        )
+
+        # Keys are computed once, off the event loop: predictions query the
+        # duration model's database
+        keys = await asyncio.to_thread(
+            lambda: {hyp.id: self._dispatch_key(hyp) for hyp in hypotheses}
+        )
+        queue = [(keys[hyp.id], index, hyp) for index, hyp in enumerate(hypotheses)]
+        heapq.heapify(queue)
+
+        results: List[TestExecutionResult] = []
+        completed: asyncio.Queue = asyncio.Queue()
+        running: Dict[str, Hypothesis] = {}
+        queued_at = time.monotonic()
+        dispatched = 0
+        # Worktrees that already ran a test in this run (reset before reuse)
+        tested: Set[Path] = set()
+        # Set whenever a test finishes and frees its worktree
+        worktree_freed = asyncio.Event()
+        self.early_stop_reason = None
+        self.cancelled_ids = []
+        self.provisional = False
+
+        def next_idle() -> Optional[Hypothesis]:
+            # Best queued test whose worktree no running test is using
+            busy = {worktrees[h.id] for h in running.values()}
+            skipped = []
+            hyp = None
+            while queue:
+                item = heapq.heappop(queue)
+                if worktrees[item[2].id] in busy:
+                    skipped.append(item)
+                    continue
+                hyp = item[2]
+                break
+            for item in skipped:
+                heapq.heappush(queue, item)
+            return hyp
+
+        async def worker() -> None:
+            nonlocal dispatched
+            while queue and self.early_stop_reason is None:
+                # Cleared before looking so a release can't slip past the wait
+                worktree_freed.clear()
+                hyp = next_idle()
+                if hyp is None:
+                    # Every queued test's worktree is busy: wait for one
+                    await worktree_freed.wait()
+                    continue
+                rank = dispatched
+                dispatched += 1
+                queue_wait = time.monotonic() - queued_at
+                running[hyp.id] = hyp
+                worktree = worktrees[hyp.id]
+                reset = worktree in tested
+                tested.add(worktree)
+                try:
+                    result = await self._execute_with_timeout(hyp, worktree, reset=reset)
+                except Exception as e:
+                    logger.error(f"Unexpected error in async execution: {e}")
+                    continue
+                finally:
+                    running.pop(hyp.id, None)
+                    worktree_freed.set()
+                result.metrics["queue_wait"] = round(queue_wait, 3)
+                result.metrics["dispatch_rank"] = rank
+                results.append(result)
+                completed.put_nowait(result)
+
+                outstanding = list(running.values()) + [item[2] for item in queue]
+                reason = self._early_stop_reason(results, keys, outstanding)
+                if reason and outstanding:
+                    self.early_stop_reason = reason
+                    self.cancelled_ids = [h.id for h in outstanding]
+                    self.provisional = not self._outcome_settled(results)
+                    queue.clear()
+                    for task in tasks:
+                        if task is not asyncio.current_task():
+                            task.cancel()
 
-        # Create tasks for all hypotheses
         tasks = [
-            self._execute_with_timeout(hyp, worktrees[hyp.id]) for hyp in hypotheses
+            asyncio.ensure_future(worker())
+            for _ in range(min(self.max_concurrent, len(queue)))
         ]
+        # None marks the end of the stream once every worker has finished
+        workers_done = asyncio.ensure_future(asyncio.gather(*tasks, return_exceptions=True))
+        workers_done.add_done_callback(lambda _: completed.put_nowait(None))
 
-        # Use asyncio.as_completed for processing results as they finish
-        results = []
-        for coro in asyncio.as_completed(tasks):
-            try:
-                result = await coro
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Unexpected error in async execution: {e}")
-                # Error already handled in _execute_with_timeout
+        try:
+            while True:
+                result = await completed.get()
+                if result is None:
+                    break
+                yield result
+        finally:
+            # Consumer stopped early: don't leave tests running
+            for task in tasks:
+                task.cancel()
+            await workers_done
 
-        logger.info(f"Completed async parallel execution: {len(results)} results")
-        return results
+        if self.early_stop_reason:
+            logger.info(
+                f"Early stop ({self.early_stop_reason}): cancelled {len(self.cancelled_ids)} test(s)"
+            )
+            if self.provisional:
+                logger.warning(
+                    "Early stop was heuristic: the cancelled tests could still change the recommendation"
+                )
+
+        max_wait = max((r.metrics.get("queue_wait", 0.0) for r in results), default=0.0)
+        logger.info(
+            f"Completed async parallel execution: {len(results)} results "
+            f"(max queue wait {max_wait:.1f}s)"
+        )
+
+    def _early_stop_reason(
+        self,
+        results: List[TestExecutionResult],
+        keys: Dict[str, Tuple[float, float]],
+        outstanding: List[Hypothesis]
+    ) -> Optional[str]:
+        """
+        Decide whether the remaining tests can be cancelled
+
+        Policies:
+            - early_stop: the outcome is settled (see _outcome_settled), so
+              no outstanding result can change the recommendation
+            - early_stop_rank_cutoff (heuristic): exactly one hypothesis is
+              SUPPORTED (test FAIL), every other finished test FALSIFIED it,
+              and every outstanding hypothesis ranks below it. A lower-ranked
+              hypothesis could still be supported, so the run is provisional
+            - early_stop_after=K (heuristic): K decisive (PASS/FAIL) results
+              are in
+
+        Args:
+            results: Results so far
+            keys: Dispatch keys (see _dispatch_key) of the run by hypothesis id
+            outstanding: Hypotheses still queued or running
+
+        Returns:
+            Reason string, or None to keep going
+        """
+        decisive = [r for r in results if r.result in (TestResult.PASS, TestResult.FAIL)]
+        if self.early_stop_after and len(decisive) >= self.early_stop_after:
+            return f"{len(decisive)} decisive results"
+
+        supported = [r for r in results if r.result == TestResult.FAIL]
+        if self.early_stop and self._outcome_settled(results):
+            return f"{len(supported)} hypotheses supported: refine hypotheses"
+
+        if not self.early_stop_rank_cutoff:
+            return None
+
+        if len(supported) != 1 or len(decisive) != len(results):
+            return None
+
+        leader = keys[supported[0].hypothesis_id][0]
+        if all(keys[hyp.id][0] > leader for hyp in outstanding):
+            return f"root cause isolated: {supported[0].hypothesis_id}"
+        return None
+
+    @staticmethod
+    def _outcome_settled(results: List[TestExecutionResult]) -> bool:
+        """
+        Whether further results can no longer change the recommendation
+
+        Mirrors ResultsAnalyzer._determine_next_action, which depends only
+        on the number of SUPPORTED hypotheses: once two are supported the
+        action is to refine hypotheses whatever the outstanding tests show.
+        With fewer, any outstanding hypothesis could still be supported.
+
+        Args:
+            results: Results so far
+
+        Returns:
+            True if outstanding tests cannot change the outcome
+        """
+        return sum(1 for r in results if r.result == TestResult.FAIL) >= 2
+
+    def _dispatch_key(self, hypothesis: Hypothesis) -> Tuple[float, float]:
+        """
+        Priority queue key for a hypothesis (smaller starts first)
+
+        Priority is confidence_score from HypothesisManager.rank_hypotheses,
+        or the ranking score with the configured weights if not ranked yet.
+        Among equal priorities (3 decimals) the shortest expected test goes
+        first, minimising time to the first decisive result.
+
+        Args:
+            hypothesis: Hypothesis to schedule
+
+        Returns:
+            (negated priority, predicted test time) tuple
+        """
+        priority = hypothesis.confidence_score
+        if priority is None:
+            priority = hypothesis.ranking_score({
+                "probability": self.config.probability_weight,
+                "impact": self.config.impact_weight,
+                "complexity": self.config.complexity_weight
+            })
+        return (-round(priority, 3), self.predict_test_time(hypothesis))
+
+    @staticmethod
+    def _command_key(hypothesis: Hypothesis) -> str:
+        """Duration model key: the test command, or the id if there is none"""
+        return DurationModel.command_key(hypothesis.test_strategy or f"hypothesis:{hypothesis.id}")
+
+    def predict_test_time(self, hypothesis: Hypothesis) -> float:
+        """
+        Expected test time for a hypothesis
+
+        Args:
+            hypothesis: Hypothesis to estimate
+
+        Returns:
+            Learned median duration of its test command, falling back to
+            estimated_test_time when unobserved or without a duration model
+        """
+        if self.duration_model is None:
+            return hypothesis.estimated_test_time
+        return self.duration_model.predict_test_time(
+            self._command_key(hypothesis), default=hypothesis.estimated_test_time
+        )
+
+    def _record_duration(self, hypothesis: Hypothesis, result: TestExecutionResult) -> None:
+        """
+        Record a completed test's duration in the duration model
+
+        Only PASS/FAIL results are recorded: timeouts and errors do not
+        reflect how long the test really takes.
+
+        Args:
+            hypothesis: Hypothesis that was tested
+            result: Its execution result
+        """
+        if self.duration_model is None or result.result not in (TestResult.PASS, TestResult.FAIL):
+            return
+        try:
+            self.duration_model.record_test(
+                self._command_key(hypothesis), result.duration, result.result.value
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not record duration for {hypothesis.id}: {e}")
+
+    def _result_cache_key(self, hypothesis: Hypothesis, worktree: Path) -> Optional[str]:
+        """
+        Cache key for a hypothesis test (None if it cannot be cached)
+
+        Computed before the test runs, since tests may modify the worktree.
+
+        Args:
+            hypothesis: Hypothesis to test
+            worktree: Path to worktree
+
+        Returns:
+            Key from ResultCache.cache_key, or None
+        """
+        test_script = worktree / ".falsification" / f"test_{hypothesis.id}.sh"
+        if self.result_cache is None or not test_script.exists():
+            return None
+        try:
+            return self.result_cache.cache_key(worktree, test_script)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Result cache unavailable for {hypothesis.id}: {e}")
+            return None
+
+    def _cached_result(
+        self, hypothesis: Hypothesis, worktree: Path, key: str
+    ) -> Optional[TestExecutionResult]:
+        """
+        Look up a stored result for a hypothesis
+
+        Args:
+            hypothesis: Hypothesis to test
+            worktree: Path to worktree
+            key: Key from _result_cache_key
+
+        Returns:
+            Cached result re-labelled for this hypothesis and worktree, or None
+        """
+        try:
+            result = self.result_cache.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache lookup failed for {hypothesis.id}: {e}")
+            return None
+        if result is None:
+            return None
+
+        result.hypothesis_id = hypothesis.id
+        result.worktree_path = str(worktree)
+        logger.info(f"Cache hit for {hypothesis.id}: {result.result.value} (skipped test)")
+        return result
 
     async def _execute_with_timeout(
-        self, hypothesis: Hypothesis, worktree: Path
+        self, hypothesis: Hypothesis, worktree: Path, reset: bool = False
     ) -> TestExecutionResult:
         """
         Execute single test with timeout enforcement
@@ -72,27 +634,49 @@ class AsyncTestExecutor:
         Args:
             hypothesis: Hypothesis to test
             worktree: Path to worktree
+            reset: Undo changes left by an earlier test in the same worktree
 
         Returns:
             TestExecutionResult with outcome
         """
+        reset_paths = await asyncio.to_thread(self._reset_shared_worktree, worktree) if reset else 0
+
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = await asyncio.to_thread(self._result_cache_key, hypothesis, worktree)
+            cached = self._cached_result(hypothesis, worktree, cache_key) if cache_key else None
+            if cached:
+                return cached
+
         try:
             # Use asyncio.wait_for for timeout enforcement
             result = await asyncio.wait_for(
                 self.execute_single_async(hypothesis, worktree),
                 timeout=self.timeout_seconds,
             )
+            if reset_paths:
+                result.metrics["reset_paths"] = reset_paths
+            self._record_duration(hypothesis, result)
+            if cache_key:
+                try:
+                    self.result_cache.put(cache_key, result)
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not cache result for {hypothesis.id}: {e}")
             return result
         except asyncio.TimeoutError:
             logger.warning(
                 f"Async execution timed out after {self.timeout_seconds}s: {hypothesis.id}"
             )
+            stdout_log, stderr_log = self._log_paths(hypothesis, worktree)
             return TestExecutionResult(
                 hypothesis_id=hypothesis.id,
                 result=TestResult.TIMEOUT,
                 duration=self.timeout_seconds,
                 error_message=f"Test exceeded {self.timeout_seconds}s timeout",
                 exit_code=124,
+                worktree_path=str(worktree),
+                stdout_log=str(stdout_log) if stdout_log.exists() else "",
+                stderr_log=str(stderr_log) if stderr_log.exists() else "",
             )
         except Exception as e:
             logger.error(f"Async test execution error for {hypothesis.id}: {e}")
@@ -104,13 +688,94 @@ class AsyncTestExecutor:
                 exit_code=1,
             )
 
+    def _reset_shared_worktree(self, worktree: Path) -> int:
+        """
+        Undo changes an earlier batched test left in a shared worktree
+
+        Only paths that differ from HEAD are touched; harness files and
+        materialized environments (which git reports as untracked) are kept.
+
+        Args:
+            worktree: Path to worktree about to run its next test
+
+        Returns:
+            Number of paths restored or removed
+        """
+        try:
+            restored = reset_dirty_paths(worktree, keep=self.reset_keep)
+        except GitOperationError as e:
+            logger.warning(f"Could not reset {worktree} between tests: {e}")
+            return 0
+        if restored:
+            logger.info(f"Reset {restored} path(s) in {worktree} left by the previous test")
+        return restored
+
+    def plan_batches(self, hypotheses: List[Hypothesis]) -> List[List[Hypothesis]]:
+        """
+        Group hypotheses into batches that share one worktree
+
+        Short tests are bin-packed (first-fit decreasing on predicted test
+        time) into batches of at most batch_max_seconds; hypotheses that
+        mutate their worktree or exceed the budget run alone. With
+        batch_max_seconds=0 every hypothesis gets its own batch.
+
+        Args:
+            hypotheses: Hypotheses to test
+
+        Returns:
+            List of batches (each a list of hypotheses)
+        """
+        batches = pack_hypotheses(hypotheses, self.batch_max_seconds, self.predict_test_time)
+        if len(batches) < len(hypotheses):
+            logger.info(
+                f"Packed {len(hypotheses)} hypotheses into {len(batches)} worktrees "
+                f"(<= {self.batch_max_seconds:.0f}s of tests each)"
+            )
+        return batches
+
+    def _log_paths(self, hypothesis: Hypothesis, worktree: Path) -> Tuple[Path, Path]:
+        """
+        Full-output log files for a hypothesis
+
+        Args:
+            hypothesis: Hypothesis being tested
+            worktree: Path to worktree
+
+        Returns:
+            (stdout_log, stderr_log) paths in the worktree's .falsification/
+        """
+        log_dir = worktree / ".falsification"
+        return (
+            log_dir / f"test_{hypothesis.id}.stdout.log",
+            log_dir / f"test_{hypothesis.id}.stderr.log",
+        )
+
+    def _read_resource_usage(self, rusage_path: Path) -> Dict:
+        """
+        Read metrics written by rusage_runner.py
+
+        Args:
+            rusage_path: JSON file written by the runner
+
+        Returns:
+            Resource metrics, or empty dict if unavailable
+        """
+        try:
+            with open(rusage_path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"No resource usage at {rusage_path}: {e}")
+            return {}
+
     async def execute_single_async(
         self, hypothesis: Hypothesis, worktree: Path
     ) -> TestExecutionResult:
         """
         Execute test for single hypothesis asynchronously (FR3.2)
 
-        Uses asyncio.create_subprocess_exec for non-blocking subprocess execution
+        Uses asyncio.create_subprocess_exec for non-blocking subprocess execution.
+        Both pipes are streamed to log files as the test runs; only a bounded
+        head/tail (output_buffer_bytes per stream) is kept in the result.
 
         Args:
             hypothesis: Hypothesis to test
@@ -136,29 +801,61 @@ class AsyncTestExecutor:
                 exit_code=1,
             )
 
+        stdout_log, stderr_log = self._log_paths(hypothesis, worktree)
+        stdout_capture = stderr_capture = None
+
+        command = [str(test_script)]
+        rusage_path = worktree / ".falsification" / f"test_{hypothesis.id}.rusage.json"
+        if self.collect_resource_usage:
+            rusage_path.unlink(missing_ok=True)
+            command = [sys.executable, "-S", str(RUSAGE_RUNNER), str(rusage_path)] + command
+
         try:
-            # Create async subprocess
+            stdout_capture = OutputCapture(stdout_log, self.output_limit)
+            stderr_capture = OutputCapture(stderr_log, self.output_limit)
+
+            # Create async subprocess in its own process group so the whole
+            # test tree can be killed on cancellation
             process = await asyncio.create_subprocess_exec(
-                str(test_script),
+                *command,
                 cwd=str(worktree),
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
             )
 
-            # Wait for process to complete (timeout handled by _execute_with_timeout)
-            stdout, stderr = await process.communicate()
+            # Stream output until exit (timeout handled by _execute_with_timeout)
+            try:
+                await asyncio.gather(
+                    stdout_capture.pump(process.stdout),
+                    stderr_capture.pump(process.stderr),
+                    process.wait(),
+                )
+            except asyncio.CancelledError:
+                # Timeout or early stop: don't leave the test running
+                await self._kill_process_group(process)
+                raise
 
             duration = time.time() - start_time
             exit_code = process.returncode
 
-            # Decode output
-            stdout_text = stdout.decode("utf-8", errors="replace")
-            stderr_text = stderr.decode("utf-8", errors="replace")
+            stdout_capture.close()
+            stderr_capture.close()
+            stdout_text = stdout_capture.text()
+            stderr_text = stderr_capture.text()
 
             # Classify result
             result_type = self._classify_test_result(exit_code)
             confidence = self._calculate_confidence(result_type, duration)
 
+            metrics = {
+                "confidence": confidence,
+                "stdout_bytes": stdout_capture.total_bytes,
+                "stderr_bytes": stderr_capture.total_bytes,
+            }
+            if self.collect_resource_usage:
+                metrics.update(self._read_resource_usage(rusage_path))
+
             logger.info(
                 f"Async test {hypothesis.id} completed: {result_type.value} "
                 f"(exit_code={exit_code}, duration={duration:.1f}s)"
@@ -172,7 +869,9 @@ class AsyncTestExecutor:
                 stderr=stderr_text,
                 exit_code=exit_code,
                 worktree_path=str(worktree),
-                metrics={"confidence": confidence},
+                metrics=metrics,
+                stdout_log=str(stdout_log),
+                stderr_log=str(stderr_log),
             )
 
         except Exception as e:
@@ -187,19 +886,99 @@ class AsyncTestExecutor:
                 worktree_path=str(worktree),
             )
 
-    def should_parallelize(self, hypotheses: List[Hypothesis]) -> bool:
+        finally:
+            for capture in (stdout_capture, stderr_capture):
+                if capture:
+                    capture.close()
+
+    @staticmethod
+    def _group_alive(pgid: int) -> bool:
+        """Check whether any process remains in a process group"""
+        try:
+            os.killpg(pgid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    async def _wait_group_exit(self, pgid: int, timeout: float) -> bool:
+        """
+        Wait for every process in a group to exit
+
+        Args:
+            pgid: Process group ID
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the group is gone
+        """
+        deadline = time.monotonic() + timeout
+        while self._group_alive(pgid):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def _kill_process_group(self, process: asyncio.subprocess.Process) -> None:
+        """
+        Terminate a test's whole process group and reap it
+
+        Sends SIGTERM to the group, escalates to SIGKILL for anything still
+        alive after kill_grace_period, and waits for the group to exit. The
+        group is signalled even if the test script itself already exited,
+        since its background children may still be running.
+
+        Args:
+            process: Test subprocess (session leader of its group)
+        """
+        pgid = process.pid
+        try:
+            os.killpg(pgid, signal.SIGTERM)
+        except ProcessLookupError:
+            await process.wait()
+            return
+
+        # Reap the leader first so it doesn't linger as a zombie in the group
+        try:
+            await asyncio.wait_for(process.wait(), timeout=self.kill_grace_period)
+        except asyncio.TimeoutError:
+            pass
+
+        if await self._wait_group_exit(pgid, max(0.0, self.kill_grace_period)):
+            logger.debug(f"Terminated process group {pgid}")
+            return
+
+        logger.warning(f"Process group {pgid} ignored SIGTERM, sending SIGKILL")
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await process.wait()
+        await self._wait_group_exit(pgid, 1.0)
+
+    def should_parallelize(self, hypotheses: List[Hypothesis], pool_state: str = "cold") -> bool:
         """
         Determine if parallelization is worth overhead (FR3.3)
 
         Uses break-even analysis:
             sequential_time = sum(all test times)
-            parallel_time = max(test time) + overhead
-            overhead = 7s base + 16s per worktree (creation + setup + cleanup)
+            parallel_time = max(batch time) + overhead
+            overhead = 7s base + per-worktree overhead * worktrees
+
+        Without batching every hypothesis is its own batch; with
+        batch_max_seconds the batches (and worktree count) come from
+        plan_batches(), so packing short tests cuts the overhead.
+
+        Test times and per-worktree overhead (acquire + setup + release)
+        come from the duration model when one is set; otherwise the
+        estimated_test_time values and 16s per worktree are used.
 
         Only parallelize if: sequential_time > parallel_time
 
         Args:
             hypotheses: List of hypotheses to evaluate
+            pool_state: "warm" if worktrees come from a ready pool, else "cold"
 
         Returns:
             True if should parallelize
@@ -209,14 +988,18 @@ class AsyncTestExecutor:
             return False
 
         # Calculate sequential time (sum of all test times)
-        test_times = [h.estimated_test_time for h in hypotheses]
-        sequential_time = sum(test_times)
+        test_times = {h.id: self.predict_test_time(h) for h in hypotheses}
+        sequential_time = sum(test_times.values())
+        batches = self.plan_batches(hypotheses)
 
         # Calculate parallel time (max test time + overhead)
-        # Overhead: 7s base + 16s per worktree (8s create + 5s setup + 3s cleanup)
-        n = len(hypotheses)
-        overhead = 7 + (16 * n)
-        parallel_time = max(test_times) + overhead
+        if self.duration_model is not None:
+            per_worktree = self.duration_model.predict_worktree_overhead(pool_state)
+        else:
+            per_worktree = sum(DurationModel.DEFAULT_PHASE_OVERHEAD.values())
+        n = len(batches)
+        overhead = DurationModel.BASE_OVERHEAD + (per_worktree * n)
+        parallel_time = max(sum(test_times[h.id] for h in batch) for batch in batches) + overhead
 
         # Break-even analysis
         time_saved = sequential_time - parallel_time
@@ -224,13 +1007,15 @@ class AsyncTestExecutor:
         if time_saved <= 0:
             logger.info(
                 f"Not parallelizing: no time savings "
-                f"(sequential={sequential_time}s, parallel={parallel_time}s, overhead={overhead}s)"
+                f"(sequential={sequential_time:.0f}s, parallel={parallel_time:.0f}s, "
+                f"overhead={overhead:.0f}s, worktrees={n}, pool={pool_state})"
             )
             return False
 
         logger.info(
             f"Parallelizing: saves {time_saved:.0f}s "
-            f"(sequential={sequential_time}s → parallel={parallel_time}s)"
+            f"(sequential={sequential_time:.0f}s → parallel={parallel_time:.0f}s, "
+            f"worktrees={n}, pool={pool_state})"
         )
         return True
 
@@ -283,36 +1068,46 @@ class AsyncTestExecutor:
 
     # Synchronous wrapper methods for backwards compatibility
     def execute_parallel(
-        self, hypotheses: List[Hypothesis], worktrees: Dict[str, Path]
+        self,
+        hypotheses: List[Hypothesis],
+        worktrees: Dict[str, Path],
+        on_result: Optional[Callable[[TestExecutionResult], None]] = None
     ) -> List[TestExecutionResult]:
         """
         Synchronous wrapper for execute_parallel_async
 
-        Maintains backwards compatibility with ThreadPoolExecutor API
+        Maintains backwards compatibility with ThreadPoolExecutor API. Runs on
+        the shared background loop, so it is safe to call from inside a
+        running event loop (it blocks the caller until tests finish).
 
         Args:
             hypotheses: List of hypotheses to test
             worktrees: Mapping of hypothesis_id -> worktree_path
+            on_result: Optional callback invoked with each result as it
+                arrives (called on the background loop thread)
 
         Returns:
             List of test results
         """
-        return asyncio.run(self.execute_parallel_async(hypotheses, worktrees))
+        return BackgroundLoop.get().run(self.execute_parallel_async(hypotheses, worktrees, on_result))
 
     def execute_single(
-        self, hypothesis: Hypothesis, worktree: Path
+        self, hypothesis: Hypothesis, worktree: Path, reset: bool = False
     ) -> TestExecutionResult:
         """
         Synchronous wrapper for execute_single_async with timeout enforcement
 
-        Maintains backwards compatibility with subprocess.run API
+        Maintains backwards compatibility with subprocess.run API. Runs on the
+        shared background loop (no per-call loop start-up).
 
         Args:
             hypothesis: Hypothesis to test
             worktree: Path to worktree
+            reset: Undo changes left by an earlier test in the same worktree
+                (set for every test after the first in a shared worktree)
 
         Returns:
             TestExecutionResult with outcome
         """
         # Use _execute_with_timeout to enforce timeout (not execute_single_async directly)
-        return asyncio.run(self._execute_with_timeout(hypothesis, worktree))
+        return BackgroundLoop.get().run(self._execute_with_timeout(hypothesis, worktree, reset=reset))
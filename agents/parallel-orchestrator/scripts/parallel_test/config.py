@@ -57,6 +57,8 @@ class Hypothesis:
     test_results: Optional[Dict] = None
     confidence_score: Optional[float] = None
     dependencies: List[str] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)  # Repo paths the test needs (sparse checkout)
+    mutates_worktree: bool = False  # Test changes tracked files (never shares a worktree)
 
     def is_falsifiable(self) -> bool:
         """Check if hypothesis can be empirically tested"""
@@ -91,6 +93,8 @@ class TestExecutionResult:
     worktree_path: str = ""
     error_message: str = ""
     metrics: Dict = field(default_factory=dict)
+    stdout_log: str = ""  # Full stdout (stdout holds a bounded head/tail)
+    stderr_log: str = ""  # Full stderr (stderr holds a bounded head/tail)
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
@@ -103,7 +107,9 @@ class TestExecutionResult:
             "exit_code": self.exit_code,
             "worktree_path": self.worktree_path,
             "error_message": self.error_message,
-            "metrics": self.metrics
+            "metrics": self.metrics,
+            "stdout_log": self.stdout_log,
+            "stderr_log": self.stderr_log
         }
 
 
@@ -120,6 +126,8 @@ class FalsificationReport:
     next_steps: List[str] = field(default_factory=list)
     confidence: float = 0.0
     test_results: List[TestExecutionResult] = field(default_factory=list)
+    resource_usage: Dict = field(default_factory=dict)
+    provisional: bool = False  # Untested hypotheses could still change the recommendation
 
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
@@ -132,7 +140,9 @@ class FalsificationReport:
             "inconclusive": len(self.inconclusive),
             "recommended_action": self.recommended_action,
             "next_steps": self.next_steps,
-            "confidence": self.confidence
+            "confidence": self.confidence,
+            "resource_usage": self.resource_usage,
+            "provisional": self.provisional
         }
 
 
@@ -160,6 +170,13 @@ class FalsificationConfig:
     min_parallel_time: int = 60
     test_command: str = "pytest"
     max_concurrent_tests: int = 5
+    early_stop: bool = False  # Cancel remaining tests once they cannot change the recommendation
+    early_stop_rank_cutoff: bool = False  # Heuristic: cancel tests ranked below a lone supported hypothesis
+    early_stop_after: int = 0  # Cancel remaining tests after K decisive results (0 = off)
+    output_buffer_bytes: int = 64 * 1024  # In-memory head+tail kept per output stream
+    kill_grace_period: float = 5.0  # Seconds between SIGTERM and SIGKILL on timeout
+    collect_resource_usage: bool = True  # Record CPU/RSS/block I/O per test via wait4()
+    batch_max_seconds: float = 0.0  # Pack short tests into shared worktrees up to this time (0 = off)
 
     # Overhead Timings (seconds)
     worktree_creation_time: float = 8.0
@@ -224,6 +241,14 @@ class FalsificationConfig:
             flat_config.update({
                 "test_timeout": test_cfg.get("default_timeout", 300),
                 "min_parallel_time": test_cfg.get("min_parallel_time", 60),
+                "max_concurrent_tests": test_cfg.get("max_concurrent_tests", 5),
+                "early_stop": test_cfg.get("early_stop", False),
+                "early_stop_rank_cutoff": test_cfg.get("early_stop_rank_cutoff", False),
+                "early_stop_after": test_cfg.get("early_stop_after", 0),
+                "output_buffer_bytes": test_cfg.get("output_buffer_bytes", 64 * 1024),
+                "kill_grace_period": test_cfg.get("kill_grace_period", 5.0),
+                "collect_resource_usage": test_cfg.get("collect_resource_usage", True),
+                "batch_max_seconds": test_cfg.get("batch_max_seconds", 0.0),
             })
             if "overhead" in test_cfg:
                 flat_config.update({
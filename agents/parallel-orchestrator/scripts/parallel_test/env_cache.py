@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Dependency Environment Cache Module
+
+Shares installed dependency environments (.venv, node_modules, ...) between
+worktrees. Environments are built once per lockfile hash into a cache
+directory and then materialized into each worktree by symlink (constant
+time), reflink or hardlink, instead of reinstalling per worktree.
+
+Performance:
+    - Cold cache: one install per distinct lockfile set
+    - Warm cache (symlink): a few filesystem calls per worktree
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+# Use shared subprocess utilities
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.subprocess_utils import run_command
+
+logger = logging.getLogger(__name__)
+
+
+class EnvironmentCacheError(Exception):
+    """Raised when a cached environment cannot be built or materialized"""
+    pass
+
+
+class EnvironmentCache:
+    """
+    Cache of dependency environments keyed by lockfile hash.
+
+    Each cache entry lives in `cache_dir/<hash>/` and holds the environment
+    directories produced by `setup_command`, which runs once in that entry
+    directory (next to copies of the lockfiles). Builds are serialized per
+    entry with a file lock, so concurrent processes never build the same
+    environment twice.
+
+    Usage:
+        cache = EnvironmentCache(
+            cache_dir,
+            setup_command="python -m venv .venv && .venv/bin/pip install -r requirements.txt"
+        )
+        cache.prepare(worktree_path)  # builds on miss, links on hit
+    """
+
+    LOCKFILE_PATTERNS = (
+        "requirements*.txt",
+        "pyproject.toml",
+        "poetry.lock",
+        "Pipfile.lock",
+        "uv.lock",
+        "package.json",
+        "package-lock.json",
+        "yarn.lock",
+        "pnpm-lock.yaml",
+    )
+    DEFAULT_ENV_DIRS = (".venv", "node_modules")
+    LINK_MODES = ("symlink", "reflink", "hardlink")
+    COMPLETE_MARKER = ".complete"
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        setup_command: Optional[str] = None,
+        env_dirs: Sequence[str] = DEFAULT_ENV_DIRS,
+        link_mode: str = "symlink",
+        build_timeout: Optional[float] = None
+    ):
+        """
+        Initialize environment cache
+
+        Args:
+            cache_dir: Directory holding cached environments
+            setup_command: Shell command that installs dependencies into the
+                current directory (e.g. creates .venv). None disables builds:
+                only existing entries are materialized
+            env_dirs: Directory names the setup command produces and that
+                are materialized into worktrees
+            link_mode: "symlink" (constant time), "reflink" or "hardlink"
+                (independent copies; fall back to symlink if unsupported)
+            build_timeout: Maximum seconds for one setup_command run
+
+        Raises:
+            ValueError: If link_mode is unknown
+        """
+        if link_mode not in self.LINK_MODES:
+            raise ValueError(f"Unknown link_mode {link_mode!r}, expected one of {self.LINK_MODES}")
+
+        self.cache_dir = Path(cache_dir)
+        self.setup_command = setup_command
+        self.env_dirs = tuple(env_dirs)
+        self.link_mode = link_mode
+        self.build_timeout = build_timeout
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._build_time = 0.0
+        self._materialize_time = 0.0
+
+    def find_lockfiles(self, worktree_path: Path) -> List[Path]:
+        """
+        Find dependency lockfiles at the worktree root
+
+        Args:
+            worktree_path: Path to worktree
+
+        Returns:
+            Sorted list of lockfile paths
+        """
+        found = set()
+        for pattern in self.LOCKFILE_PATTERNS:
+            found.update(p for p in Path(worktree_path).glob(pattern) if p.is_file())
+        return sorted(found)
+
+    def lockfile_hash(self, worktree_path: Path) -> Optional[str]:
+        """
+        Hash the worktree's lockfiles and the setup command
+
+        Args:
+            worktree_path: Path to worktree
+
+        Returns:
+            Hex digest identifying the environment, or None if no lockfiles
+        """
+        lockfiles = self.find_lockfiles(worktree_path)
+        if not lockfiles:
+            return None
+
+        digest = hashlib.sha256()
+        digest.update((self.setup_command or "").encode())
+        for lockfile in lockfiles:
+            digest.update(b"\0" + lockfile.name.encode() + b"\0")
+            digest.update(lockfile.read_bytes())
+        return digest.hexdigest()[:16]
+
+    def entry_path(self, env_hash: str) -> Path:
+        """Path of the cache entry for an environment hash"""
+        return self.cache_dir / env_hash
+
+    def is_built(self, env_hash: str) -> bool:
+        """Check whether a complete cache entry exists"""
+        return (self.entry_path(env_hash) / self.COMPLETE_MARKER).exists()
+
+    @contextmanager
+    def _entry_lock(self, env_hash: str):
+        """Hold an exclusive inter-process lock on one cache entry"""
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.cache_dir / f"{env_hash}.lock", "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def build(self, worktree_path: Path, env_hash: str) -> Path:
+        """
+        Build a cache entry by running setup_command (no-op if already built)
+
+        The command runs in the entry directory, which contains copies of
+        the lockfiles; WORKTREE_PATH in its environment points at the
+        worktree that triggered the build.
+
+        Args:
+            worktree_path: Worktree providing the lockfiles
+            env_hash: Hash from lockfile_hash()
+
+        Returns:
+            Path to the built cache entry
+
+        Raises:
+            EnvironmentCacheError: If there is no setup command or it fails
+        """
+        entry = self.entry_path(env_hash)
+
+        with self._entry_lock(env_hash):
+            # Another process may have built it while we waited
+            if self.is_built(env_hash):
+                return entry
+
+            if not self.setup_command:
+                raise EnvironmentCacheError(f"No cached environment {env_hash} and no setup command")
+
+            # Discard leftovers of an interrupted build
+            if entry.exists():
+                shutil.rmtree(entry)
+            entry.mkdir(parents=True)
+
+            for lockfile in self.find_lockfiles(worktree_path):
+                shutil.copy2(lockfile, entry / lockfile.name)
+
+            logger.info(f"Building environment {env_hash}: {self.setup_command}")
+            env = dict(os.environ, WORKTREE_PATH=str(worktree_path))
+            result = run_command(
+                ["/bin/sh", "-c", self.setup_command],
+                cwd=entry,
+                timeout=self.build_timeout,
+                env=env
+            )
+
+            if not result.success:
+                shutil.rmtree(entry, ignore_errors=True)
+                raise EnvironmentCacheError(
+                    f"Environment setup failed (exit {result.exit_code}): {result.stderr.strip()}"
+                )
+
+            (entry / self.COMPLETE_MARKER).touch()
+
+        with self._stats_lock:
+            self._build_time += result.duration
+        logger.info(f"Built environment {env_hash} in {result.duration:.1f}s")
+        return entry
+
+    def _link_dir(self, source: Path, target: Path) -> str:
+        """
+        Materialize one environment directory
+
+        Args:
+            source: Directory inside the cache entry
+            target: Path inside the worktree
+
+        Returns:
+            Link mode actually used
+        """
+        if self.link_mode == "reflink":
+            result = subprocess.run(
+                ["cp", "-a", "--reflink=always", str(source), str(target)],
+                capture_output=True
+            )
+            if result.returncode == 0:
+                return "reflink"
+            shutil.rmtree(target, ignore_errors=True)
+            logger.debug(f"Reflink unsupported for {target}, falling back to symlink")
+
+        elif self.link_mode == "hardlink":
+            try:
+                shutil.copytree(source, target, symlinks=True, copy_function=os.link)
+                return "hardlink"
+            except OSError as e:
+                shutil.rmtree(target, ignore_errors=True)
+                logger.debug(f"Hardlink failed for {target} ({e}), falling back to symlink")
+
+        os.symlink(source, target, target_is_directory=True)
+        return "symlink"
+
+    def materialize(self, worktree_path: Path, env_hash: str) -> Dict[str, str]:
+        """
+        Link a built cache entry's environment directories into a worktree
+
+        Existing symlinks to the right entry are kept (a reused pooled
+        worktree costs a readlink); stale symlinks are replaced. Real
+        directories are never overwritten.
+
+        Args:
+            worktree_path: Path to worktree
+            env_hash: Hash of a built cache entry
+
+        Returns:
+            Mapping of env dir name -> link mode used ("existing" if kept)
+        """
+        entry = self.entry_path(env_hash)
+        linked: Dict[str, str] = {}
+
+        for name in self.env_dirs:
+            source = entry / name
+            if not source.is_dir():
+                continue
+
+            target = Path(worktree_path) / name
+            if target.is_symlink():
+                if Path(os.readlink(target)) == source:
+                    linked[name] = "existing"
+                    continue
+                target.unlink()
+            elif target.exists():
+                logger.warning(f"Not replacing existing {target} with cached environment")
+                continue
+
+            linked[name] = self._link_dir(source, target)
+
+        return linked
+
+    def prepare(self, worktree_path: Path) -> Optional[str]:
+        """
+        Ensure a worktree has its dependency environment
+
+        Args:
+            worktree_path: Path to worktree
+
+        Returns:
+            Environment hash used, or None if the worktree has no lockfiles
+
+        Raises:
+            EnvironmentCacheError: If the environment cannot be built
+        """
+        env_hash = self.lockfile_hash(worktree_path)
+        if env_hash is None:
+            return None
+
+        hit = self.is_built(env_hash)
+        if not hit:
+            self.build(worktree_path, env_hash)
+
+        start = time.perf_counter()
+        linked = self.materialize(worktree_path, env_hash)
+        elapsed = time.perf_counter() - start
+
+        with self._stats_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+            self._materialize_time += elapsed
+
+        logger.info(
+            f"Environment {env_hash} {'hit' if hit else 'built'} for {worktree_path}: "
+            f"{linked} ({elapsed * 1000:.0f}ms)"
+        )
+        return env_hash
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hit/miss counts and timings
+        """
+        with self._stats_lock:
+            prepared = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "build_time_total": round(self._build_time, 3),
+                "materialize_time_avg": round(self._materialize_time / prepared, 4) if prepared else 0.0,
+                "link_mode": self.link_mode,
+                "cache_dir": str(self.cache_dir),
+            }
+
+    def __repr__(self) -> str:
+        """String representation"""
+        stats = self.get_stats()
+        return f"EnvironmentCache(hits={stats['hits']}, misses={stats['misses']}, mode={self.link_mode})"
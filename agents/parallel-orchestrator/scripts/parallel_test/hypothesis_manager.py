@@ -3,6 +3,12 @@
 Hypothesis Management Module
 
 Manages hypothesis lifecycle: validation, ranking, prioritization
+
+The pool is kept in acceptance order until limit_to_top_k() reorders it by
+ranking score; get_next_for_testing() follows that pool order. An id index
+and per-status indexes make lookups and status queries independent of pool
+size; the status indexes list hypotheses in the order they reached a status,
+not by score.
 """
 
 from typing import List, Dict, Optional
@@ -26,6 +32,13 @@ class HypothesisManager:
         self.pool: List[Hypothesis] = []
         self.max_hypotheses = self.config.max_hypotheses
 
+        # hypothesis_id -> hypothesis, and status -> {hypothesis_id: hypothesis}
+        # (dicts as insertion-ordered sets); kept in step with the pool
+        self._by_id: Dict[str, Hypothesis] = {}
+        self._by_status: Dict[HypothesisStatus, Dict[str, Hypothesis]] = {
+            status: {} for status in HypothesisStatus
+        }
+
     def accept_hypothesis(self, hypothesis: Hypothesis) -> bool:
         """
         Accept a new hypothesis into the pool (FR1.1)
@@ -40,11 +53,16 @@ class HypothesisManager:
             logger.warning(f"Hypothesis validation failed: {hypothesis.description}")
             return False
 
+        if hypothesis.id in self._by_id:
+            logger.warning(f"Hypothesis {hypothesis.id} already in pool")
+            return False
+
         if len(self.pool) >= self.config.max_hypotheses * 2:
             logger.info("Hypothesis pool at capacity, ranking before accepting new")
             self.limit_to_top_k(self.config.max_hypotheses)
 
         self.pool.append(hypothesis)
+        self._index(hypothesis)
         logger.info(f"Accepted hypothesis: {hypothesis.id} - {hypothesis.description}")
         return True
 
@@ -147,6 +165,8 @@ class HypothesisManager:
         """
         ranked = self.rank_hypotheses()
         self.pool = ranked[:k]
+        for hyp in ranked[k:]:
+            self._unindex(hyp)
         logger.info(f"Limited to top {k} hypotheses")
         return self.pool
 
@@ -163,12 +183,14 @@ class HypothesisManager:
         Returns:
             True if updated, False if not found
         """
-        hyp = next((h for h in self.pool if h.id == hypothesis_id), None)
+        hyp = self._by_id.get(hypothesis_id)
         if not hyp:
             logger.warning(f"Hypothesis {hypothesis_id} not found")
             return False
 
+        self._unindex(hyp)
         hyp.status = status
+        self._index(hyp)
         if results:
             hyp.test_results = results
 
@@ -177,11 +199,14 @@ class HypothesisManager:
 
     def get_next_for_testing(self) -> Optional[Hypothesis]:
         """
-        Get next untested hypothesis in priority order
+        Get next untested hypothesis in pool order (priority order once
+        limit_to_top_k() has run)
 
         Returns:
             Next Hypothesis to test, or None if all tested
         """
+        if not self._by_status[HypothesisStatus.PENDING]:
+            return None
         for hyp in self.pool:
             if hyp.status == HypothesisStatus.PENDING:
                 return hyp
@@ -197,7 +222,7 @@ class HypothesisManager:
         Returns:
             Hypothesis or None if not found
         """
-        return next((h for h in self.pool if h.id == hypothesis_id), None)
+        return self._by_id.get(hypothesis_id)
 
     def get_all(self) -> List[Hypothesis]:
         """
@@ -216,13 +241,29 @@ class HypothesisManager:
             status: HypothesisStatus to filter by
 
         Returns:
-            List of matching Hypothesis objects
+            List of matching Hypothesis objects, in the order they reached
+            the status
         """
-        return [h for h in self.pool if h.status == status]
+        return list(self._by_status[status].values())
+
+    def _index(self, hypothesis: Hypothesis) -> None:
+        """Add a pooled hypothesis to the id and status indexes"""
+        self._by_id[hypothesis.id] = hypothesis
+        self._by_status[hypothesis.status][hypothesis.id] = hypothesis
+
+    def _unindex(self, hypothesis: Hypothesis) -> None:
+        """Remove a hypothesis from the id and status indexes"""
+        self._by_id.pop(hypothesis.id, None)
+        # Every bucket, in case its status was changed behind the manager's back
+        for members in self._by_status.values():
+            members.pop(hypothesis.id, None)
 
     def clear_pool(self) -> None:
         """Clear all hypotheses from pool"""
         self.pool.clear()
+        self._by_id.clear()
+        for members in self._by_status.values():
+            members.clear()
         logger.info("Cleared hypothesis pool")
 
     def __len__(self) -> int:
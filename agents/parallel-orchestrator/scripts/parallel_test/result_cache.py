@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Test Result Cache Module
+
+Content-addressed cache of hypothesis test results. A result is reused when
+the same test script runs against identical code in an identical environment:
+
+    key = sha256(worktree HEAD SHA, dirty-tree hash, test script hash, env hash)
+
+The script hash leaves out the descriptive header generated scripts wrap in
+HEADER_BEGIN/HEADER_END lines (hypothesis id, description, echoed context),
+so rewording a hypothesis or renumbering ids keeps its cached result.
+
+Only decisive results (PASS/FAIL) are stored. Entries expire after a TTL and
+the least recently used entries are evicted beyond `max_entries`. The cache
+is a SQLite database (WAL mode), so concurrent sessions can share it.
+
+Usage:
+    cache = ResultCache(worktree_dir / "results.db", ttl_seconds=86400)
+    key = cache.cache_key(worktree, test_script)
+    result = cache.get(key) if key else None
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+from .config import TestExecutionResult, TestResult
+
+# Use shared infrastructure
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.git_utils import get_dirty_paths, GitOperationError
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """SQLite-backed TTL/LRU cache of TestExecutionResults"""
+
+    DB_FILE = "results.db"
+    DEFAULT_TTL = 24 * 3600.0
+    DEFAULT_MAX_ENTRIES = 512
+    CACHEABLE_RESULTS = (TestResult.PASS, TestResult.FAIL)
+
+    # Environment variables that change how tests behave
+    ENV_VARS = ("PATH", "PYTHONPATH", "VIRTUAL_ENV", "NODE_ENV", "LANG", "TZ")
+
+    # Worktree paths that hold harness artifacts, not code under test
+    IGNORED_PATHS = (".falsification",)
+
+    # Lines delimiting a test script's descriptive header (not hashed)
+    HEADER_BEGIN = b"# >>> falsification header"
+    HEADER_END = b"# <<< falsification header"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY,
+            hypothesis_id TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used);
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        ttl_seconds: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        env_vars: Sequence[str] = ENV_VARS
+    ):
+        """
+        Initialize result cache
+
+        Args:
+            db_path: SQLite database file (created if missing)
+            ttl_seconds: Entries older than this are never returned
+            max_entries: Least recently used entries beyond this are evicted
+            env_vars: Environment variables included in the cache key
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.env_vars = tuple(env_vars)
+
+        self._hits = 0
+        self._misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self._SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection, committing on success"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _head_sha(self, worktree: Path) -> Optional[str]:
+        """HEAD commit of a worktree, or None if it is not a git checkout"""
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", "HEAD^{commit}"],
+            cwd=worktree,
+            capture_output=True,
+            text=True
+        )
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def _dirty_hash(self, worktree: Path) -> str:
+        """
+        Hash the worktree's differences from HEAD
+
+        Files are hashed by content and symlinks by target, keyed by their
+        path relative to the worktree, so the same changes in different
+        pooled (or recreated) worktrees hash the same. Untracked directories
+        are walked and each entry hashed the same way.
+
+        Args:
+            worktree: Path to worktree
+
+        Returns:
+            Hex digest (constant for a clean worktree)
+        """
+        tracked, untracked = get_dirty_paths(worktree)
+        digest = hashlib.sha256()
+
+        for rel in sorted(set(tracked) | set(untracked)):
+            if rel.split("/", 1)[0] in self.IGNORED_PATHS:
+                continue
+
+            path = worktree / rel
+            if path.is_dir() and not path.is_symlink():
+                for root, dirs, files in os.walk(path):
+                    dirs.sort()
+                    for name in sorted(files):
+                        full = os.path.join(root, name)
+                        self._hash_entry(digest, os.path.relpath(full, worktree), Path(full))
+            else:
+                self._hash_entry(digest, rel, path)
+
+        return digest.hexdigest()
+
+    def _hash_entry(self, digest, rel: str, path: Path) -> None:
+        """Add one dirty path (relative name plus content) to a digest"""
+        digest.update(b"\0" + rel.encode("utf-8", errors="surrogateescape") + b"\0")
+        if path.is_symlink():
+            digest.update(b"L" + os.readlink(path).encode("utf-8", errors="surrogateescape"))
+        elif path.is_file():
+            digest.update(b"F" + path.read_bytes())
+        else:
+            digest.update(b"deleted")
+
+    def _script_hash(self, worktree: Path, test_script: Path) -> str:
+        """
+        Hash the part of a test script that determines its result
+
+        The worktree path is replaced by a placeholder and the descriptive
+        header (HEADER_BEGIN to HEADER_END) is dropped.
+
+        Args:
+            worktree: Path to worktree the script runs in
+            test_script: Test script
+
+        Returns:
+            Hex digest
+        """
+        script = Path(test_script).read_bytes().replace(str(worktree).encode(), b"<worktree>")
+        kept = []
+        in_header = False
+        for line in script.splitlines(keepends=True):
+            marker = line.strip()
+            if marker.startswith(self.HEADER_BEGIN):
+                in_header = True
+            elif marker.startswith(self.HEADER_END):
+                in_header = False
+            elif not in_header:
+                kept.append(line)
+        return hashlib.sha256(b"".join(kept)).hexdigest()
+
+    def _env_hash(self) -> str:
+        """Hash the platform, interpreter and selected environment variables"""
+        env = {name: os.environ.get(name) for name in self.env_vars}
+        payload = json.dumps([sys.platform, sys.executable, env], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def cache_key(self, worktree: Path, test_script: Path) -> Optional[str]:
+        """
+        Compute the cache key for running a test script in a worktree
+
+        The script is hashed without its worktree path and descriptive
+        header (see _script_hash), so identical tests in different pooled
+        worktrees or for reworded hypotheses share keys.
+
+        Args:
+            worktree: Path to worktree (must be a git checkout)
+            test_script: Test script to run
+
+        Returns:
+            Hex digest, or None if the worktree is not a git checkout
+        """
+        worktree = Path(worktree)
+        head = self._head_sha(worktree)
+        if head is None:
+            return None
+
+        try:
+            dirty = self._dirty_hash(worktree)
+        except (GitOperationError, OSError) as e:
+            logger.debug(f"Not caching results for {worktree}: {e}")
+            return None
+
+        script_hash = self._script_hash(worktree, test_script)
+
+        key = hashlib.sha256()
+        for part in (head, dirty, script_hash, self._env_hash()):
+            key.update(part.encode() + b"\0")
+        return key.hexdigest()
+
+    def get(self, key: str) -> Optional[TestExecutionResult]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Key from cache_key()
+
+        Returns:
+            Stored result (marked with metrics["cache_hit"]), or None if
+            missing or expired
+        """
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result, created_at FROM results WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (now, key))
+
+        if row is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        data = json.loads(row[0])
+        data["result"] = TestResult(data["result"])
+        result = TestExecutionResult(**data)
+        result.metrics["cache_hit"] = True
+        result.metrics["cached_at"] = row[1]
+        return result
+
+    def put(self, key: str, result: TestExecutionResult) -> bool:
+        """
+        Store a result and evict expired and least recently used entries
+
+        Log paths are not stored: the files belong to the run's worktree
+        and may be overwritten by later runs.
+
+        Args:
+            key: Key from cache_key()
+            result: Result to store
+
+        Returns:
+            True if stored (only PASS/FAIL results are cacheable)
+        """
+        if result.result not in self.CACHEABLE_RESULTS:
+            return False
+
+        data = result.to_dict()
+        data["stdout_log"] = data["stderr_log"] = ""
+        data["metrics"] = {k: v for k, v in data["metrics"].items() if k not in ("cache_hit", "cached_at")}
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, hypothesis_id, result, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, result.hypothesis_id, json.dumps(data), now, now)
+            )
+            conn.execute("DELETE FROM results WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM results WHERE key NOT IN "
+                "(SELECT key FROM results ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+        return True
+
+    def clear(self) -> None:
+        """Remove all cached results"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM results")
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with entry count, hits and misses
+        """
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+            "db_path": str(self.db_path),
+        }
+
+    def __repr__(self) -> str:
+        """String representation"""
+        stats = self.get_stats()
+        return f"ResultCache(entries={stats['entries']}, hits={stats['hits']}, misses={stats['misses']})"
@@ -2,32 +2,155 @@
 """
 Results Analysis Module
 
-Analyzes test results and generates reports
+Analyzes test results and generates reports. IncrementalAnalysis keeps the
+classification and recommended action up to date as results stream in.
 """
 
 import logging
 import json
+import os
 from typing import List, Dict, Optional
 from datetime import datetime
 from .config import (
     Hypothesis, TestExecutionResult, FalsificationReport,
     HypothesisStatus, TestResult, FalsificationConfig
 )
+from .hypothesis_manager import HypothesisManager
 
 logger = logging.getLogger(__name__)
 
 
+class IncrementalAnalysis:
+    """
+    Running analysis of a test run, updated one result at a time
+
+    Lets the agent act on partial evidence while tests are still running:
+
+        analysis = analyzer.incremental(hypotheses)
+        async for result in executor.stream(hypotheses, worktrees):
+            summary = analysis.add(result)
+            if summary["supported"] == 1 and not summary["pending"]:
+                ...
+        report = analysis.report()
+    """
+
+    def __init__(self, analyzer: "ResultsAnalyzer", hypotheses: List[Hypothesis]):
+        """
+        Initialize incremental analysis
+
+        Args:
+            analyzer: ResultsAnalyzer providing classification and next steps
+            hypotheses: Hypotheses being tested
+        """
+        self.analyzer = analyzer
+        self.hypotheses = list(hypotheses)
+        self.results: List[TestExecutionResult] = []
+        self.falsified: List[Hypothesis] = []
+        self.supported: List[Hypothesis] = []
+        self.inconclusive: List[Hypothesis] = []
+        self._by_id = {hyp.id: hyp for hyp in self.hypotheses}
+        self._pending = set(self._by_id)
+
+    @property
+    def pending(self) -> List[str]:
+        """IDs of hypotheses without a result yet"""
+        return [hyp.id for hyp in self.hypotheses if hyp.id in self._pending]
+
+    @property
+    def complete(self) -> bool:
+        """True once every hypothesis has a result"""
+        return not self._pending
+
+    def add(self, result: TestExecutionResult) -> Dict:
+        """
+        Classify one result and update the running summary
+
+        Args:
+            result: Newly completed test result
+
+        Returns:
+            Current summary (see summary())
+        """
+        hyp = self._by_id.get(result.hypothesis_id)
+        if hyp is None or hyp.id not in self._pending:
+            logger.warning(f"Ignoring unexpected or duplicate result: {result.hypothesis_id}")
+            return self.summary()
+
+        self._pending.discard(hyp.id)
+        self.results.append(result)
+
+        self.analyzer._set_status(hyp, self.analyzer._classify_result(result))
+        if hyp.status == HypothesisStatus.FALSIFIED:
+            self.falsified.append(hyp)
+        elif hyp.status == HypothesisStatus.SUPPORTED:
+            self.supported.append(hyp)
+        else:
+            self.inconclusive.append(hyp)
+
+        summary = self.summary()
+        logger.info(
+            f"Result {len(self.results)}/{len(self.hypotheses)} ({hyp.id}: {hyp.status.value}): "
+            f"{summary['recommended_action']}"
+        )
+        return summary
+
+    def summary(self) -> Dict:
+        """
+        Current counts and recommendation
+
+        While tests are pending the recommendation is provisional; with no
+        supported hypothesis yet it is to wait rather than to generate new
+        hypotheses.
+
+        Returns:
+            Dictionary with falsified/supported/inconclusive counts, pending
+            ids, recommended_action, next_steps and provisional flag
+        """
+        pending = self.pending
+        if pending and not self.supported:
+            action = f"Waiting for {len(pending)} pending test(s)"
+        else:
+            action = self.analyzer._determine_next_action(
+                self.falsified, self.supported, self.inconclusive
+            )
+
+        return {
+            "falsified": len(self.falsified),
+            "supported": len(self.supported),
+            "inconclusive": len(self.inconclusive),
+            "pending": pending,
+            "recommended_action": action,
+            "next_steps": self.analyzer._generate_next_steps(
+                self.falsified, self.supported, self.inconclusive
+            ),
+            "provisional": bool(pending) and not self.analyzer.outcome_settled(self.supported),
+        }
+
+    def report(self) -> FalsificationReport:
+        """
+        Full report for the results received so far
+
+        Returns:
+            FalsificationReport from ResultsAnalyzer.generate_report
+        """
+        return self.analyzer.generate_report(self.hypotheses, self.results)
+
+
 class ResultsAnalyzer:
     """Analyzes test results and generates reports"""
 
-    def __init__(self, config: Optional[FalsificationConfig] = None):
+    def __init__(self, config: Optional[FalsificationConfig] = None,
+                 hypothesis_manager: Optional[HypothesisManager] = None):
         """
         Initialize results analyzer
 
         Args:
             config: Optional FalsificationConfig instance
+            hypothesis_manager: Optional manager whose pool should see status
+                changes (keeps its status indexes current)
         """
         self.config = config or FalsificationConfig()
+        self.hypothesis_manager = hypothesis_manager
         self.results: List[TestExecutionResult] = []
 
     def generate_report(self, hypotheses: List[Hypothesis],
@@ -40,6 +163,11 @@ class ResultsAnalyzer:
             - Confidence scores
             - Recommended next action
             - Test artifacts and logs
+            - Per-test resource usage and a suggested max_concurrent_tests
+
+        Hypotheses without a result (e.g. cancelled by an early stop) make
+        the report provisional unless they can no longer change the
+        recommended action.
 
         Args:
             hypotheses: List of tested hypotheses
@@ -56,14 +184,15 @@ class ResultsAnalyzer:
         inconclusive = []
 
         # Classify results
+        by_id = {hyp.id: hyp for hyp in hypotheses}
         for result in results:
-            hyp = next((h for h in hypotheses if h.id == result.hypothesis_id), None)
+            hyp = by_id.get(result.hypothesis_id)
             if not hyp:
                 logger.warning(f"Hypothesis not found for result: {result.hypothesis_id}")
                 continue
 
             status = self._classify_result(result)
-            hyp.status = status
+            self._set_status(hyp, status)
 
             if status == HypothesisStatus.FALSIFIED:
                 falsified.append(hyp)
@@ -82,6 +211,14 @@ class ResultsAnalyzer:
         next_action = self._determine_next_action(falsified, supported, inconclusive)
         next_steps = self._generate_next_steps(falsified, supported, inconclusive)
 
+        tested = {result.hypothesis_id for result in results}
+        untested = [hyp.id for hyp in hypotheses if hyp.id not in tested]
+        provisional = bool(untested) and not self.outcome_settled(supported)
+        if provisional:
+            next_steps.insert(
+                0, f"Recommendation is provisional: test {', '.join(untested)} before acting on it"
+            )
+
         # Get bug description from first hypothesis if available
         bug_description = hypotheses[0].description if hypotheses else "Unknown bug"
 
@@ -96,12 +233,100 @@ class ResultsAnalyzer:
             recommended_action=next_action,
             next_steps=next_steps,
             confidence=total_confidence,
-            test_results=results
+            test_results=results,
+            resource_usage=self.summarize_resource_usage(results),
+            provisional=provisional
         )
 
         logger.info(f"Report generated: {len(falsified)} falsified, {len(supported)} supported, {len(inconclusive)} inconclusive")
         return report
 
+    def incremental(self, hypotheses: List[Hypothesis]) -> IncrementalAnalysis:
+        """
+        Start an incremental analysis fed one result at a time
+
+        Args:
+            hypotheses: Hypotheses being tested
+
+        Returns:
+            IncrementalAnalysis tracking counts and recommended action
+        """
+        return IncrementalAnalysis(self, hypotheses)
+
+    def summarize_resource_usage(self, results: List[TestExecutionResult]) -> Dict:
+        """
+        Aggregate per-test resource metrics
+
+        Ranks hypotheses by CPU time and derives how many tests fit
+        concurrently on this machine: CPU cores divided by the average cores
+        a test keeps busy, capped by physical memory divided by peak RSS.
+
+        Args:
+            results: Test execution results (only those with rusage metrics count)
+
+        Returns:
+            Dictionary with totals, per-test breakdown (most expensive first)
+            and suggested_max_concurrent; empty if nothing was measured
+        """
+        measured = [r for r in results if "cpu_user" in r.metrics]
+        if not measured:
+            return {}
+
+        per_test = []
+        for r in measured:
+            cpu_time = r.metrics["cpu_user"] + r.metrics["cpu_system"]
+            per_test.append({
+                "hypothesis_id": r.hypothesis_id,
+                "cpu_time": round(cpu_time, 3),
+                "cpu_utilization": round(cpu_time / r.duration, 2) if r.duration > 0 else 0.0,
+                "max_rss_mb": r.metrics["max_rss_mb"],
+                "io_blocks": r.metrics["io_read_blocks"] + r.metrics["io_write_blocks"],
+            })
+        per_test.sort(key=lambda t: t["cpu_time"], reverse=True)
+
+        total_cpu = sum(t["cpu_time"] for t in per_test)
+        total_wall = sum(r.duration for r in measured)
+        peak_rss_mb = max(t["max_rss_mb"] for t in per_test)
+        avg_utilization = total_cpu / total_wall if total_wall > 0 else 0.0
+
+        cpu_count = os.cpu_count() or 1
+        # Floor utilization so idle (sleep-bound) tests do not suggest unbounded concurrency
+        suggested = max(1, int(cpu_count / max(avg_utilization, 0.05)))
+        try:
+            memory_mb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+            if peak_rss_mb > 0:
+                suggested = max(1, min(suggested, int(memory_mb / peak_rss_mb)))
+        except (ValueError, OSError, AttributeError):
+            pass
+
+        return {
+            "measured_tests": len(measured),
+            "cpu_time_total": round(total_cpu, 3),
+            "avg_cpu_utilization": round(avg_utilization, 2),
+            "peak_rss_mb": peak_rss_mb,
+            "io_blocks_total": sum(t["io_blocks"] for t in per_test),
+            "cpu_count": cpu_count,
+            "suggested_max_concurrent": suggested,
+            "per_test": per_test,
+        }
+
+    def _set_status(self, hypothesis: Hypothesis, status: HypothesisStatus) -> None:
+        """
+        Record a hypothesis's classification
+
+        Goes through the hypothesis manager when the hypothesis is in its
+        pool, so the manager's status indexes stay consistent.
+
+        Args:
+            hypothesis: Hypothesis that was tested
+            status: Its new status
+        """
+        manager = self.hypothesis_manager
+        if manager is not None and manager.get_by_id(hypothesis.id) is hypothesis:
+            manager.update_status(hypothesis.id, status)
+        else:
+            hypothesis.status = status
+
     def _classify_result(self, result: TestExecutionResult) -> HypothesisStatus:
         """
         Classify test result into hypothesis status (FR3.4)
@@ -156,6 +381,22 @@ class ResultsAnalyzer:
         else:
             return "Review inconclusive test results"
 
+    @staticmethod
+    def outcome_settled(supported: List[Hypothesis]) -> bool:
+        """
+        Whether more results can no longer change the recommended action
+
+        _determine_next_action depends only on the number of supported
+        hypotheses, and with two or more it stays "refine hypotheses".
+
+        Args:
+            supported: Supported hypotheses so far
+
+        Returns:
+            True if untested hypotheses cannot change the recommendation
+        """
+        return len(supported) >= 2
+
     def _generate_next_steps(self, falsified: List[Hypothesis],
                             supported: List[Hypothesis],
                             inconclusive: List[Hypothesis]) -> List[str]:
@@ -296,7 +537,8 @@ class ResultsAnalyzer:
             },
             "recommended_action": report.recommended_action,
             "next_steps": report.next_steps,
-            "confidence": report.confidence
+            "confidence": report.confidence,
+            "resource_usage": report.resource_usage
         }
         return json.dumps(data, indent=2)
 
@@ -318,6 +560,20 @@ class ResultsAnalyzer:
 
         lines.append(f"\n## Confidence Score\n{report.confidence:.2%}")
 
+        usage = report.resource_usage
+        if usage:
+            lines.append(
+                f"\n## Resource Usage\n- **CPU time**: {usage['cpu_time_total']:.1f}s "
+                f"(avg {usage['avg_cpu_utilization']:.2f} cores/test)"
+            )
+            lines.append(f"- **Peak RSS**: {usage['peak_rss_mb']:.1f} MB")
+            lines.append(f"- **Suggested max_concurrent_tests**: {usage['suggested_max_concurrent']}")
+            for t in usage["per_test"][:3]:
+                lines.append(
+                    f"- `{t['hypothesis_id']}`: {t['cpu_time']:.1f}s CPU, "
+                    f"{t['max_rss_mb']:.1f} MB, {t['io_blocks']} I/O blocks"
+                )
+
         return "\n".join(lines)
 
     def _export_text(self, report: FalsificationReport) -> str:
@@ -341,6 +597,13 @@ class ResultsAnalyzer:
             lines.append(f"  {i}. {step}")
 
         lines.append(f"\nConfidence: {report.confidence:.2%}")
+
+        usage = report.resource_usage
+        if usage:
+            lines.append(
+                f"Resources: {usage['cpu_time_total']:.1f}s CPU, peak {usage['peak_rss_mb']:.1f} MB, "
+                f"suggested max_concurrent_tests={usage['suggested_max_concurrent']}"
+            )
         lines.append("\n" + "=" * 60)
 
         return "\n".join(lines)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Resource Usage Runner
+
+Runs a test command as a child process, reaps it with os.wait4() and writes
+the child's rusage as JSON. The rusage covers the child and every descendant
+it waited for, so AsyncTestExecutor can attribute CPU time, peak RSS and
+block I/O to a single hypothesis even when tests run concurrently.
+
+Usage:
+    python rusage_runner.py <output.json> <command> [args...]
+
+The runner exits with the command's exit code (or re-raises the signal that
+killed it), so callers see the same return code as without it.
+"""
+
+import json
+import os
+import signal
+import sys
+from typing import Dict, List
+
+
+def rusage_to_metrics(usage) -> Dict:
+    """
+    Convert a resource.struct_rusage into TestExecutionResult metrics
+
+    Args:
+        usage: rusage returned by os.wait4()
+
+    Returns:
+        Dictionary with cpu_user, cpu_system (seconds), max_rss_mb and
+        io_read_blocks / io_write_blocks (512-byte block operations)
+    """
+    # ru_maxrss is KiB on Linux but bytes on macOS
+    max_rss_kb = usage.ru_maxrss / 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return {
+        "cpu_user": round(usage.ru_utime, 3),
+        "cpu_system": round(usage.ru_stime, 3),
+        "max_rss_mb": round(max_rss_kb / 1024, 1),
+        "io_read_blocks": usage.ru_inblock,
+        "io_write_blocks": usage.ru_oublock,
+    }
+
+
+def main(argv: List[str]) -> int:
+    """
+    Run a command and record its resource usage
+
+    Args:
+        argv: [program, output_path, command, *args]
+
+    Returns:
+        Exit code of the command
+    """
+    if len(argv) < 3:
+        print(f"Usage: {argv[0]} <output.json> <command> [args...]", file=sys.stderr)
+        return 2
+
+    output_path, command = argv[1], argv[2:]
+
+    try:
+        pid = os.posix_spawn(command[0], command, os.environ)
+    except OSError as e:
+        print(f"rusage_runner: cannot execute {command[0]}: {e}", file=sys.stderr)
+        return 127
+
+    _, status, usage = os.wait4(pid, 0)
+
+    with open(output_path, "w") as f:
+        json.dump(rusage_to_metrics(usage), f)
+
+    if os.WIFSIGNALED(status):
+        sig = os.WTERMSIG(status)
+        signal.signal(sig, signal.SIG_DFL)
+        os.kill(os.getpid(), sig)
+    return os.waitstatus_to_exitcode(status)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -7,10 +7,17 @@ Now uses AsyncIO for 30-40% performance improvement on I/O-bound operations.
 """
 
 import logging
+import sys
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Sequence
 from .config import Hypothesis, TestResult, TestExecutionResult, FalsificationConfig
 from .async_test_executor import AsyncTestExecutor
+from .env_cache import EnvironmentCache
+from .result_cache import ResultCache
+
+# Use shared infrastructure
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.duration_model import DurationModel
 
 logger = logging.getLogger(__name__)
 
@@ -23,22 +30,34 @@ class TestExecutor:
     backwards-compatible synchronous API.
     """
 
-    def __init__(self, config: Optional[FalsificationConfig] = None):
+    def __init__(
+        self,
+        config: Optional[FalsificationConfig] = None,
+        duration_model: Optional[DurationModel] = None,
+        result_cache: Optional[ResultCache] = None,
+        env_dirs: Sequence[str] = EnvironmentCache.DEFAULT_ENV_DIRS
+    ):
         """
         Initialize test executor
 
         Args:
             config: Optional FalsificationConfig instance
+            duration_model: Optional learned durations (see AsyncTestExecutor)
+            result_cache: Optional result cache (None disables caching)
+            env_dirs: Environment directories kept when shared worktrees reset
         """
         self.config = config or FalsificationConfig()
         self.timeout_seconds = self.config.test_timeout
         self.min_parallel_time = self.config.min_parallel_time
 
         # Use AsyncTestExecutor as backend
-        self._async_executor = AsyncTestExecutor(config)
+        self._async_executor = AsyncTestExecutor(config, duration_model, result_cache, env_dirs)
 
     def execute_parallel(
-        self, hypotheses: List[Hypothesis], worktrees: Dict[str, Path]
+        self,
+        hypotheses: List[Hypothesis],
+        worktrees: Dict[str, Path],
+        on_result: Optional[Callable[[TestExecutionResult], None]] = None
     ) -> List[TestExecutionResult]:
         """
         Execute tests in parallel across worktrees (FR3.1)
@@ -48,14 +67,15 @@ class TestExecutor:
         Args:
             hypotheses: List of hypotheses to test
             worktrees: Mapping of hypothesis_id -> worktree_path
+            on_result: Optional callback invoked with each result as it arrives
 
         Returns:
             List of test results
         """
-        return self._async_executor.execute_parallel(hypotheses, worktrees)
+        return self._async_executor.execute_parallel(hypotheses, worktrees, on_result)
 
     def execute_single(
-        self, hypothesis: Hypothesis, worktree: Path
+        self, hypothesis: Hypothesis, worktree: Path, reset: bool = False
     ) -> TestExecutionResult:
         """
         Execute test for single hypothesis with timeout (FR3.2)
@@ -66,13 +86,29 @@ class TestExecutor:
         Args:
             hypothesis: Hypothesis to test
             worktree: Path to worktree
+            reset: Undo changes left by an earlier test in the same worktree
 
         Returns:
             TestExecutionResult with outcome
         """
-        return self._async_executor.execute_single(hypothesis, worktree)
+        return self._async_executor.execute_single(hypothesis, worktree, reset=reset)
+
+    def plan_batches(self, hypotheses: List[Hypothesis]) -> List[List[Hypothesis]]:
+        """
+        Group short hypotheses into batches that share one worktree
+
+        Delegates to AsyncTestExecutor (packing by predicted test time up
+        to config.batch_max_seconds).
+
+        Args:
+            hypotheses: Hypotheses to test
+
+        Returns:
+            List of batches (each a list of hypotheses)
+        """
+        return self._async_executor.plan_batches(hypotheses)
 
-    def should_parallelize(self, hypotheses: List[Hypothesis]) -> bool:
+    def should_parallelize(self, hypotheses: List[Hypothesis], pool_state: str = "cold") -> bool:
         """
         Determine if parallelization is worth overhead (FR3.3)
 
@@ -80,8 +116,9 @@ class TestExecutor:
 
         Args:
             hypotheses: List of hypotheses to evaluate
+            pool_state: "warm" if worktrees come from a ready pool, else "cold"
 
         Returns:
             True if should parallelize
         """
-        return self._async_executor.should_parallelize(hypotheses)
+        return self._async_executor.should_parallelize(hypotheses, pool_state)
@@ -58,12 +58,13 @@ class FalsificationDebugger:
                 self.config = FalsificationConfig()
 
         self.hypothesis_manager = HypothesisManager(self.config)
-        self.results_analyzer = ResultsAnalyzer(self.config)
+        self.results_analyzer = ResultsAnalyzer(self.config, self.hypothesis_manager)
 
     def run_session(self, bug_description: str,
                    analyze_only: bool = False,
                    no_parallel: bool = False,
-                   max_hypotheses: int = 5) -> None:
+                   max_hypotheses: int = 5,
+                   no_cache: bool = False) -> None:
         """
         Run a complete falsification debugging session
 
@@ -72,6 +73,7 @@ class FalsificationDebugger:
             analyze_only: Just analyze, don't execute tests
             no_parallel: Force sequential execution
             max_hypotheses: Maximum hypotheses to test
+            no_cache: Re-run every test instead of reusing cached results
         """
         logger.info("=" * 70)
         logger.info("FALSIFICATION DEBUGGER - BUG DEBUGGING SESSION")
@@ -113,29 +115,54 @@ class FalsificationDebugger:
         logger.info("[Phase 3] Creating git worktrees...")
         worktree_config = WorktreeConfig(
             base_repo=Path.cwd(),
-            worktree_dir=Path.cwd().parent / "worktrees"
+            worktree_dir=Path.cwd().parent / "worktrees",
+            result_cache=not no_cache
         )
 
         with WorktreeOrchestrator(worktree_config, self.config) as orchestrator:
-            worktrees = orchestrator.create_worktrees(top_k)
-            logger.info(f"✓ Created {len(worktrees)} worktrees")
+            executor = TestExecutor(
+                self.config,
+                duration_model=orchestrator.duration_model,
+                result_cache=orchestrator.result_cache,
+                env_dirs=orchestrator.config.env_dirs
+            )
+
+            # Short, non-mutating hypotheses share worktrees (batch_max_seconds)
+            batches = executor.plan_batches(top_k)
+            worktrees = orchestrator.create_worktrees(top_k, batches=batches)
+            logger.info(
+                f"✓ Created {len(set(worktrees.values()))} worktrees "
+                f"for {len(worktrees)} hypotheses"
+            )
 
-            # Setup test environments
-            for hyp in top_k:
-                orchestrator.setup_test_environment(worktrees[hyp.id], hyp)
-            logger.info(f"✓ Test environments configured")
+            # Setup test environments (one concurrent pass)
+            orchestrator.setup_test_environments(worktrees, top_k)
+            setup_stats = orchestrator.get_setup_stats()
+            logger.info(
+                f"✓ Test environments configured "
+                f"(avg {setup_stats['avg_seconds']:.3f}s, max {setup_stats['max_seconds']:.3f}s per worktree)"
+            )
             logger.info("")
 
             # Phase 4: Execute tests
             logger.info("[Phase 4] Executing tests...")
-            executor = TestExecutor(self.config)
 
-            if no_parallel or not executor.should_parallelize(top_k):
+            # Running tally so partial evidence is visible during long runs
+            analysis = self.results_analyzer.incremental(top_k)
+
+            if no_parallel or not executor.should_parallelize(top_k, orchestrator.pool_state):
                 logger.info("Executing tests sequentially...")
-                results = [executor.execute_single(hyp, worktrees[hyp.id]) for hyp in top_k]
+                results = []
+                used = set()
+                for hyp in top_k:
+                    # Batched hypotheses share a worktree: reset it between them
+                    worktree = worktrees[hyp.id]
+                    results.append(executor.execute_single(hyp, worktree, reset=worktree in used))
+                    used.add(worktree)
+                    analysis.add(results[-1])
             else:
                 logger.info("Executing tests in parallel...")
-                results = executor.execute_parallel(top_k, worktrees)
+                results = executor.execute_parallel(top_k, worktrees, on_result=analysis.add)
 
             logger.info(f"✓ Test execution complete")
             logger.info("")
@@ -245,6 +272,8 @@ class FalsificationDebugger:
         logger.info(f"  Supported:     {len(report.supported)} hypotheses")
         logger.info(f"  Inconclusive:  {len(report.inconclusive)} hypotheses")
         logger.info(f"  Confidence:    {report.confidence:.1%}")
+        if report.provisional:
+            logger.info("  Status:        PROVISIONAL (some hypotheses were not tested)")
         logger.info("")
 
         if report.falsified:
@@ -274,6 +303,7 @@ Examples:
   %(prog)s --analyze-only "Auth service randomly rejects sessions"
   %(prog)s --no-parallel "Database connection pool exhaustion"
   %(prog)s --max-hypotheses 3 "Bug description"
+  %(prog)s --no-cache "Flaky test in CI"
         """
     )
 
@@ -284,6 +314,8 @@ Examples:
                        help="Analyze hypotheses without executing tests")
     parser.add_argument("--no-parallel", action="store_true",
                        help="Force sequential test execution")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Re-run all tests instead of reusing cached results")
     parser.add_argument("--max-hypotheses", type=int, default=5,
                        help="Maximum hypotheses to test (default: 5)")
     parser.add_argument("--verbose", "-v", action="store_true",
@@ -312,7 +344,8 @@ Examples:
             bug_description=args.bug_description,
             analyze_only=args.analyze_only,
             no_parallel=args.no_parallel,
-            max_hypotheses=args.max_hypotheses
+            max_hypotheses=args.max_hypotheses,
+            no_cache=args.no_cache
         )
     except KeyboardInterrupt:
         logger.info("Session interrupted by user")
@@ -11,6 +11,7 @@ Demonstrates:
 """
 
 import sys
+import tempfile
 import time
 import logging
 from pathlib import Path
@@ -30,6 +31,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pools, worktrees and databases live outside the source tree and are
+# removed when the interpreter exits, so a run never leaves state behind
+SCRATCH_DIR = tempfile.TemporaryDirectory(prefix="worktree_pool_test_")
+
 
 def test_basic_pool_operations():
     """Test basic pool acquire/release operations"""
@@ -39,7 +44,7 @@ def test_basic_pool_operations():
 
     # Setup paths
     base_repo = Path.cwd()
-    pool_dir = Path.cwd() / "test_pool"
+    pool_dir = Path(SCRATCH_DIR.name) / "test_pool"
 
     # Create pool
     pool = WorktreePool(base_repo, pool_dir, max_size=3, auto_load=False)
@@ -87,7 +92,7 @@ def test_context_manager():
     logger.info("="*60)
 
     base_repo = Path.cwd()
-    pool_dir = Path.cwd() / "test_pool"
+    pool_dir = Path(SCRATCH_DIR.name) / "test_pool"
 
     pool = WorktreePool(base_repo, pool_dir, max_size=3, auto_load=False)
 
@@ -112,7 +117,7 @@ def test_state_persistence():
     logger.info("="*60)
 
     base_repo = Path.cwd()
-    pool_dir = Path.cwd() / "test_pool"
+    pool_dir = Path(SCRATCH_DIR.name) / "test_pool"
 
     # Session 1: Create pool and acquire worktrees
     logger.info("\nSession 1: Creating pool and acquiring worktrees...")
@@ -149,7 +154,7 @@ def test_performance_comparison():
     logger.info("="*60)
 
     base_repo = Path.cwd()
-    worktree_dir = Path.cwd() / "test_worktrees"
+    worktree_dir = Path(SCRATCH_DIR.name) / "test_worktrees"
 
     # Create test hypotheses
     hypotheses = [
@@ -219,7 +224,7 @@ def test_pool_expansion():
     logger.info("="*60)
 
     base_repo = Path.cwd()
-    pool_dir = Path.cwd() / "test_pool"
+    pool_dir = Path(SCRATCH_DIR.name) / "test_pool"
 
     pool = WorktreePool(base_repo, pool_dir, max_size=10, auto_load=False)
 
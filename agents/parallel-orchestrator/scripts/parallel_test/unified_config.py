@@ -126,6 +126,13 @@ class ExecutionConfig:
     test_command: str = "pytest"
     max_concurrent_tests: int = 5
     min_parallel_time: int = 60  # Only parallelize if test >= 60s
+    early_stop: bool = False  # Cancel remaining tests once they cannot change the recommendation
+    early_stop_rank_cutoff: bool = False  # Heuristic: cancel tests ranked below a lone supported hypothesis
+    early_stop_after: int = 0  # Cancel remaining tests after K decisive results (0 = off)
+    output_buffer_bytes: int = 64 * 1024  # In-memory head+tail kept per output stream
+    kill_grace_period: float = 5.0  # Seconds between SIGTERM and SIGKILL on timeout
+    collect_resource_usage: bool = True  # Record CPU/RSS/block I/O per test via wait4()
+    batch_max_seconds: float = 0.0  # Pack short tests into shared worktrees up to this time (0 = off)
 
     # Output capture
     capture_stdout: bool = True
@@ -153,6 +160,18 @@ class ExecutionConfig:
         if self.min_parallel_time < 0:
             raise ConfigValidationError("min_parallel_time cannot be negative")
 
+        if self.early_stop_after < 0:
+            raise ConfigValidationError("early_stop_after cannot be negative")
+
+        if self.output_buffer_bytes < 0:
+            raise ConfigValidationError("output_buffer_bytes cannot be negative")
+
+        if self.kill_grace_period < 0:
+            raise ConfigValidationError("kill_grace_period cannot be negative")
+
+        if self.batch_max_seconds < 0:
+            raise ConfigValidationError("batch_max_seconds cannot be negative")
+
 
 @dataclass
 class AnalysisConfig:
@@ -401,6 +420,13 @@ class UnifiedConfig:
                 test_timeout=te.get("default_timeout", 300),
                 min_parallel_time=te.get("min_parallel_time", 60),
                 max_concurrent_tests=te.get("max_concurrent_tests", 5),
+                early_stop=te.get("early_stop", False),
+                early_stop_rank_cutoff=te.get("early_stop_rank_cutoff", False),
+                early_stop_after=te.get("early_stop_after", 0),
+                output_buffer_bytes=te.get("output_buffer_bytes", 64 * 1024),
+                kill_grace_period=te.get("kill_grace_period", 5.0),
+                collect_resource_usage=te.get("collect_resource_usage", True),
+                batch_max_seconds=te.get("batch_max_seconds", 0.0),
                 capture_stdout=te.get("capture_stdout", True),
                 capture_stderr=te.get("capture_stderr", True),
                 collect_metrics=te.get("collect_metrics", True),
@@ -621,6 +647,13 @@ class UnifiedConfig:
             min_parallel_time=self.execution.min_parallel_time,
             test_command=self.execution.test_command,
             max_concurrent_tests=self.execution.max_concurrent_tests,
+            early_stop=self.execution.early_stop,
+            early_stop_rank_cutoff=self.execution.early_stop_rank_cutoff,
+            early_stop_after=self.execution.early_stop_after,
+            output_buffer_bytes=self.execution.output_buffer_bytes,
+            kill_grace_period=self.execution.kill_grace_period,
+            collect_resource_usage=self.execution.collect_resource_usage,
+            batch_max_seconds=self.execution.batch_max_seconds,
 
             # Overhead Timings
             worktree_creation_time=self.worktree.creation_time,
@@ -716,6 +749,13 @@ class UnifiedConfig:
                 min_parallel_time=old_config.min_parallel_time,
                 test_command=old_config.test_command,
                 max_concurrent_tests=old_config.max_concurrent_tests,
+                early_stop=old_config.early_stop,
+                early_stop_rank_cutoff=old_config.early_stop_rank_cutoff,
+                early_stop_after=old_config.early_stop_after,
+                output_buffer_bytes=old_config.output_buffer_bytes,
+                kill_grace_period=old_config.kill_grace_period,
+                collect_resource_usage=old_config.collect_resource_usage,
+                batch_max_seconds=old_config.batch_max_seconds,
                 session_startup_time=old_config.session_startup_time,
                 environment_setup_time=old_config.environment_setup_time,
             ),
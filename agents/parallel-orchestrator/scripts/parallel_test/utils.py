@@ -5,7 +5,7 @@ Shared utilities for falsification debugger
 
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
 
 # Use shared infrastructure for logging
@@ -83,6 +83,52 @@ def estimate_parallelization_speedup(task_times: List[float],
     }
 
 
+def pack_hypotheses(hypotheses: List[Any],
+                    max_seconds: float,
+                    predict: Optional[Callable[[Any], float]] = None) -> List[List[Any]]:
+    """
+    Bin-pack hypotheses into batches that share one worktree
+
+    First-fit decreasing: hypotheses are placed longest first into the first
+    batch whose predicted total stays within max_seconds. Hypotheses that
+    mutate their worktree, or are predicted to take longer than max_seconds,
+    get a batch of their own.
+
+    Args:
+        hypotheses: Hypotheses to pack
+        max_seconds: Predicted run time allowed per batch (<= 0 disables packing)
+        predict: Predicted test time of a hypothesis
+            (default: its estimated_test_time)
+
+    Returns:
+        Batches in first-placement order, each sorted longest first
+    """
+    predict = predict or (lambda hyp: hyp.estimated_test_time)
+    if max_seconds <= 0:
+        return [[hyp] for hyp in hypotheses]
+
+    times = {hyp.id: predict(hyp) for hyp in hypotheses}
+    batches: List[List[Any]] = []
+    totals: List[float] = []
+
+    for hyp in sorted(hypotheses, key=lambda h: times[h.id], reverse=True):
+        if getattr(hyp, "mutates_worktree", False) or times[hyp.id] > max_seconds:
+            batches.append([hyp])
+            totals.append(float("inf"))
+            continue
+
+        for i, total in enumerate(totals):
+            if total + times[hyp.id] <= max_seconds:
+                batches[i].append(hyp)
+                totals[i] += times[hyp.id]
+                break
+        else:
+            batches.append([hyp])
+            totals.append(times[hyp.id])
+
+    return batches
+
+
 def format_duration(seconds: float) -> str:
     """
     Format duration in human-readable format
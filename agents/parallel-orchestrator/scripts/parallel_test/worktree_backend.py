@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+Worktree Backend Module
+
+Pluggable strategies for materializing an isolated checkout of the base
+repository. WorktreePool and WorktreeOrchestrator only create and remove
+trees through a backend; everything else (reset, checkout, sparse checkout,
+git status) runs plain git inside the tree and works with any backend.
+
+Backends:
+    - git: `git worktree add` (default). Writes every file of the checkout,
+      so creation time grows with the size of the tree.
+    - reflink: copy-on-write clone of a pristine template checkout with
+      `cp -a --reflink=always` (btrfs, XFS, bcachefs, APFS). Data blocks are
+      shared until written, so trees are fully independent. On filesystems
+      that cannot share extents it falls back to hardlink mode (logged as
+      an error, see below), except as root, where it fails instead.
+    - hardlink: hardlink farm of a pristine template checkout (any POSIX
+      filesystem). Only `.git` (index, HEAD, config) is copied.
+
+Templates are standalone `git clone --shared` checkouts, one per commit SHA,
+built once under an inter-process lock and evicted least recently used.
+Materializing a tree from a template is a single directory walk, typically
+well under a second.
+
+Hardlink mode is not copy-on-write: a hardlinked file shares its inode with
+the template and every other tree, so it must be replaced (write a new file,
+then rename or unlink + create) rather than modified in place. git
+checkout/reset, most editors and build tools already write this way, but a
+chmod or an in-place write would change the template for every later tree.
+Template files are made read-only so in-place writes fail with EACCES;
+processes running as root bypass this. Backends whose trees share inodes
+report shares_inodes, and WorktreeOrchestrator refuses them for hypotheses
+that change tracked files (Hypothesis.mutates_worktree).
+
+As root the two ways into hardlink mode differ on purpose: asking for
+hardlink explicitly is an informed choice and only logs a warning, while
+reflink asks for independent trees, so its fallback is refused as root
+(creation raises GitOperationError) instead of silently sharing writable
+inodes.
+
+A path that already exists is reused only if it is a checkout that can be
+reset and moved to the requested commit; otherwise it is deleted first.
+
+Usage:
+    backend = make_backend("hardlink", template_dir=worktree_dir / "templates")
+    backend.create(base_repo, pool_dir / "wt-0", commit=sha)
+    backend.remove(base_repo, pool_dir / "wt-0")
+"""
+
+import logging
+import os
+import shutil
+import stat
+import subprocess
+import threading
+import time
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+# Use shared git utilities
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.git_utils import (
+    checkout_detached,
+    create_worktree,
+    remove_worktree,
+    remove_worktrees,
+    delete_tree_dirs,
+    reset_worktree,
+    resolve_ref,
+    set_sparse_checkout,
+    sparse_directories,
+    GitOperationError
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _running_as_root() -> bool:
+    """Check whether file permissions are bypassed (effective uid 0)"""
+    return hasattr(os, "geteuid") and os.geteuid() == 0
+
+
+class WorktreeBackend(ABC):
+    """
+    Interface for creating and removing isolated checkouts
+
+    Subclasses set `name` and `supports_sparse` and implement create() and
+    remove(); remove_many() can be overridden with a cheaper bulk path.
+
+    Created trees must be git repositories with HEAD detached at the
+    requested commit, so the pool can reset and move them with git.
+    """
+
+    name = "base"
+    supports_sparse = False  # Whether create() honors sparse_paths
+
+    @property
+    def shares_inodes(self) -> bool:
+        """Whether trees share file inodes (in-place writes leak between trees)"""
+        return False
+
+    @abstractmethod
+    def create(
+        self,
+        repo_path: Path,
+        worktree_path: Path,
+        commit: Optional[str] = None,
+        sparse_paths: Optional[List[str]] = None
+    ) -> Path:
+        """
+        Materialize an isolated checkout
+
+        Args:
+            repo_path: Path to main repository
+            worktree_path: Path where the tree should be created
+            commit: Commit SHA to check out (default: current branch, detached)
+            sparse_paths: Repo-relative paths the tree needs (ignored unless
+                supports_sparse)
+
+        Returns:
+            Path to created tree
+
+        Raises:
+            GitOperationError: If the tree cannot be created
+        """
+
+    @abstractmethod
+    def remove(self, repo_path: Path, worktree_path: Path) -> None:
+        """
+        Remove a tree created by create() (non-fatal, logs warnings)
+
+        Args:
+            repo_path: Path to main repository
+            worktree_path: Path to tree to remove
+        """
+
+    def remove_many(
+        self, repo_path: Path, worktree_paths: List[Path], max_workers: int = 8
+    ) -> List[Path]:
+        """
+        Remove several trees concurrently (missing trees are skipped)
+
+        Args:
+            repo_path: Path to main repository
+            worktree_paths: Trees to remove
+            max_workers: Maximum trees removed concurrently
+
+        Returns:
+            Paths that no longer exist
+        """
+        paths = [Path(p) for p in worktree_paths]
+        if paths:
+            workers = max(1, min(max_workers, len(paths)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worktree-remove") as executor:
+                list(executor.map(lambda path: self.remove(repo_path, path), paths))
+        return [p for p in paths if not p.exists()]
+
+    def _reuse_existing(self, repo_path: Path, worktree_path: Path, commit: str) -> bool:
+        """
+        Make a tree left at worktree_path usable at commit, or delete it
+
+        Args:
+            repo_path: Path to main repository
+            worktree_path: Existing path where a tree should be created
+            commit: Commit SHA the tree must have checked out
+
+        Returns:
+            True if the tree was reset and moved to commit, False if it was
+            deleted (the caller creates a new one)
+
+        Raises:
+            GitOperationError: If an unusable tree cannot be deleted
+        """
+        # Without its own .git, git would run in an enclosing repository
+        if (worktree_path / ".git").exists():
+            try:
+                reset_worktree(worktree_path)
+                checkout_detached(worktree_path, commit)
+                logger.warning(f"Worktree already exists: {worktree_path}, reset to {commit[:12]}")
+                return True
+            except GitOperationError as e:
+                logger.warning(f"Cannot reuse existing worktree {worktree_path}: {e}")
+
+        logger.warning(f"Replacing existing directory: {worktree_path}")
+        self.remove_many(repo_path, [worktree_path])
+        if worktree_path.exists():
+            raise GitOperationError(f"Cannot replace existing directory: {worktree_path}")
+        return False
+
+    def get_stats(self) -> Dict:
+        """
+        Get backend statistics
+
+        Returns:
+            Dictionary with at least the backend name
+        """
+        return {"backend": self.name}
+
+    def __repr__(self) -> str:
+        """String representation"""
+        return f"{type(self).__name__}()"
+
+
+class GitWorktreeBackend(WorktreeBackend):
+    """Linked worktrees created with `git worktree add`"""
+
+    name = "git"
+    supports_sparse = True
+
+    def create(
+        self,
+        repo_path: Path,
+        worktree_path: Path,
+        commit: Optional[str] = None,
+        sparse_paths: Optional[List[str]] = None
+    ) -> Path:
+        """Create a linked worktree (see WorktreeBackend.create)"""
+        worktree_path = Path(worktree_path)
+        if worktree_path.exists():
+            sha = resolve_ref(repo_path, commit or "HEAD")
+            if self._reuse_existing(repo_path, worktree_path, sha):
+                try:
+                    set_sparse_checkout(
+                        worktree_path,
+                        sparse_directories(sparse_paths) if sparse_paths is not None else None
+                    )
+                except GitOperationError:
+                    logger.warning(f"Sparse checkout failed for {worktree_path}, using full checkout")
+                    set_sparse_checkout(worktree_path, None)
+                return worktree_path
+        return create_worktree(repo_path, worktree_path, branch=commit, sparse_paths=sparse_paths)
+
+    def remove(self, repo_path: Path, worktree_path: Path) -> None:
+        """Remove a linked worktree, discarding local changes"""
+        remove_worktree(repo_path, worktree_path, force=True)
+
+    def remove_many(
+        self, repo_path: Path, worktree_paths: List[Path], max_workers: int = 8
+    ) -> List[Path]:
+        """Delete worktree directories concurrently, then prune once"""
+        return remove_worktrees(repo_path, worktree_paths, max_workers=max_workers)
+
+
+class CopyOnWriteBackend(WorktreeBackend):
+    """
+    Trees cloned from pristine per-commit templates by reflink or hardlink
+
+    The template for a commit lives in `template_dir/<sha>/` and is marked
+    complete by `template_dir/<sha>.complete` (kept outside the template so
+    it is not copied into trees). Builds and evictions hold an exclusive
+    file lock on the template; materializing holds a shared one.
+    """
+
+    MODES = ("reflink", "hardlink")
+    DEFAULT_MAX_TEMPLATES = 4
+
+    # Copied trees get new inodes and ctimes (hardlinks change ctime too),
+    # so git compares only mtime and size against the copied index
+    TEMPLATE_GIT_CONFIG = (("core.checkStat", "minimal"), ("core.trustctime", "false"))
+
+    def __init__(
+        self,
+        template_dir: Path,
+        mode: str = "reflink",
+        max_templates: int = DEFAULT_MAX_TEMPLATES
+    ):
+        """
+        Initialize copy-on-write backend
+
+        Args:
+            template_dir: Directory holding pristine template checkouts
+            mode: "reflink" (falls back to hardlink when the filesystem
+                cannot share extents, except as root) or "hardlink"
+            max_templates: Least recently used templates beyond this are
+                removed (templates still being copied from are kept)
+
+        Raises:
+            ValueError: If mode is unknown
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {self.MODES}")
+
+        self.template_dir = Path(template_dir)
+        self.mode = mode
+        self.name = mode
+        self.max_templates = max(max_templates, 1)
+
+        self.template_dir.mkdir(parents=True, exist_ok=True)
+
+        self._reflink_supported = mode == "reflink"
+        self._reflink_probed = False
+        if mode == "hardlink" and _running_as_root():
+            logger.warning(
+                "Hardlink worktrees as root: read-only template files do not stop in-place "
+                "writes from reaching the template and every other tree"
+            )
+        self._stats_lock = threading.Lock()
+        self._created = 0
+        self._templates_built = 0
+        self._create_total_time = 0.0
+        self._create_max_time = 0.0
+        self._modes_used: Dict[str, int] = {}
+
+    @property
+    def shares_inodes(self) -> bool:
+        """True in hardlink mode, including after a reflink fallback"""
+        if self._reflink_supported and not self._reflink_probed:
+            self._probe_reflink()
+        return not self._reflink_supported
+
+    def _probe_reflink(self) -> None:
+        """Check once, with a scratch file, whether template_dir can share extents"""
+        self._reflink_probed = True
+        source = self.template_dir / f".reflink-probe-{os.getpid()}"
+        copy = source.with_name(source.name + ".copy")
+        try:
+            source.write_bytes(b"probe")
+            result = subprocess.run(
+                ["cp", "--reflink=always", str(source), str(copy)],
+                capture_output=True,
+                text=True
+            )
+        finally:
+            source.unlink(missing_ok=True)
+            copy.unlink(missing_ok=True)
+        if result.returncode != 0:
+            self._fall_back_to_hardlink((result.stderr.strip().splitlines() or ["cp failed"])[0])
+
+    def _fall_back_to_hardlink(self, reason: str) -> None:
+        """
+        Switch reflink mode to hardlink trees
+
+        Built templates are made read-only first, since they were not
+        protected while reflink was expected. As root the fallback is left
+        to _copy_tree to refuse.
+
+        Args:
+            reason: Why reflink failed (for the log)
+        """
+        self._reflink_supported = False
+        if _running_as_root():
+            return
+        logger.error(
+            f"Reflink unsupported under {self.template_dir} ({reason}), falling back to "
+            f"hardlink: trees share read-only inodes, so tools that edit files in place "
+            f"fail with EACCES"
+        )
+        for marker in self.template_dir.glob("*.complete"):
+            template = self.template_path(marker.name[:-len(".complete")])
+            if template.is_dir():
+                self._protect(template)
+
+    def template_path(self, commit: str) -> Path:
+        """Path of the template checkout for a commit SHA"""
+        return self.template_dir / commit
+
+    def _marker(self, commit: str) -> Path:
+        """Completion marker of a template (also its LRU timestamp)"""
+        return self.template_dir / f"{commit}.complete"
+
+    def is_built(self, commit: str) -> bool:
+        """Check whether a complete template exists for a commit SHA"""
+        return self._marker(commit).exists()
+
+    @contextmanager
+    def _template_lock(self, commit: str, shared: bool = False, blocking: bool = True):
+        """
+        Hold an inter-process lock on one template
+
+        Yields:
+            True if the lock is held (always, unless blocking=False and the
+            lock is taken)
+        """
+        if fcntl is None:
+            yield True
+            return
+
+        flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+
+        with open(self.template_dir / f"{commit}.lock", "a") as lock:
+            try:
+                fcntl.flock(lock.fileno(), flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _git(self, cwd: Path, *args: str) -> None:
+        """Run a git command, raising GitOperationError on failure"""
+        try:
+            subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise GitOperationError(f"git {args[0]} failed: {e.stderr}") from e
+
+    def _build_template(self, repo_path: Path, commit: str) -> Path:
+        """
+        Build the pristine template for a commit (no-op if already built)
+
+        Args:
+            repo_path: Path to main repository
+            commit: Full commit SHA
+
+        Returns:
+            Path to template checkout
+
+        Raises:
+            GitOperationError: If cloning or checkout fails
+        """
+        template = self.template_path(commit)
+
+        with self._template_lock(commit):
+            # Another process may have built it while we waited
+            if self.is_built(commit):
+                return template
+
+            # Discard leftovers of an interrupted build
+            if template.exists():
+                shutil.rmtree(template)
+
+            start = time.perf_counter()
+            # --shared borrows the base repository's objects via alternates,
+            # so the template's .git (copied into every tree) stays small
+            self._git(
+                self.template_dir, "clone", "--quiet", "--shared", "--no-checkout",
+                str(Path(repo_path).resolve()), str(template)
+            )
+            for key, value in self.TEMPLATE_GIT_CONFIG:
+                self._git(template, "config", key, value)
+            self._git(template, "checkout", "--quiet", "--detach", commit)
+
+            if self.mode == "hardlink" or not self._reflink_supported:
+                self._protect(template)
+
+            self._marker(commit).touch()
+
+        with self._stats_lock:
+            self._templates_built += 1
+        logger.info(f"Built worktree template {commit[:12]} in {time.perf_counter() - start:.2f}s")
+        return template
+
+    def _protect(self, template: Path) -> None:
+        """Make template files (outside .git) read-only to block in-place writes"""
+        for root, dirs, files in os.walk(template):
+            if root == str(template):
+                dirs.remove(".git")
+            for name in files:
+                path = os.path.join(root, name)
+                st = os.lstat(path)
+                if stat.S_ISREG(st.st_mode):
+                    os.chmod(path, st.st_mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+    def _copy_tree(self, template: Path, worktree_path: Path) -> str:
+        """
+        Materialize a template into worktree_path
+
+        Args:
+            template: Template checkout
+            worktree_path: Destination (must not exist)
+
+        Returns:
+            Mode actually used ("reflink" or "hardlink")
+
+        Raises:
+            GitOperationError: If reflink is unsupported and running as root
+                (read-only template files would not protect shared inodes)
+        """
+        if self._reflink_supported:
+            result = subprocess.run(
+                ["cp", "-a", "--reflink=always", str(template), str(worktree_path)],
+                capture_output=True,
+                text=True
+            )
+            if result.returncode == 0:
+                return "reflink"
+            shutil.rmtree(worktree_path, ignore_errors=True)
+            self._fall_back_to_hardlink((result.stderr.strip().splitlines() or ["cp failed"])[0])
+
+        if self.mode == "reflink" and _running_as_root():
+            raise GitOperationError(
+                f"Reflink unsupported under {self.template_dir}; refusing the hardlink fallback "
+                f"as root (writes would reach the template and every other tree). "
+                f"Use the git backend or a reflink-capable filesystem"
+            )
+
+        # Working files are shared; .git holds the mutable index and HEAD
+        shutil.copytree(
+            template, worktree_path, symlinks=True, copy_function=os.link,
+            ignore=lambda directory, names: [".git"] if directory == str(template) else []
+        )
+        shutil.copytree(template / ".git", worktree_path / ".git", symlinks=True)
+        return "hardlink"
+
+    def create(
+        self,
+        repo_path: Path,
+        worktree_path: Path,
+        commit: Optional[str] = None,
+        sparse_paths: Optional[List[str]] = None
+    ) -> Path:
+        """
+        Materialize a tree from the commit's template (see WorktreeBackend.create)
+
+        sparse_paths is ignored: sharing the template's blocks costs about
+        the same for the full tree.
+        """
+        worktree_path = Path(worktree_path)
+        worktree_path.parent.mkdir(parents=True, exist_ok=True)
+
+        commit = resolve_ref(repo_path, commit or "HEAD")
+        if worktree_path.exists() and self._reuse_existing(repo_path, worktree_path, commit):
+            return worktree_path
+
+        start = time.perf_counter()
+
+        try:
+            while True:
+                template = self._build_template(repo_path, commit)
+                with self._template_lock(commit, shared=True):
+                    # Re-check: the template may have been evicted in between
+                    if self.is_built(commit):
+                        mode = self._copy_tree(template, worktree_path)
+                        self._marker(commit).touch()
+                        break
+        except OSError as e:
+            shutil.rmtree(worktree_path, ignore_errors=True)
+            raise GitOperationError(f"Failed to materialize {worktree_path}: {e}") from e
+
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self._created += 1
+            self._create_total_time += elapsed
+            self._create_max_time = max(self._create_max_time, elapsed)
+            self._modes_used[mode] = self._modes_used.get(mode, 0) + 1
+
+        logger.info(f"Created {mode} worktree: {worktree_path} ({elapsed:.3f}s)")
+        self._evict()
+        return worktree_path
+
+    def remove(self, repo_path: Path, worktree_path: Path) -> None:
+        """Delete a materialized tree (templates are untouched)"""
+        worktree_path = Path(worktree_path)
+        if not worktree_path.exists():
+            logger.debug(f"Worktree does not exist: {worktree_path}")
+            return
+
+        try:
+            shutil.rmtree(worktree_path)
+            logger.info(f"Removed worktree: {worktree_path}")
+        except OSError as e:
+            # Non-fatal - just log warning and continue
+            logger.warning(f"Failed to remove worktree {worktree_path}: {e}")
+
+    def remove_many(
+        self, repo_path: Path, worktree_paths: List[Path], max_workers: int = 8
+    ) -> List[Path]:
+        """Delete materialized trees concurrently (templates are untouched)"""
+        paths = [Path(p) for p in worktree_paths]
+        delete_tree_dirs(paths, max_workers=max_workers)
+        return [p for p in paths if not p.exists()]
+
+    def _evict(self) -> None:
+        """Remove least recently used templates beyond max_templates"""
+        used = []
+        for marker in self.template_dir.glob("*.complete"):
+            try:
+                used.append((marker.stat().st_mtime, marker))
+            except FileNotFoundError:
+                continue  # Evicted concurrently
+
+        for _, marker in sorted(used, reverse=True)[self.max_templates:]:
+            commit = marker.name[:-len(".complete")]
+            with self._template_lock(commit, blocking=False) as locked:
+                # Skip templates other processes are building or copying
+                if not locked:
+                    continue
+                marker.unlink(missing_ok=True)
+                shutil.rmtree(self.template_path(commit), ignore_errors=True)
+                logger.info(f"Evicted worktree template {commit[:12]}")
+
+    def clear_templates(self) -> None:
+        """Remove all templates (materialized trees are unaffected)"""
+        for marker in self.template_dir.glob("*.complete"):
+            commit = marker.name[:-len(".complete")]
+            with self._template_lock(commit):
+                marker.unlink(missing_ok=True)
+                shutil.rmtree(self.template_path(commit), ignore_errors=True)
+
+    def get_stats(self) -> Dict:
+        """
+        Get backend statistics
+
+        Returns:
+            Dictionary with creation counts and timings, templates on disk
+            and the copy modes actually used
+        """
+        with self._stats_lock:
+            return {
+                "backend": self.name,
+                "created": self._created,
+                "templates_built": self._templates_built,
+                "templates": len(list(self.template_dir.glob("*.complete"))),
+                "avg_create_time": round(self._create_total_time / self._created, 4) if self._created else 0.0,
+                "max_create_time": round(self._create_max_time, 4),
+                "modes_used": dict(self._modes_used),
+            }
+
+    def __repr__(self) -> str:
+        """String representation"""
+        return f"CopyOnWriteBackend(mode={self.mode}, template_dir={self.template_dir})"
+
+
+BACKENDS = ("git",) + CopyOnWriteBackend.MODES
+
+
+def make_backend(
+    name: str,
+    template_dir: Optional[Path] = None,
+    max_templates: int = CopyOnWriteBackend.DEFAULT_MAX_TEMPLATES
+) -> WorktreeBackend:
+    """
+    Create a worktree backend by name
+
+    Args:
+        name: "git", "reflink" or "hardlink"
+        template_dir: Template directory (required for reflink/hardlink)
+        max_templates: Templates kept by copy-on-write backends
+
+    Returns:
+        WorktreeBackend instance
+
+    Raises:
+        ValueError: If name is unknown or template_dir is missing
+    """
+    if name == "git":
+        return GitWorktreeBackend()
+    if name in CopyOnWriteBackend.MODES:
+        if template_dir is None:
+            raise ValueError(f"Worktree backend {name!r} requires a template_dir")
+        return CopyOnWriteBackend(template_dir, mode=name, max_templates=max_templates)
+    raise ValueError(f"Unknown worktree backend {name!r}, expected one of {BACKENDS}")
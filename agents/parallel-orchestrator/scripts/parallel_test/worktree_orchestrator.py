@@ -5,22 +5,61 @@ Worktree Orchestration Module
 Manages git worktree lifecycle for parallel hypothesis testing
 """
 
+import json
 import logging
+import os
 import shlex
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from string import Template
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from .config import Hypothesis, FalsificationConfig
-from .worktree_pool import WorktreePool
+from .worktree_pool import AutoscalePolicy, WorktreePool
+from .worktree_backend import CopyOnWriteBackend, WorktreeBackend, make_backend
+from .env_cache import EnvironmentCache, EnvironmentCacheError
+from .result_cache import ResultCache
 
 # Use shared infrastructure
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from shared.git_utils import get_current_branch, create_worktree, remove_worktree
+from shared.git_utils import get_current_branch, resolve_ref
+from shared.duration_model import DurationModel
 
 logger = logging.getLogger(__name__)
 
 
+# Test script written into each worktree; values are shell-quoted before
+# substitution, so `$$` escapes a literal shell `$`. The header between the
+# ResultCache header markers only describes the test and is not part of its
+# result cache key.
+TEST_SCRIPT_TEMPLATE = Template("""#!/bin/bash
+set -e
+
+${header_begin}
+# Falsification test for hypothesis: $id
+# Description: $description
+# Test Strategy: $strategy
+echo "Testing hypothesis:" $id
+echo "Description:" $description
+echo "Test Strategy:" $strategy
+echo ""
+echo "Expected Behavior:" $expected
+echo ""
+${header_end}
+
+# Run the test command
+cd $worktree
+# NOTE: test_strategy is executed as a command - ensure it's trusted input
+eval $strategy
+
+# Exit code indicates test result
+exit $$?
+""")
+
+
 @dataclass
 class WorktreeConfig:
     """Configuration for worktree creation"""
@@ -29,7 +68,29 @@ class WorktreeConfig:
     branch_prefix: str = "hyp"
     max_concurrent: int = 5
     use_pool: bool = True  # Enable pooling by default for performance
+    worktree_backend: str = "git"  # git, reflink or hardlink (copies of a pristine template)
+    template_dir: Optional[Path] = None  # Default: worktree_dir / "templates"
+    max_templates: int = CopyOnWriteBackend.DEFAULT_MAX_TEMPLATES  # Per-commit templates kept
     pool_size: int = 10  # Maximum worktrees in pool
+    pool_prewarm: int = 0  # Ready worktrees kept provisioned in background
+    incremental_reset: bool = True  # Reset only dirty paths on reuse
+    reset_on_release: bool = False  # Reset released worktrees in background
+    pool_shared_state: bool = True  # Share pool state file across processes (fcntl lock)
+    pool_lease_ttl: Optional[float] = 600.0  # Seconds before an unrenewed allocation is reclaimed
+    pool_autoscale: bool = True  # Size pool from recorded demand (replaces direct fallback)
+    pool_autoscale_max: Optional[int] = None  # Upper bound for autoscaled pool size (default: pool_size)
+    pool_disk_budget_mb: Optional[float] = None  # Trim idle worktrees beyond this budget
+    sparse_checkout: bool = True  # Check out only Hypothesis.files directories when given
+    env_setup_command: Optional[str] = None  # Installs deps into cwd; enables the environment cache
+    env_cache_dir: Optional[Path] = None  # Default: worktree_dir / "env-cache"
+    env_dirs: Tuple[str, ...] = EnvironmentCache.DEFAULT_ENV_DIRS  # Cached environment directories
+    env_link_mode: str = "symlink"  # symlink (constant time), reflink or hardlink
+    learn_durations: bool = True  # Record test/overhead timings for DurationModel predictions
+    duration_db: Optional[Path] = None  # Default: worktree_dir / "durations.db"
+    result_cache: bool = True  # Reuse PASS/FAIL results for unchanged code + test script
+    result_cache_db: Optional[Path] = None  # Default: worktree_dir / "results.db"
+    result_cache_ttl: float = ResultCache.DEFAULT_TTL  # Seconds a cached result stays valid
+    result_cache_max_entries: int = ResultCache.DEFAULT_MAX_ENTRIES  # LRU eviction beyond this
 
 
 class WorktreeOrchestrator:
@@ -40,6 +101,11 @@ class WorktreeOrchestrator:
         1. Pooled mode (use_pool=True): Reuses worktrees across sessions (15x faster)
         2. Direct mode (use_pool=False): Creates/destroys worktrees each time (legacy)
 
+    Both modes create trees through the backend named by
+    config.worktree_backend: "git" (git worktree add) or "reflink" /
+    "hardlink", which copy a pristine per-commit template checkout in well
+    under a second.
+
     Performance comparison:
         - Pooled mode (first session): ~16s per worktree
         - Pooled mode (subsequent): ~0.5s per worktree (32x speedup)
@@ -74,33 +140,93 @@ class WorktreeOrchestrator:
         # Pooling configuration
         self.use_pool = use_pool if use_pool is not None else config.use_pool
 
+        self.backend: WorktreeBackend = make_backend(
+            config.worktree_backend,
+            template_dir=config.template_dir or config.worktree_dir / "templates",
+            max_templates=config.max_templates
+        )
+
         # Initialize pool if enabled
         self._pool: Optional[WorktreePool] = None
         if self.use_pool:
-            pool_dir = config.worktree_dir / "pool"
+            # Copy-based trees are not git worktrees: keep them in their own pool
+            pool_dir = config.worktree_dir / (
+                "pool" if config.worktree_backend == "git" else f"pool-{config.worktree_backend}"
+            )
             self._pool = WorktreePool(
                 base_repo=config.base_repo,
                 pool_dir=pool_dir,
                 max_size=config.pool_size,
-                auto_load=True
+                auto_load=True,
+                prewarm=config.pool_prewarm,
+                incremental_reset=config.incremental_reset,
+                reset_on_release=config.reset_on_release,
+                shared_state=config.pool_shared_state,
+                lease_ttl=config.pool_lease_ttl,
+                autoscale_policy=AutoscalePolicy(
+                    # Autoscaling only grows beyond pool_size when explicitly allowed
+                    max_size=max(config.pool_autoscale_max or 0, config.pool_size),
+                    disk_budget_mb=config.pool_disk_budget_mb
+                ),
+                backend=self.backend
             )
             logger.info(f"Initialized worktree pool: {self._pool}")
         else:
             logger.info("Worktree pooling disabled - using direct mode")
 
+        # Dependency environments shared across worktrees (keyed by lockfile hash)
+        self._env_cache: Optional[EnvironmentCache] = None
+        if config.env_setup_command:
+            self._env_cache = EnvironmentCache(
+                cache_dir=config.env_cache_dir or config.worktree_dir / "env-cache",
+                setup_command=config.env_setup_command,
+                env_dirs=config.env_dirs,
+                link_mode=config.env_link_mode
+            )
+
+        # Observed timings replace the static overhead/test time estimates
+        self.duration_model: Optional[DurationModel] = None
+        if config.learn_durations:
+            self.duration_model = DurationModel(
+                config.duration_db or config.worktree_dir / DurationModel.DB_FILE
+            )
+
+        # Results of unchanged tests, shared by executors of this pool
+        self.result_cache: Optional[ResultCache] = None
+        if config.result_cache:
+            self.result_cache = ResultCache(
+                config.result_cache_db or config.worktree_dir / ResultCache.DB_FILE,
+                ttl_seconds=config.result_cache_ttl,
+                max_entries=config.result_cache_max_entries
+            )
+
+        # "warm" once a batch was served without creating worktrees
+        self.pool_state = "cold"
+
+        # Seconds each hypothesis's test environment took to set up
+        self.setup_latency: Dict[str, float] = {}
+
+        # hypothesis_id -> hypothesis whose allocation owns its worktree
+        # (itself, unless batched into a shared worktree)
+        self._worktree_owner: Dict[str, str] = {}
+
     def __enter__(self):
-        """Context manager entry - returns self for worktree operations"""
+        """Context manager entry - pre-grows the pool and returns self"""
         self._entered = True
+        if self.use_pool and self._pool and self.config.pool_autoscale:
+            # Session start: pre-grow to observed p95 demand
+            self._pool.autoscale()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - guarantees worktree cleanup"""
         if self.use_pool and self._pool:
             # Release all worktrees back to pool
-            for hyp_id in list(self.active_worktrees.keys()):
-                self._pool.release(hyp_id)
-                logger.info(f"Released worktree for {hyp_id} back to pool")
-            # Persist pool state for next session
+            self.cleanup_worktrees(list(self.active_worktrees.keys()))
+            # Record demand, stop background threads, persist state for next session
+            self._pool.record_session_demand()
+            self._pool.stop_provisioner()
+            self._pool.stop_reaper()
             self._pool.persist_state()
         else:
             # Direct mode: cleanup worktrees completely
@@ -109,58 +235,178 @@ class WorktreeOrchestrator:
         self._entered = False
         return False  # Don't suppress exceptions
 
-    def create_worktrees(self, hypotheses: List[Hypothesis]) -> Dict[str, Path]:
+    def create_worktrees(
+        self,
+        hypotheses: List[Hypothesis],
+        ref: Optional[str] = None,
+        batches: Optional[List[List[Hypothesis]]] = None
+    ) -> Dict[str, Path]:
         """
         Create isolated worktrees for each hypothesis (FR2.1)
 
-        Uses pool if enabled (fast reuse) or creates directly (slower).
+        Uses pool if enabled (fast reuse, acquired concurrently) or creates
+        directly (slower). With pool_autoscale the pool is grown to fit the
+        batch first (within the autoscale cap and disk budget) instead of
+        falling back to direct creation when it runs out.
+
+        With batches (see TestExecutor.plan_batches), each batch gets one
+        worktree shared by all its hypotheses; it is owned by the batch's
+        first hypothesis and released once every member is cleaned up.
+
+        The batch's per-worktree time is recorded as "acquire" overhead in the
+        duration model, and pool_state becomes "warm" if no worktree had to
+        be created.
 
         Args:
             hypotheses: List of hypotheses to test
+            ref: Branch, tag or commit to test (default: base repo HEAD)
+            batches: Optional grouping of hypotheses into shared worktrees
+                (hypotheses in no batch get their own worktree)
 
         Returns:
             Mapping of hypothesis_id -> worktree_path
+
+        Raises:
+            ValueError: If hypotheses that change tracked files would get
+                hardlink worktrees (shared inodes; see worktree_backend)
         """
-        worktrees = {}
+        mutating = [hyp.id for hyp in hypotheses if hyp.mutates_worktree]
+        if mutating and self.backend.shares_inodes:
+            raise ValueError(
+                f"Hypotheses {', '.join(mutating)} change tracked files, but "
+                f"{self.backend.name} worktrees share file inodes with their template; "
+                f"use the git or reflink worktree_backend"
+            )
+
+        batched = {hyp.id for batch in batches or [] for hyp in batch}
+        groups = [list(batch) for batch in batches or [] if batch]
+        groups += [[hyp] for hyp in hypotheses if hyp.id not in batched]
+        members = {batch[0].id: batch for batch in groups}
+
+        owned = {}
+        start = time.perf_counter()
+        created_before = self._pool.get_stats()["total_worktrees"] if self._pool else 0
 
         if self.use_pool and self._pool:
             # Pooled mode: acquire from pool (reuses existing worktrees)
-            logger.info(f"Using pooled worktrees for {len(hypotheses)} hypotheses")
-
-            for hyp in hypotheses:
-                try:
-                    worktree_path = self._pool.acquire(hyp.id)
-                    self.active_worktrees[hyp.id] = worktree_path
-                    worktrees[hyp.id] = worktree_path
-                    logger.info(f"Acquired worktree for {hyp.id}: {worktree_path}")
-
-                except RuntimeError as e:
-                    logger.error(f"Pool exhausted for {hyp.id}: {e}")
-                    # Fall back to direct creation
-                    logger.warning("Falling back to direct worktree creation")
-                    worktree_path = self._create_worktree_direct(hyp.id)
-                    if worktree_path:
-                        self.active_worktrees[hyp.id] = worktree_path
-                        worktrees[hyp.id] = worktree_path
+            logger.info(
+                f"Using pooled worktrees for {len(members)} worktrees "
+                f"({sum(len(batch) for batch in groups)} hypotheses)"
+            )
+
+            if self.config.pool_autoscale:
+                self._pool.autoscale(
+                    expected_demand=len(set(self._worktree_owner.values())) + len(members)
+                )
+
+            # Acquire all worktrees concurrently (bounded by max_concurrent)
+            acquired = self._pool.acquire_many(
+                list(members),
+                max_workers=self.config.max_concurrent,
+                ref=ref,
+                sparse_paths={
+                    owner: self._batch_sparse_paths(batch) for owner, batch in members.items()
+                }
+            )
+
+            for owner in members:
+                worktree_path = acquired.get(owner)
+                if worktree_path:
+                    owned[owner] = worktree_path
+                    continue
+
+                logger.error(
+                    f"Pool could not provide worktree for {owner} "
+                    f"(max_size={self._pool.max_size}); raise pool_autoscale_max or pool_disk_budget_mb"
+                )
 
         else:
             # Direct mode: create new worktrees (legacy behavior)
-            logger.info(f"Creating {len(hypotheses)} worktrees directly (pooling disabled)")
+            logger.info(f"Creating {len(members)} worktrees directly (pooling disabled)")
 
-            for hyp in hypotheses:
-                worktree_path = self._create_worktree_direct(hyp.id)
+            for owner, batch in members.items():
+                worktree_path = self._create_worktree_direct(owner, ref, self._batch_sparse_paths(batch))
                 if worktree_path:
-                    self.active_worktrees[hyp.id] = worktree_path
-                    worktrees[hyp.id] = worktree_path
+                    owned[owner] = worktree_path
+
+        worktrees = {}
+        for owner, worktree_path in owned.items():
+            for hyp in members[owner]:
+                self.active_worktrees[hyp.id] = worktree_path
+                self._worktree_owner[hyp.id] = owner
+                worktrees[hyp.id] = worktree_path
+
+        # Warm only if the pool served the whole batch from existing worktrees
+        if self.use_pool and self._pool:
+            created = self._pool.get_stats()["total_worktrees"] > created_before
+            self.pool_state = "cold" if created else "warm"
+        else:
+            self.pool_state = "cold"
+        self._record_overhead("acquire", time.perf_counter() - start, len(owned))
 
         return worktrees
 
-    def _create_worktree_direct(self, hypothesis_id: str) -> Optional[Path]:
+    def _record_overhead(self, phase: str, elapsed: float, count: int) -> None:
+        """
+        Record amortized per-worktree overhead in the duration model
+
+        Args:
+            phase: "acquire", "setup" or "release"
+            elapsed: Wall-clock seconds the phase took for the batch
+            count: Number of worktrees in the batch
+        """
+        if self.duration_model is None or count <= 0:
+            return
+        try:
+            self.duration_model.record_overhead(phase, self.pool_state, elapsed / count)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not record {phase} overhead: {e}")
+
+    def _sparse_paths(self, hypothesis: Hypothesis) -> Optional[List[str]]:
+        """
+        Paths to check out for a hypothesis (None for a full checkout)
+
+        Args:
+            hypothesis: Hypothesis being tested
+
+        Returns:
+            Hypothesis.files if sparse checkout is enabled and files are known
+        """
+        if self.config.sparse_checkout and hypothesis.files:
+            return list(hypothesis.files)
+        return None
+
+    def _batch_sparse_paths(self, batch: List[Hypothesis]) -> Optional[List[str]]:
+        """
+        Paths to check out for hypotheses sharing a worktree
+
+        Args:
+            batch: Hypotheses that will run in the worktree
+
+        Returns:
+            Union of their sparse paths, or None if any needs a full checkout
+        """
+        paths = set()
+        for hyp in batch:
+            hyp_paths = self._sparse_paths(hyp)
+            if hyp_paths is None:
+                return None
+            paths.update(hyp_paths)
+        return sorted(paths)
+
+    def _create_worktree_direct(
+        self,
+        hypothesis_id: str,
+        ref: Optional[str] = None,
+        sparse_paths: Optional[List[str]] = None
+    ) -> Optional[Path]:
         """
         Create a worktree directly without using the pool
 
         Args:
             hypothesis_id: ID of hypothesis
+            ref: Branch, tag or commit to check out (default: current branch)
+            sparse_paths: Repo-relative paths to check out (default: everything)
 
         Returns:
             Path to created worktree or None on failure
@@ -170,23 +416,89 @@ class WorktreeOrchestrator:
         worktree_path = self.config.worktree_dir / worktree_name
 
         try:
-            # Use shared git_utils function
-            create_worktree(self.config.base_repo, worktree_path)
+            # Resolved SHA checks out detached
+            commit = resolve_ref(self.config.base_repo, ref) if ref else None
+            self.backend.create(
+                self.config.base_repo, worktree_path, commit=commit, sparse_paths=sparse_paths
+            )
             return worktree_path
 
         except Exception as e:
             logger.error(f"Failed to create worktree for {hypothesis_id}: {e}")
             return None
 
+    def _write_file(self, path: Path, content: str, mode: int = 0o644) -> None:
+        """Create or overwrite a file with the given permissions in one open"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        try:
+            os.fchmod(fd, mode)
+            os.write(fd, content.encode())
+        finally:
+            os.close(fd)
+
+    def _materialize_environment(self, worktree_path: Path, hypotheses: List[Hypothesis]) -> float:
+        """
+        Write the test script and config of each hypothesis sharing a
+        worktree, then link its dependency environment once
+
+        Args:
+            worktree_path: Path to worktree
+            hypotheses: Hypotheses that will run in the worktree
+
+        Returns:
+            Seconds spent
+
+        Raises:
+            OSError: If the files cannot be written
+            EnvironmentCacheError: If the dependency environment cannot be prepared
+        """
+        start = time.perf_counter()
+
+        # Create test directory if it doesn't exist
+        test_dir = worktree_path / ".falsification"
+        test_dir.mkdir(exist_ok=True)
+
+        for hypothesis in hypotheses:
+            # Every user-provided string is shell-quoted before substitution
+            test_script = test_dir / f"test_{hypothesis.id}.sh"
+            self._write_file(test_script, TEST_SCRIPT_TEMPLATE.substitute(
+                id=shlex.quote(hypothesis.id),
+                description=shlex.quote(hypothesis.description),
+                strategy=shlex.quote(hypothesis.test_strategy),
+                expected=shlex.quote(hypothesis.expected_behavior),
+                worktree=shlex.quote(str(worktree_path)),
+                header_begin=ResultCache.HEADER_BEGIN.decode(),
+                header_end=ResultCache.HEADER_END.decode()
+            ), mode=0o755)
+            logger.info(f"Created test script: {test_script}")
+
+            config_file = test_dir / f"config_{hypothesis.id}.json"
+            self._write_file(config_file, json.dumps({
+                "hypothesis_id": hypothesis.id,
+                "description": hypothesis.description,
+                "test_strategy": hypothesis.test_strategy,
+                "expected_behavior": hypothesis.expected_behavior,
+                "estimated_test_time": hypothesis.estimated_test_time,
+                "probability": hypothesis.probability,
+                "impact": hypothesis.impact,
+                "test_complexity": hypothesis.test_complexity,
+            }, indent=2) + "\n")
+            logger.info(f"Created config file: {config_file}")
+
+        # Link dependency environment instead of reinstalling per worktree
+        if self._env_cache:
+            self._env_cache.prepare(worktree_path)
+
+        return time.perf_counter() - start
+
     def setup_test_environment(self, worktree_path: Path, hypothesis: Hypothesis) -> bool:
         """
         Setup test environment in worktree (FR2.2)
 
         Steps:
-            1. Create test script
-            2. Install dependencies (if needed)
-            3. Create test configuration
-            4. Initialize logging
+            1. Create test script (from the shared script template)
+            2. Create test configuration (JSON)
+            3. Link cached dependency environment (built once per lockfile hash)
 
         Args:
             worktree_path: Path to worktree
@@ -196,98 +508,126 @@ class WorktreeOrchestrator:
             True if setup successful
         """
         try:
-            # Create test directory if it doesn't exist
-            test_dir = worktree_path / ".falsification"
-            test_dir.mkdir(exist_ok=True)
-
-            # Write hypothesis test script with proper shell escaping
-            test_script = test_dir / f"test_{hypothesis.id}.sh"
-
-            # Escape all user-provided strings for shell safety
-            safe_id = shlex.quote(hypothesis.id)
-            safe_description = shlex.quote(hypothesis.description)
-            safe_strategy = shlex.quote(hypothesis.test_strategy)
-            safe_expected = shlex.quote(hypothesis.expected_behavior)
-            safe_worktree = shlex.quote(str(worktree_path))
+            elapsed = self._materialize_environment(worktree_path, [hypothesis])
+        except EnvironmentCacheError as e:
+            logger.error(f"Failed to prepare dependency environment: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to setup test environment: {e}")
+            return False
 
-            test_script_content = f"""#!/bin/bash
-# Falsification test for hypothesis: {safe_id}
-# Description: {safe_description}
-# Test Strategy: {safe_strategy}
+        self.setup_latency[hypothesis.id] = elapsed
+        logger.info(f"Test environment setup complete for {hypothesis.id} ({elapsed:.3f}s)")
+        self._record_overhead("setup", elapsed, 1)
+        return True
 
-set -e
+    def setup_test_environments(
+        self, worktrees: Dict[str, Path], hypotheses: List[Hypothesis]
+    ) -> Dict[str, float]:
+        """
+        Setup the test environments of a batch of hypotheses in one pass
 
-echo "Testing hypothesis:" {safe_id}
-echo "Description:" {safe_description}
-echo "Test Strategy:" {safe_strategy}
-echo ""
-echo "Expected Behavior:" {safe_expected}
-echo ""
+        Environments are materialized concurrently (bounded by
+        max_concurrent), one task per worktree, so hypotheses sharing a
+        worktree link its dependency environment once. The batch's
+        wall-clock time per worktree is recorded as "setup" overhead in the
+        duration model.
 
-# Run the test command
-cd {safe_worktree}
-# NOTE: test_strategy is executed as a command - ensure it's trusted input
-eval {safe_strategy}
+        Args:
+            worktrees: Mapping of hypothesis_id -> worktree_path
+            hypotheses: Hypotheses to set up (those without a worktree are skipped)
 
-# Exit code indicates test result
-exit $?
-"""
-            test_script.write_text(test_script_content)
-            test_script.chmod(0o755)
-            logger.info(f"Created test script: {test_script}")
+        Returns:
+            Mapping of hypothesis_id -> setup latency in seconds for each
+            successful setup (hypotheses sharing a worktree report its
+            latency; failures are logged and omitted)
+        """
+        batch = [hyp for hyp in hypotheses if hyp.id in worktrees]
+        if not batch:
+            return {}
 
-            # Create configuration file
-            config_file = test_dir / f"config_{hypothesis.id}.json"
-            config_content = f"""{{
-  "hypothesis_id": "{hypothesis.id}",
-  "description": "{hypothesis.description}",
-  "test_strategy": "{hypothesis.test_strategy}",
-  "expected_behavior": "{hypothesis.expected_behavior}",
-  "estimated_test_time": {hypothesis.estimated_test_time},
-  "probability": {hypothesis.probability},
-  "impact": {hypothesis.impact},
-  "test_complexity": {hypothesis.test_complexity}
-}}
-"""
-            config_file.write_text(config_content)
-            logger.info(f"Created config file: {config_file}")
+        # Hypotheses batched into a shared worktree are set up together
+        groups: Dict[Path, List[Hypothesis]] = {}
+        for hyp in batch:
+            groups.setdefault(worktrees[hyp.id], []).append(hyp)
 
-            logger.info(f"Test environment setup complete for {hypothesis.id}")
-            return True
+        def setup(worktree_path: Path) -> Optional[float]:
+            ids = ", ".join(hyp.id for hyp in groups[worktree_path])
+            try:
+                return self._materialize_environment(worktree_path, groups[worktree_path])
+            except EnvironmentCacheError as e:
+                logger.error(f"Failed to prepare dependency environment for {ids}: {e}")
+            except Exception as e:
+                logger.error(f"Failed to setup test environment for {ids}: {e}")
+            return None
 
-        except Exception as e:
-            logger.error(f"Failed to setup test environment: {e}")
-            return False
+        start = time.perf_counter()
+        workers = max(1, min(self.config.max_concurrent, len(groups)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worktree-setup") as executor:
+            latencies = dict(zip(groups, executor.map(setup, groups)))
+        elapsed = time.perf_counter() - start
+
+        ready = {
+            hyp.id: latency
+            for worktree_path, latency in latencies.items() if latency is not None
+            for hyp in groups[worktree_path]
+        }
+        self.setup_latency.update(ready)
+        self._record_overhead("setup", elapsed, sum(1 for t in latencies.values() if t is not None))
+
+        for hyp_id, latency in ready.items():
+            logger.info(f"Test environment setup complete for {hyp_id} ({latency:.3f}s)")
+        logger.info(
+            f"Set up {len(ready)}/{len(batch)} test environments in {len(groups)} worktrees "
+            f"in {elapsed:.3f}s ({elapsed / len(groups):.3f}s per worktree)"
+        )
+        return ready
 
     def cleanup_worktrees(self, hypothesis_ids: List[str]) -> None:
         """
         Remove worktrees after testing (FR2.3)
 
         Behavior depends on mode:
-            - Pooled: Releases worktrees back to pool (fast)
-            - Direct: Removes worktrees completely (slow)
+            - Pooled: Releases worktrees back to pool in one state update (fast)
+            - Direct: Deletes worktrees concurrently, then collapses their
+              git metadata with a single prune
+
+        A worktree shared by a batch of hypotheses is freed once all of
+        them are cleaned up. Unknown or already cleaned up IDs are
+        skipped, so repeated calls are harmless.
 
         Args:
             hypothesis_ids: List of hypothesis IDs to clean up
         """
+        start = time.perf_counter()
+        for hyp_id in hypothesis_ids:
+            if hyp_id not in self.active_worktrees:
+                logger.warning(f"Worktree not found for {hyp_id}")
+        active = [h for h in dict.fromkeys(hypothesis_ids) if h in self.active_worktrees]
+
+        # A shared worktree is freed only once none of its hypotheses remain
+        released: Dict[str, Path] = {}
+        for hyp_id in active:
+            owner = self._worktree_owner.pop(hyp_id, hyp_id)
+            released[owner] = self.active_worktrees.pop(hyp_id)
+        in_use = set(self._worktree_owner.values())
+        released = {owner: path for owner, path in released.items() if owner not in in_use}
+
         if self.use_pool and self._pool:
             # Pooled mode: release back to pool
-            for hyp_id in hypothesis_ids:
-                if hyp_id in self.active_worktrees:
-                    self._pool.release(hyp_id)
-                    del self.active_worktrees[hyp_id]
-                    logger.info(f"Released worktree for {hyp_id} to pool")
+            self._pool.release_many(list(released))
         else:
-            # Direct mode: remove worktrees
-            for hyp_id in hypothesis_ids:
-                worktree_path = self.active_worktrees.get(hyp_id)
-                if not worktree_path:
-                    logger.warning(f"Worktree not found for {hyp_id}")
-                    continue
-
-                # Use shared git_utils function (handles errors gracefully)
-                remove_worktree(self.config.base_repo, worktree_path)
-                del self.active_worktrees[hyp_id]
+            # Direct mode: bulk removal (backend handles errors gracefully)
+            removed = set(self.backend.remove_many(
+                self.config.base_repo,
+                list(released.values()),
+                max_workers=self.config.max_concurrent
+            ))
+            for owner, worktree_path in released.items():
+                if worktree_path not in removed:
+                    logger.warning(f"Failed to remove worktree {worktree_path} for {owner}")
+
+        self._record_overhead("release", time.perf_counter() - start, len(released))
 
     def get_worktree_path(self, hypothesis_id: str) -> Optional[Path]:
         """
@@ -326,6 +666,33 @@ exit $?
             return self._pool.get_stats()
         return None
 
+    def get_env_cache_stats(self) -> Optional[Dict]:
+        """
+        Get dependency environment cache statistics (if enabled)
+
+        Returns:
+            Dictionary with cache metrics or None if the cache is disabled
+        """
+        if self._env_cache:
+            return self._env_cache.get_stats()
+        return None
+
+    def get_setup_stats(self) -> Dict:
+        """
+        Get test environment setup latency
+
+        Returns:
+            Dictionary with count, average and maximum seconds, and the
+            latency of each hypothesis's worktree
+        """
+        latencies = list(self.setup_latency.values())
+        return {
+            "count": len(latencies),
+            "avg_seconds": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+            "max_seconds": round(max(latencies), 4) if latencies else 0.0,
+            "per_worktree": {hyp_id: round(t, 4) for hyp_id, t in self.setup_latency.items()},
+        }
+
     def cleanup_pool(self) -> None:
         """
         Completely cleanup the worktree pool
@@ -350,8 +717,10 @@ exit $?
             try:
                 if self.use_pool and self._pool:
                     # Release to pool
-                    for hyp_id in list(self.active_worktrees.keys()):
-                        self._pool.release(hyp_id)
+                    self.cleanup_worktrees(list(self.active_worktrees.keys()))
+                    self._pool.record_session_demand()
+                    self._pool.stop_provisioner()
+                    self._pool.stop_reaper()
                     self._pool.persist_state()
                 else:
                     # Direct cleanup
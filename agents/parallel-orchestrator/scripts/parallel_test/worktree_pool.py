@@ -5,34 +5,110 @@ Worktree Pool Module
 Manages a persistent pool of git worktrees for reuse across testing sessions.
 Achieves up to 15x speedup by avoiding repeated worktree creation/destruction.
 
+Worktrees are tracked by the commit SHA they have checked out, so one pool
+serves any branch or commit: acquire() moves a reused tree to the requested
+commit with a cheap `git checkout --detach` instead of recreating it.
+All worktrees share the base repository's object store, and acquire() can
+restrict a tree to a sparse checkout of the paths a hypothesis needs.
+Trees are created through a pluggable WorktreeBackend: `git worktree add` by
+default, or reflink/hardlink copies of a pristine template checkout.
+
+The state file is shared safely between processes: every change runs under
+an inter-process file lock, merges the on-disk state, and is written back
+atomically (write-then-rename), so concurrent sessions never hand out the
+same worktree twice.
+
+Allocations are leases owned by a PID and kept alive by a heartbeat. A reaper
+returns leases whose owner died (or stopped heartbeating) to the pool, so
+crashed sessions do not shrink the pool over time.
+
+The pool records peak concurrent demand per session and can autoscale:
+pre-grow to the observed p95 demand before a session, and trim idle
+worktrees that exceed a disk budget.
+
 Performance:
     - First session: ~16s per worktree (creation + setup + cleanup)
     - Subsequent sessions: ~0.5s per worktree (git reset only)
+    - Pre-warmed pool: ~0ms per worktree (created/reset in background)
     - Speedup: Up to 32x for repeated testing
 """
 
 import json
 import logging
+import os
+import shutil
+import tempfile
 import threading
+import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Set
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass, asdict, field
 from contextlib import contextmanager
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
 # Use shared git utilities
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.git_utils import (
     get_current_branch,
-    create_worktree,
-    remove_worktree,
+    resolve_ref,
+    checkout_detached,
+    sparse_directories,
+    set_sparse_checkout,
+    get_sparse_directories,
     reset_worktree,
     GitOperationError
 )
+from .worktree_backend import WorktreeBackend, GitWorktreeBackend
 
 logger = logging.getLogger(__name__)
 
 
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process with this PID exists on this host"""
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    except OSError:
+        return False
+    return True
+
+
+@dataclass
+class WorktreeLease:
+    """Allocation of a worktree to a hypothesis by an owning process"""
+    pid: Optional[int]  # Owner PID (None for allocations from pre-lease state files)
+    heartbeat: float  # time.time() of the last renewal
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WorktreeLease":
+        """Load from dictionary"""
+        return cls(pid=data.get("pid"), heartbeat=float(data.get("heartbeat", 0.0)))
+
+
+@dataclass
+class AutoscalePolicy:
+    """Demand-driven sizing policy for WorktreePool.autoscale()"""
+    percentile: float = 95.0  # Demand percentile the pool is grown to
+    history_size: int = 20  # Session peaks remembered
+    max_size: int = 32  # Hard cap on autoscaled pool size
+    disk_budget_mb: Optional[float] = None  # Idle worktrees beyond this are trimmed
+
+
 @dataclass
 class WorktreePoolState:
     """Persistent state for worktree pool"""
@@ -42,6 +118,12 @@ class WorktreePoolState:
     available_worktrees: list  # Worktree names that are free
     allocated_worktrees: dict  # hypothesis_id -> worktree_name mapping
     total_worktrees: int  # Total worktrees in pool
+    worktree_heads: dict = field(default_factory=dict)  # worktree_name -> HEAD SHA
+    ready_worktrees: list = field(default_factory=list)  # Subset of available already reset
+    claimed_worktrees: dict = field(default_factory=dict)  # worktree_name -> owner PID (in-flight)
+    leases: dict = field(default_factory=dict)  # hypothesis_id -> WorktreeLease dict
+    demand_history: list = field(default_factory=list)  # Peak concurrent demand per session
+    worktree_sparse: dict = field(default_factory=dict)  # worktree_name -> cone dirs (absent = full)
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
@@ -49,8 +131,9 @@ class WorktreePoolState:
 
     @classmethod
     def from_dict(cls, data: Dict) -> "WorktreePoolState":
-        """Load from dictionary"""
-        return cls(**data)
+        """Load from dictionary (unknown keys are ignored)"""
+        known_fields = {f for f in cls.__dataclass_fields__}
+        return cls(**{k: v for k, v in data.items() if k in known_fields})
 
 
 class WorktreePool:
@@ -60,9 +143,22 @@ class WorktreePool:
     Key Features:
         - Lazy initialization: Creates worktrees on-demand
         - Session persistence: Stores pool state in .worktree_pool.json
+        - Multi-process safe: fcntl-locked, atomically written shared state
         - Automatic cleanup: Resets worktrees to clean state on reuse
         - Thread-safe: Protects concurrent acquire/release operations
         - Context manager: Automatic release of worktrees
+        - Pre-warming: Background provisioner keeps `prewarm` worktrees
+          created and reset, so acquire() never waits on git
+        - Reset on release: Released worktrees are reset in the background
+          (dirty -> resetting -> ready) so reuse is instant
+        - Commit tracking: Each worktree's HEAD SHA is recorded; acquire()
+          checks out the requested ref (default: base repo HEAD)
+        - Leases: Allocations record the owner PID and a heartbeat; the
+          reaper reclaims leases of dead or silent owners
+        - Autoscaling: Grows to p95 of recorded session demand and trims
+          idle worktrees beyond a disk budget
+        - Sparse checkout: acquire(sparse_paths=...) materializes only the
+          directories a hypothesis needs; falls back to a full checkout
 
     Usage:
         pool = WorktreePool(base_repo, pool_dir, max_size=10)
@@ -79,21 +175,41 @@ class WorktreePool:
             # ... use worktree ...
             # Automatically released on exit
 
+        # Serve a different branch or commit from the same pool
+        worktree_path = pool.acquire("hypothesis_2", ref="feature-branch")
+
+        # Only check out what the test needs
+        worktree_path = pool.acquire("hypothesis_3", sparse_paths=["src/parser/"])
+
     Performance:
         - First acquire: ~8s (worktree creation)
         - Subsequent acquires: ~0.5s (git reset)
+        - Pre-warmed acquires: milliseconds (no git on the critical path)
         - Cleanup: ~3s (on pool destruction only)
     """
 
     STATE_FILE = ".worktree_pool.json"
+    LOCK_FILE = ".worktree_pool.lock"
+    POLL_INTERVAL = 0.5  # Seconds between checks while waiting on in-flight worktrees
     WORKTREE_PREFIX = "pool-wt"
+    PROVISION_RETRY_DELAY = 5.0  # Seconds to back off after a failed provision
+    DEFAULT_ACQUIRE_WORKERS = 8  # Concurrent git operations in acquire_many()
+    DEFAULT_LEASE_TTL = 600.0  # Seconds without heartbeat before a lease expires
+    MAX_REAP_INTERVAL = 30.0  # Upper bound on seconds between reaper passes
 
     def __init__(
         self,
         base_repo: Path,
         pool_dir: Path,
         max_size: int = 10,
-        auto_load: bool = True
+        auto_load: bool = True,
+        prewarm: int = 0,
+        incremental_reset: bool = True,
+        reset_on_release: bool = False,
+        shared_state: bool = True,
+        lease_ttl: Optional[float] = DEFAULT_LEASE_TTL,
+        autoscale_policy: Optional[AutoscalePolicy] = None,
+        backend: Optional[WorktreeBackend] = None
     ):
         """
         Initialize worktree pool
@@ -103,68 +219,392 @@ class WorktreePool:
             pool_dir: Directory to store pooled worktrees
             max_size: Maximum number of worktrees in pool
             auto_load: Automatically load state from previous session
+            prewarm: Number of reset, ready-to-use worktrees to keep
+                provisioned in the background (0 disables the provisioner)
+            incremental_reset: Reset only dirty paths (git status) instead of
+                checking out and cleaning the whole tree
+            reset_on_release: Reset released worktrees in the background so
+                the next acquire gets an already-clean tree
+            shared_state: Synchronize every change with the on-disk state
+                under an inter-process lock, so several processes can share
+                the pool. Note the on-disk pool is merged on first use even
+                with auto_load=False; pass False for a private pool that is
+                only written by persist_state()
+            lease_ttl: Seconds a lease survives without a heartbeat. The
+                owning pool renews its leases every lease_ttl / 3 seconds;
+                None expires leases only when the owner process is gone
+            autoscale_policy: Sizing policy used by autoscale()
+                (default: AutoscalePolicy())
+            backend: How worktrees are created and removed
+                (default: GitWorktreeBackend). Backends without sparse
+                support always get full checkouts
         """
         self.base_repo = Path(base_repo)
         self.pool_dir = Path(pool_dir)
         self.max_size = max_size
+        self._state_max_size = 0  # max_size recorded in the shared state file
+        self.prewarm = min(max(prewarm, 0), max_size)
+        self.incremental_reset = incremental_reset
+        self.reset_on_release = reset_on_release
+        self.lease_ttl = lease_ttl
+        self.autoscale_policy = autoscale_policy or AutoscalePolicy()
+        self.backend = backend or GitWorktreeBackend()
+        self.shared_state = shared_state and fcntl is not None
+        if shared_state and fcntl is None:
+            logger.warning("fcntl unavailable: pool state is not shared between processes")
 
         # Ensure directories exist
         self.pool_dir.mkdir(parents=True, exist_ok=True)
 
         # Thread safety for concurrent operations
         self._lock = threading.Lock()
-
-        # Pool state
-        self._available: Set[str] = set()  # Free worktree names
+        self._cond = threading.Condition(self._lock)
+
+        # Pool state: free worktrees move dirty -> resetting -> ready
+        self._dirty: Set[str] = set()  # Free, awaiting reset
+        self._resetting: Set[str] = set()  # Being reset in background
+        self._ready: Set[str] = set()  # Free and already reset
+        self._provisioning: Set[str] = set()  # Being created in background
+        self._acquiring: Set[str] = set()  # Claimed by an in-progress acquire
+        self._foreign_claims: Dict[str, int] = {}  # In-flight in other processes -> PID
         self._allocated: Dict[str, str] = {}  # hypothesis_id -> worktree_name
+        self._leases: Dict[str, WorktreeLease] = {}  # hypothesis_id -> lease
+        self._leases_reaped = 0
+
+        # Demand tracking for autoscaling
+        self._session_peak = 0  # Peak concurrent demand this session
+        self._demand_history: List[int] = []  # Peaks of previous sessions
+        self._worktree_size: Optional[int] = None  # Cached disk usage estimate (bytes)
         self._worktree_paths: Dict[str, Path] = {}  # worktree_name -> Path
+        self._worktree_heads: Dict[str, str] = {}  # worktree_name -> HEAD SHA
+        self._worktree_sparse: Dict[str, List[str]] = {}  # worktree_name -> cone dirs (absent = full)
         self._total_created = 0
 
+        # Reset timing metrics (guarded by _stats_lock, updated outside _lock)
+        self._stats_lock = threading.Lock()
+        self._reset_count = 0
+        self._reset_clean_count = 0
+        self._reset_total_time = 0.0
+        self._reset_max_time = 0.0
+
+        # Background provisioner
+        self._provisioner: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Lease heartbeat / reaper
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+
         # Load previous state if exists
         if auto_load:
             self.load_state()
 
+        if self.prewarm > 0 or self.reset_on_release:
+            self.start_provisioner()
+
+        self.start_reaper()
+
+    @property
+    def _available(self) -> Set[str]:
+        """Free worktrees that can be handed out (ready or dirty)"""
+        return self._ready | self._dirty
+
     @property
     def state_file(self) -> Path:
         """Path to persistent state file"""
         return self.pool_dir / self.STATE_FILE
 
-    def _create_worktree(self, worktree_name: str) -> Path:
+    @property
+    def lock_file(self) -> Path:
+        """Path to inter-process lock file"""
+        return self.pool_dir / self.LOCK_FILE
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        Hold an exclusive inter-process lock on the pool state
+
+        Uses fcntl.flock on a dedicated lock file (the state file itself is
+        replaced by rename, so it cannot carry the lock).
+        """
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.lock_file, "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _local_claims(self) -> Set[str]:
+        """Worktrees this process is working on outside the lock"""
+        return self._resetting | self._provisioning | self._acquiring
+
+    def _read_state(self) -> Optional[WorktreePoolState]:
+        """
+        Read the on-disk pool state (caller must hold the file lock)
+
+        Returns:
+            WorktreePoolState, or None if missing or unreadable
+        """
+        if not self.state_file.exists():
+            return None
+
+        try:
+            with open(self.state_file, 'r') as f:
+                return WorktreePoolState.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable pool state {self.state_file}: {e}")
+            return None
+
+    def _snapshot_state(self) -> WorktreePoolState:
+        """Build the persistent state from memory (caller must hold the lock)"""
+        pid = os.getpid()
+        claimed = dict(self._foreign_claims)
+        claimed.update({name: pid for name in self._local_claims()})
+
+        return WorktreePoolState(
+            pool_dir=str(self.pool_dir),
+            base_repo=str(self.base_repo),
+            max_size=max(self.max_size, self._state_max_size),
+            available_worktrees=sorted(self._ready | self._dirty),
+            allocated_worktrees=dict(self._allocated),
+            total_worktrees=self._total_created,
+            worktree_heads=dict(self._worktree_heads),
+            ready_worktrees=sorted(self._ready),
+            claimed_worktrees=claimed,
+            leases={hyp_id: lease.to_dict() for hyp_id, lease in self._leases.items()},
+            demand_history=list(self._demand_history),
+            worktree_sparse={name: list(dirs) for name, dirs in self._worktree_sparse.items()}
+        )
+
+    def _write_state(self, data: Optional[Dict] = None) -> None:
+        """
+        Atomically write pool state (caller must hold both locks)
+
+        Writes a temp file in the pool directory, fsyncs it and renames it
+        over the state file, so readers never see a partial write.
+
+        Args:
+            data: Serialized state to write (default: snapshot of memory)
+        """
+        if data is None:
+            data = self._snapshot_state().to_dict()
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f"{self.STATE_FILE}.", suffix=".tmp", dir=self.pool_dir
+        )
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _merge_state(self, state: WorktreePoolState) -> None:
+        """
+        Merge on-disk state into memory (caller must hold the lock)
+
+        The disk is authoritative for everything except worktrees this
+        process is currently working on outside the lock.
+
+        Args:
+            state: State read from disk
+        """
+        local = self._local_claims()
+
+        available = set(state.available_worktrees) - local
+        self._ready = set(state.ready_worktrees) & available
+        self._dirty = available - self._ready
+        self._allocated = dict(state.allocated_worktrees)
+        self._leases = {
+            hyp_id: WorktreeLease.from_dict(data) for hyp_id, data in state.leases.items()
+            if hyp_id in self._allocated
+        }
+        # Allocations from pre-lease state files: start the expiry clock now
+        for hyp_id in self._allocated:
+            self._leases.setdefault(hyp_id, WorktreeLease(pid=None, heartbeat=time.time()))
+        self._foreign_claims = {
+            name: owner for name, owner in state.claimed_worktrees.items()
+            if name not in local
+        }
+        self._total_created = state.total_worktrees
+        # Each process keeps its own configured limit; the file only records
+        # the largest one so processes with different limits don't rewrite it
+        self._state_max_size = state.max_size
+        self._demand_history = list(state.demand_history)
+
+        # Update in place: git threads write entries for their local claims
+        known = available | set(self._allocated.values()) | set(self._foreign_claims) | local
+        for worktree_name in list(self._worktree_paths):
+            if worktree_name not in known:
+                del self._worktree_paths[worktree_name]
+        for worktree_name in known:
+            self._worktree_paths.setdefault(worktree_name, self.pool_dir / worktree_name)
+
+        for worktree_name in list(self._worktree_heads):
+            if worktree_name not in known:
+                self._worktree_heads.pop(worktree_name, None)
+        for worktree_name, sha in state.worktree_heads.items():
+            if worktree_name in known and worktree_name not in local:
+                self._worktree_heads[worktree_name] = sha
+
+        for worktree_name in list(self._worktree_sparse):
+            if worktree_name not in local:
+                self._worktree_sparse.pop(worktree_name, None)
+        for worktree_name, dirs in state.worktree_sparse.items():
+            if worktree_name in known and worktree_name not in local:
+                self._worktree_sparse[worktree_name] = list(dirs)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Run a state change under the pool lock
+
+        With shared_state, also holds the inter-process file lock, merges
+        the on-disk state before the change and atomically writes the result
+        afterwards (skipped if the body raises or changed nothing, so idle
+        pollers don't rewrite and fsync the state file).
+        """
+        with self._cond:
+            if not self.shared_state:
+                yield
+                return
+
+            with self._file_lock():
+                state = self._read_state()
+                if state is not None:
+                    if state.base_repo == str(self.base_repo):
+                        self._merge_state(state)
+                    else:
+                        logger.warning(
+                            f"Base repo mismatch: state={state.base_repo}, current={self.base_repo}. "
+                            "Overwriting pool state."
+                        )
+                yield
+                data = self._snapshot_state().to_dict()
+                if state is None or data != state.to_dict():
+                    self._write_state(data)
+
+    def _create_worktree(
+        self,
+        worktree_name: str,
+        commit: Optional[str] = None,
+        sparse: Optional[List[str]] = None
+    ) -> Path:
         """
         Create a new worktree in the pool
 
         Args:
             worktree_name: Unique name for worktree
+            commit: Commit SHA to check out (default: base repo current branch)
+            sparse: Cone-mode directories to check out (None for full checkout)
 
         Returns:
             Path to created worktree
         """
         worktree_path = self.pool_dir / worktree_name
 
-        # Skip if already exists
+        # A leftover tree (e.g. from a crashed session) is only reused once it
+        # is reset and at the commit; anything that isn't a checkout is replaced
         if worktree_path.exists():
-            logger.info(f"Worktree already exists: {worktree_path}")
             self._worktree_paths[worktree_name] = worktree_path
-            return worktree_path
+            if (worktree_path / ".git").exists():
+                logger.info(f"Worktree already exists: {worktree_path}, resetting for reuse")
+                self._record_head(worktree_name)
+                self._record_sparse(worktree_name)
+                return self._prepare_worktree(
+                    worktree_name, create=False,
+                    commit=commit or resolve_ref(self.base_repo), sparse=sparse
+                )
+            logger.warning(f"Replacing non-worktree directory: {worktree_path}")
+            shutil.rmtree(worktree_path)
 
         try:
-            # Use shared git_utils to create worktree
-            create_worktree(self.base_repo, worktree_path)
+            # A SHA checks out detached; directories with a trailing slash
+            # are taken as-is
+            self.backend.create(
+                self.base_repo, worktree_path, commit=commit,
+                sparse_paths=[f"{d}/" for d in sparse] if sparse is not None else None
+            )
             self._worktree_paths[worktree_name] = worktree_path
+            self._record_head(worktree_name)
+            if sparse is not None:
+                # The git backend falls back to a full checkout on failure
+                self._record_sparse(worktree_name)
+            else:
+                self._worktree_sparse.pop(worktree_name, None)
             return worktree_path
 
         except GitOperationError as e:
             logger.error(f"Failed to create worktree {worktree_name}: {e}")
             raise
 
+    def _record_head(self, worktree_name: str) -> None:
+        """
+        Record the HEAD SHA a worktree currently has checked out
+
+        Args:
+            worktree_name: Name of worktree to inspect
+        """
+        try:
+            self._worktree_heads[worktree_name] = resolve_ref(self._worktree_paths[worktree_name])
+        except GitOperationError:
+            # Unknown head forces a checkout on next acquire
+            self._worktree_heads.pop(worktree_name, None)
+
+    def _record_sparse(self, worktree_name: str) -> None:
+        """
+        Record the sparse-checkout directories a worktree actually has
+
+        Args:
+            worktree_name: Name of worktree to inspect
+        """
+        dirs = get_sparse_directories(self._worktree_paths[worktree_name])
+        if dirs is None:
+            self._worktree_sparse.pop(worktree_name, None)
+        else:
+            self._worktree_sparse[worktree_name] = dirs
+
+    def _pick_worktree(
+        self, candidates: Set[str], commit: str, sparse: Optional[List[str]] = None
+    ) -> str:
+        """
+        Take a worktree from candidates, preferring one already at commit
+        with the same sparse checkout (caller must hold the lock)
+
+        Args:
+            candidates: Set of worktree names to choose from (modified in place)
+            commit: Target commit SHA
+            sparse: Target cone-mode directories (None for full checkout)
+
+        Returns:
+            Chosen worktree name
+        """
+        def score(worktree_name: str) -> int:
+            return (
+                (self._worktree_heads.get(worktree_name) == commit) +
+                (self._worktree_sparse.get(worktree_name) == sparse)
+            )
+
+        worktree_name = max(candidates, key=score)
+        candidates.discard(worktree_name)
+        return worktree_name
+
     def _reset_worktree(self, worktree_path: Path) -> bool:
         """
         Reset worktree to clean state for reuse
 
         Steps:
-            1. Discard all changes (git checkout HEAD -- .)
+            1. Discard all changes (git checkout HEAD -- ., or only the
+               dirty paths from git status in incremental mode)
             2. Remove untracked files (git clean -fd)
-            3. Verify clean state
+            3. Record reset timing for get_stats()
 
         Args:
             worktree_path: Path to worktree to reset
@@ -174,128 +614,647 @@ class WorktreePool:
         """
         try:
             # Use shared git_utils to reset worktree
-            reset_worktree(worktree_path)
-            logger.debug(f"Reset worktree: {worktree_path}")
+            start = time.perf_counter()
+            dirty = reset_worktree(worktree_path, incremental=self.incremental_reset)
+            elapsed = time.perf_counter() - start
+
+            with self._stats_lock:
+                self._reset_count += 1
+                self._reset_total_time += elapsed
+                self._reset_max_time = max(self._reset_max_time, elapsed)
+                if dirty == 0:
+                    self._reset_clean_count += 1
+
+            logger.debug(f"Reset worktree: {worktree_path} ({elapsed * 1000:.0f}ms)")
             return True
 
         except GitOperationError as e:
             logger.error(f"Failed to reset worktree {worktree_path}: {e}")
             return False
 
-    def _remove_worktree(self, worktree_name: str) -> bool:
+    def _remove_worktrees(self, worktree_names: List[str]) -> List[str]:
         """
-        Remove a worktree from the pool
+        Remove several worktrees in one bulk pass
+
+        Directories are deleted concurrently and the backend collapses their
+        metadata at once (a single `git worktree prune` for git worktrees).
 
         Args:
-            worktree_name: Name of worktree to remove
+            worktree_names: Names of worktrees to remove
 
         Returns:
-            True if removal successful
+            Names of worktrees removed (tracking dropped)
         """
-        worktree_path = self._worktree_paths.get(worktree_name)
-        if not worktree_path:
-            logger.warning(f"Worktree path not found for {worktree_name}")
-            return False
+        paths = {
+            name: self._worktree_paths[name]
+            for name in worktree_names if name in self._worktree_paths
+        }
+        if not paths:
+            return []
+
+        gone = set(self.backend.remove_many(
+            self.base_repo, list(paths.values()), max_workers=self.DEFAULT_ACQUIRE_WORKERS
+        ))
+
+        removed = []
+        for name, path in paths.items():
+            if path in gone:
+                del self._worktree_paths[name]
+                self._worktree_heads.pop(name, None)
+                self._worktree_sparse.pop(name, None)
+                removed.append(name)
+            else:
+                logger.warning(f"Failed to remove worktree {path}")
+        return removed
 
-        try:
-            # Use shared git_utils to remove worktree (force=True for cleanup)
-            remove_worktree(self.base_repo, worktree_path, force=True)
-            logger.info(f"Removed worktree: {worktree_path}")
+    def _next_worktree_name(self) -> str:
+        """
+        Pick the lowest unused worktree name (caller must hold the lock)
 
-            # Clean up tracking
-            del self._worktree_paths[worktree_name]
-            return True
+        Returns:
+            Worktree name not currently tracked by the pool
+        """
+        in_use = set(self._worktree_paths) | set(self._allocated.values())
+        index = 0
+        while f"{self.WORKTREE_PREFIX}-{index:03d}" in in_use:
+            index += 1
+        return f"{self.WORKTREE_PREFIX}-{index:03d}"
 
-        except Exception as e:
-            logger.warning(f"Failed to remove worktree {worktree_path}: {e}")
-            return False
+    def _reserve_new_worktree(self) -> str:
+        """
+        Reserve a slot for a new worktree (caller must hold the lock)
+
+        The name is registered immediately so concurrent reservations never
+        collide, while the slow `git worktree add` runs outside the lock.
+
+        Returns:
+            Reserved worktree name
+        """
+        worktree_name = self._next_worktree_name()
+        self._worktree_paths[worktree_name] = self.pool_dir / worktree_name
+        self._total_created += 1
+        return worktree_name
+
+    def _discard_worktree(self, worktree_name: str) -> None:
+        """
+        Forget a worktree that could not be prepared (caller must hold the lock)
 
-    def acquire(self, hypothesis_id: str) -> Path:
+        Args:
+            worktree_name: Name of worktree to drop from tracking
+        """
+        if self._worktree_paths.pop(worktree_name, None) is not None:
+            self._total_created -= 1
+        self._worktree_heads.pop(worktree_name, None)
+        self._worktree_sparse.pop(worktree_name, None)
+        self._dirty.discard(worktree_name)
+        self._ready.discard(worktree_name)
+
+    def _prepare_worktree(
+        self,
+        worktree_name: str,
+        create: bool,
+        commit: Optional[str] = None,
+        reset: bool = True,
+        sparse: Optional[List[str]] = None
+    ) -> Path:
+        """
+        Create, reset and/or move a worktree so it is ready for use
+
+        Runs git without holding the pool lock.
+
+        Args:
+            worktree_name: Name of worktree to prepare
+            create: Whether the worktree must be created first
+            commit: Commit SHA the worktree must have checked out
+                (None keeps the current HEAD)
+            reset: Whether to discard local changes first
+            sparse: Cone-mode directories to check out (None for full checkout)
+
+        Returns:
+            Path to prepared worktree
+
+        Raises:
+            GitOperationError: If the worktree cannot be created
+        """
+        if create:
+            return self._create_worktree(worktree_name, commit, sparse)
+
+        worktree_path = self._worktree_paths[worktree_name]
+
+        if reset and not self._reset_worktree(worktree_path):
+            # If reset fails, try to create fresh worktree (keep the name
+            # registered so no concurrent reservation can claim it)
+            logger.warning(f"Reset failed for {worktree_name}, attempting to recreate")
+            return self._recreate_worktree(worktree_name, commit, sparse)
+
+        if self._worktree_sparse.get(worktree_name) != sparse:
+            try:
+                set_sparse_checkout(worktree_path, sparse)
+            except GitOperationError:
+                logger.warning(f"Sparse checkout failed for {worktree_name}, using full checkout")
+                try:
+                    set_sparse_checkout(worktree_path, None)
+                except GitOperationError:
+                    return self._recreate_worktree(worktree_name, commit)
+                sparse = None
+            if sparse is None:
+                self._worktree_sparse.pop(worktree_name, None)
+            else:
+                self._worktree_sparse[worktree_name] = sparse
+
+        if commit and self._worktree_heads.get(worktree_name) != commit:
+            try:
+                checkout_detached(worktree_path, commit)
+                self._worktree_heads[worktree_name] = commit
+                logger.info(f"Moved worktree {worktree_name} to {commit[:12]}")
+            except GitOperationError:
+                logger.warning(f"Checkout failed for {worktree_name}, attempting to recreate")
+                return self._recreate_worktree(worktree_name, commit, sparse)
+
+        return worktree_path
+
+    def _recreate_worktree(
+        self,
+        worktree_name: str,
+        commit: Optional[str] = None,
+        sparse: Optional[List[str]] = None
+    ) -> Path:
+        """
+        Remove and recreate a broken worktree under the same name
+
+        Args:
+            worktree_name: Name of worktree to recreate
+            commit: Commit SHA to check out
+            sparse: Cone-mode directories to check out (None for full checkout)
+
+        Returns:
+            Path to recreated worktree
+
+        Raises:
+            GitOperationError: If the broken worktree cannot be removed or
+                the new one cannot be created
+        """
+        worktree_path = self._worktree_paths[worktree_name]
+        self.backend.remove(self.base_repo, worktree_path)
+        # Never hand the broken tree back as a leftover to reuse
+        shutil.rmtree(worktree_path, ignore_errors=True)
+        if worktree_path.exists():
+            raise GitOperationError(f"Could not remove broken worktree: {worktree_path}")
+        self._worktree_heads.pop(worktree_name, None)
+        self._worktree_sparse.pop(worktree_name, None)
+        return self._create_worktree(worktree_name, commit, sparse)
+
+    def acquire(
+        self,
+        hypothesis_id: str,
+        ref: Optional[str] = None,
+        sparse_paths: Optional[List[str]] = None
+    ) -> Path:
         """
         Acquire a worktree from the pool
 
         Process:
             1. Check if hypothesis already has allocated worktree
-            2. Try to get available worktree from pool
-            3. If pool empty and < max_size, create new worktree
-            4. If pool full, raise exception
-            5. Reset worktree to clean state
-            6. Mark as allocated to hypothesis
+            2. Prefer a ready (already reset) worktree
+            3. Otherwise take a dirty worktree and reset it
+            4. If pool empty and < max_size, create new worktree
+            5. If worktrees are being created or reset, wait for one
+            6. If pool full, raise exception
+            7. Check out the target commit if the worktree is elsewhere
+            8. Apply the requested sparse checkout (or restore a full one)
+            9. Mark as allocated to hypothesis
+
+        Git commands never run while the pool lock is held, so concurrent
+        acquire/release calls are not serialized behind worktree creation.
 
         Args:
             hypothesis_id: Unique identifier for hypothesis
+            ref: Branch, tag or commit to check out (default: base repo HEAD)
+            sparse_paths: Repo-relative paths the hypothesis needs; only their
+                directories (and top-level files) are checked out. None or
+                empty gives a full checkout
 
         Returns:
             Path to acquired worktree
 
         Raises:
             RuntimeError: If pool is exhausted and at max capacity
+            GitOperationError: If ref cannot be resolved
         """
-        with self._lock:
-            # Check if already allocated
-            if hypothesis_id in self._allocated:
-                worktree_name = self._allocated[hypothesis_id]
-                worktree_path = self._worktree_paths[worktree_name]
-                logger.info(f"Hypothesis {hypothesis_id} already has worktree: {worktree_path}")
-                return worktree_path
-
-            # Try to get from available pool
-            if self._available:
-                worktree_name = self._available.pop()
-                logger.info(f"Reusing worktree from pool: {worktree_name}")
-
-            # Create new worktree if pool not at capacity
-            elif self._total_created < self.max_size:
-                worktree_name = f"{self.WORKTREE_PREFIX}-{self._total_created:03d}"
-                self._create_worktree(worktree_name)
-                self._total_created += 1
-                logger.info(f"Created new worktree: {worktree_name} ({self._total_created}/{self.max_size})")
-
-            # Pool exhausted
-            else:
-                raise RuntimeError(
-                    f"Worktree pool exhausted: {self._total_created} worktrees in use, "
-                    f"max capacity {self.max_size}. Release worktrees or increase pool size."
+        commit = resolve_ref(self.base_repo, ref or "HEAD")
+        sparse = (
+            sparse_directories(sparse_paths)
+            if sparse_paths and self.backend.supports_sparse else None
+        )
+
+        while True:
+            with self._transaction():
+                # Check if already allocated
+                if hypothesis_id in self._allocated:
+                    worktree_name = self._allocated[hypothesis_id]
+                    worktree_path = self._worktree_paths[worktree_name]
+                    logger.info(f"Hypothesis {hypothesis_id} already has worktree: {worktree_path}")
+                    return worktree_path
+
+                # Concurrent demand: held + being acquired + this request
+                self._session_peak = max(
+                    self._session_peak, len(self._allocated) + len(self._acquiring) + 1
                 )
 
-            # Reset worktree to clean state
-            worktree_path = self._worktree_paths[worktree_name]
-            if not self._reset_worktree(worktree_path):
-                # If reset fails, try to create fresh worktree
-                logger.warning(f"Reset failed for {worktree_name}, attempting to recreate")
-                self._remove_worktree(worktree_name)
-                worktree_path = self._create_worktree(worktree_name)
+                # Nothing free: reclaim expired leases before giving up
+                if not self._available and self._total_created >= self.max_size:
+                    self._reap_expired()
+
+                # Ready worktree: no git work needed
+                if self._ready:
+                    worktree_name = self._pick_worktree(self._ready, commit, sparse)
+                    create, reset = False, False
+                    logger.info(f"Using ready worktree from pool: {worktree_name}")
+
+                # Dirty worktree not yet picked up by the background reset
+                elif self._dirty:
+                    worktree_name = self._pick_worktree(self._dirty, commit, sparse)
+                    create, reset = False, True
+                    logger.info(f"Reusing worktree from pool: {worktree_name}")
+
+                # Create new worktree if pool not at capacity
+                elif self._total_created < self.max_size:
+                    worktree_name = self._reserve_new_worktree()
+                    create, reset = True, False
+                    logger.info(f"Creating new worktree: {worktree_name} ({self._total_created}/{self.max_size})")
+
+                # Pool exhausted (nothing in flight that could free up)
+                elif not (self._provisioning or self._resetting or self._foreign_claims):
+                    raise RuntimeError(
+                        f"Worktree pool exhausted: {self._total_created} worktrees in use, "
+                        f"max capacity {self.max_size}. Release worktrees or increase pool size."
+                    )
+
+                else:
+                    worktree_name = None
+
+                if worktree_name:
+                    # Claim it, and wake the provisioner so it can refill
+                    self._acquiring.add(worktree_name)
+                    self._cond.notify_all()
+
+            if worktree_name:
+                break
 
+            # Wait for an in-flight worktree (here or in another process)
+            logger.debug(
+                f"Waiting for {len(self._provisioning)} provisioning, "
+                f"{len(self._resetting)} resetting, "
+                f"{len(self._foreign_claims)} foreign worktree(s)"
+            )
+            with self._cond:
+                self._cond.wait(self.POLL_INTERVAL)
+
+        try:
+            worktree_path = self._prepare_worktree(
+                worktree_name, create=create, commit=commit, reset=reset, sparse=sparse
+            )
+        except Exception:
+            with self._transaction():
+                self._acquiring.discard(worktree_name)
+                self._discard_worktree(worktree_name)
+                self._cond.notify_all()
+            raise
+
+        with self._transaction():
             # Mark as allocated
+            self._acquiring.discard(worktree_name)
             self._allocated[hypothesis_id] = worktree_name
+            self._leases[hypothesis_id] = WorktreeLease(pid=os.getpid(), heartbeat=time.time())
 
-            logger.info(f"Acquired worktree for {hypothesis_id}: {worktree_path}")
-            return worktree_path
+        logger.info(f"Acquired worktree for {hypothesis_id}: {worktree_path}")
+        return worktree_path
+
+    def acquire_many(
+        self,
+        hypothesis_ids: Iterable[str],
+        max_workers: Optional[int] = None,
+        ref: Optional[str] = None,
+        sparse_paths: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Path]:
+        """
+        Acquire worktrees for several hypotheses concurrently
+
+        Creation and reset run in a bounded thread pool, so N cold worktrees
+        cost roughly one `git worktree add` instead of N.
+
+        Args:
+            hypothesis_ids: Hypotheses requiring worktrees
+            max_workers: Maximum concurrent git operations
+                (default: DEFAULT_ACQUIRE_WORKERS)
+            ref: Branch, tag or commit to check out (default: base repo HEAD)
+            sparse_paths: Optional hypothesis_id -> paths for sparse checkout
+
+        Returns:
+            Mapping of hypothesis_id -> worktree_path. Hypotheses that could
+            not be acquired (pool exhausted or git failure) are omitted.
+        """
+        hypothesis_ids = list(dict.fromkeys(hypothesis_ids))
+        if not hypothesis_ids:
+            return {}
+
+        # Resolve once so every worktree lands on the same commit
+        commit = resolve_ref(self.base_repo, ref or "HEAD")
+
+        workers = min(max_workers or self.DEFAULT_ACQUIRE_WORKERS, len(hypothesis_ids))
+        worktrees: Dict[str, Path] = {}
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worktree-acquire") as executor:
+            futures = {
+                hyp_id: executor.submit(
+                    self.acquire, hyp_id, commit, (sparse_paths or {}).get(hyp_id)
+                )
+                for hyp_id in hypothesis_ids
+            }
+            for hyp_id, future in futures.items():
+                try:
+                    worktrees[hyp_id] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to acquire worktree for {hyp_id}: {e}")
+
+        logger.info(f"Acquired {len(worktrees)}/{len(hypothesis_ids)} worktrees concurrently")
+        return worktrees
 
     def release(self, hypothesis_id: str) -> bool:
         """
         Release a worktree back to the pool
 
+        The worktree is marked dirty. With reset_on_release it is queued
+        for a background reset and only becomes ready once that finishes;
+        otherwise it is reset by the acquire that reuses it.
+
         Args:
             hypothesis_id: Hypothesis that was using the worktree
 
         Returns:
             True if release successful
         """
-        with self._lock:
+        with self._transaction():
             worktree_name = self._allocated.pop(hypothesis_id, None)
+            self._leases.pop(hypothesis_id, None)
 
             if not worktree_name:
                 logger.warning(f"No worktree allocated for hypothesis {hypothesis_id}")
                 return False
 
-            # Return to available pool
-            self._available.add(worktree_name)
+            # Return to pool as dirty; wakes the background reset
+            self._dirty.add(worktree_name)
+            self._cond.notify_all()
             logger.info(f"Released worktree {worktree_name} from {hypothesis_id}")
             return True
 
+    def release_many(self, hypothesis_ids: Iterable[str]) -> int:
+        """
+        Release several worktrees back to the pool in one state transaction
+
+        Args:
+            hypothesis_ids: Hypotheses that were using worktrees
+
+        Returns:
+            Number of worktrees released
+        """
+        released = 0
+        with self._transaction():
+            for hypothesis_id in hypothesis_ids:
+                worktree_name = self._allocated.pop(hypothesis_id, None)
+                self._leases.pop(hypothesis_id, None)
+                if not worktree_name:
+                    logger.warning(f"No worktree allocated for hypothesis {hypothesis_id}")
+                    continue
+                self._dirty.add(worktree_name)
+                released += 1
+
+            if released:
+                self._cond.notify_all()
+        logger.info(f"Released {released} worktrees to pool")
+        return released
+
+    def _lease_expired(self, lease: WorktreeLease, now: float) -> bool:
+        """Check whether a lease's owner is gone or has stopped heartbeating"""
+        if lease.pid is not None and not _pid_alive(lease.pid):
+            return True
+        return self.lease_ttl is not None and now - lease.heartbeat > self.lease_ttl
+
+    def _reap_expired(self) -> int:
+        """
+        Return expired leases and dead processes' claims to the pool
+        (caller must hold the lock)
+
+        Reclaimed worktrees are marked dirty, so they are reset (or
+        recreated, if left half-built) before anyone reuses them.
+
+        Returns:
+            Number of worktrees reclaimed
+        """
+        now = time.time()
+        reclaimed = 0
+
+        for hypothesis_id, worktree_name in list(self._allocated.items()):
+            lease = self._leases.get(hypothesis_id)
+            if lease is None or not self._lease_expired(lease, now):
+                continue
+            del self._allocated[hypothesis_id]
+            self._leases.pop(hypothesis_id, None)
+            self._dirty.add(worktree_name)
+            reclaimed += 1
+            logger.warning(
+                f"Reclaimed worktree {worktree_name} from expired lease of {hypothesis_id} "
+                f"(pid={lease.pid}, idle {now - lease.heartbeat:.0f}s)"
+            )
+
+        for worktree_name, owner in list(self._foreign_claims.items()):
+            if _pid_alive(owner):
+                continue
+            del self._foreign_claims[worktree_name]
+            self._dirty.add(worktree_name)
+            reclaimed += 1
+            logger.warning(f"Reclaimed worktree {worktree_name} claimed by dead process {owner}")
+
+        if reclaimed:
+            self._leases_reaped += reclaimed
+            self._cond.notify_all()
+        return reclaimed
+
+    def renew_leases(self) -> int:
+        """
+        Refresh the heartbeat of every lease owned by this process
+
+        Returns:
+            Number of leases renewed
+        """
+        pid = os.getpid()
+        now = time.time()
+        with self._transaction():
+            owned = [lease for lease in self._leases.values() if lease.pid == pid]
+            for lease in owned:
+                lease.heartbeat = now
+        return len(owned)
+
+    def reap_expired_leases(self) -> int:
+        """
+        Reclaim worktrees whose lease owner died or stopped heartbeating
+
+        Returns:
+            Number of worktrees returned to the pool
+        """
+        with self._transaction():
+            return self._reap_expired()
+
+    def start_reaper(self) -> None:
+        """
+        Start the background lease thread
+
+        Renews this process's leases and reaps expired ones every
+        lease_ttl / 3 seconds (at most MAX_REAP_INTERVAL).
+        """
+        if self._reaper and self._reaper.is_alive():
+            return
+
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(
+            target=self._reaper_loop,
+            name="worktree-pool-reaper",
+            daemon=True
+        )
+        self._reaper.start()
+
+    def stop_reaper(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background lease thread
+
+        Args:
+            timeout: Maximum seconds to wait for the thread to exit
+        """
+        if not self._reaper:
+            return
+
+        self._reaper_stop.set()
+        self._reaper.join(timeout)
+        self._reaper = None
+
+    def _reaper_loop(self) -> None:
+        """Background loop that heartbeats own leases and reaps expired ones"""
+        interval = self.MAX_REAP_INTERVAL
+        if self.lease_ttl is not None:
+            interval = min(self.lease_ttl / 3, interval)
+
+        while not self._reaper_stop.wait(interval):
+            try:
+                self.renew_leases()
+                self.reap_expired_leases()
+            except Exception as e:
+                logger.error(f"Lease maintenance failed: {e}")
+
+    def start_provisioner(self) -> None:
+        """
+        Start the background provisioner thread
+
+        The provisioner keeps `prewarm` worktrees created and reset in the
+        ready set, refilling after every acquire, and resets released
+        worktrees when reset_on_release is enabled.
+        """
+        if self._provisioner and self._provisioner.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._provisioner = threading.Thread(
+            target=self._provision_loop,
+            name="worktree-pool-provisioner",
+            daemon=True
+        )
+        self._provisioner.start()
+        logger.info(
+            f"Started worktree provisioner "
+            f"(prewarm={self.prewarm}, reset_on_release={self.reset_on_release})"
+        )
+
+    def stop_provisioner(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background provisioner and wait for in-flight git work
+
+        Args:
+            timeout: Maximum seconds to wait for the thread to exit
+        """
+        if not self._provisioner:
+            return
+
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._provisioner.join(timeout)
+        self._provisioner = None
+        logger.info("Stopped worktree provisioner")
+
+    def _next_provision_job(self) -> Optional[Tuple[str, bool]]:
+        """
+        Decide the next background provisioning step (caller must hold the lock)
+
+        Returns:
+            (worktree_name, create) tuple, or None if there is nothing to do
+        """
+        in_flight = len(self._provisioning) + len(self._resetting)
+        below_target = len(self._ready) + in_flight < self.prewarm
+
+        # Reset released (dirty) worktrees before creating new ones
+        if self._dirty and (self.reset_on_release or below_target):
+            worktree_name = min(self._dirty)
+            self._dirty.discard(worktree_name)
+            self._resetting.add(worktree_name)
+            return worktree_name, False
+
+        if below_target and self._total_created < self.max_size:
+            worktree_name = self._reserve_new_worktree()
+            self._provisioning.add(worktree_name)
+            return worktree_name, True
+
+        return None
+
+    def _provision_loop(self) -> None:
+        """Background loop that keeps the ready set at the prewarm target"""
+        while not self._stop_event.is_set():
+            with self._transaction():
+                job = self._next_provision_job()
+
+            if job is None:
+                # Poll as well: other processes change shared state silently
+                with self._cond:
+                    if not self._stop_event.is_set():
+                        self._cond.wait(self.POLL_INTERVAL)
+                continue
+
+            worktree_name, create = job
+            try:
+                self._prepare_worktree(worktree_name, create=create)
+                succeeded = True
+            except Exception as e:
+                logger.error(f"Failed to provision worktree {worktree_name}: {e}")
+                succeeded = False
+
+            with self._transaction():
+                self._provisioning.discard(worktree_name)
+                self._resetting.discard(worktree_name)
+                if succeeded:
+                    self._ready.add(worktree_name)
+                    logger.info(f"Provisioned ready worktree: {worktree_name}")
+                else:
+                    self._discard_worktree(worktree_name)
+                self._cond.notify_all()
+
+            if not succeeded:
+                self._stop_event.wait(self.PROVISION_RETRY_DELAY)
+
     @contextmanager
-    def worktree(self, hypothesis_id: str):
+    def worktree(
+        self,
+        hypothesis_id: str,
+        ref: Optional[str] = None,
+        sparse_paths: Optional[List[str]] = None
+    ):
         """
         Context manager for automatic worktree acquire/release
 
@@ -307,45 +1266,66 @@ class WorktreePool:
 
         Args:
             hypothesis_id: Hypothesis requiring worktree
+            ref: Branch, tag or commit to check out (default: base repo HEAD)
+            sparse_paths: Repo-relative paths to check out (default: everything)
 
         Yields:
             Path to acquired worktree
         """
-        worktree_path = self.acquire(hypothesis_id)
+        worktree_path = self.acquire(hypothesis_id, ref, sparse_paths)
         try:
             yield worktree_path
         finally:
             self.release(hypothesis_id)
 
-    def expand_pool(self, count: int = 1) -> int:
+    def expand_pool(self, count: int = 1, max_workers: Optional[int] = None) -> int:
         """
-        Add more worktrees to the pool
+        Add more ready worktrees to the pool
+
+        Names are reserved under the lock; the worktrees are then created
+        concurrently without holding it.
 
         Args:
             count: Number of worktrees to add
+            max_workers: Maximum concurrent git operations
+                (default: DEFAULT_ACQUIRE_WORKERS)
 
         Returns:
             Number of worktrees actually added
         """
-        with self._lock:
-            added = 0
-            for i in range(count):
-                if self._total_created >= self.max_size:
-                    logger.warning(f"Cannot expand pool: at max capacity {self.max_size}")
-                    break
+        with self._transaction():
+            names = []
+            while len(names) < count and self._total_created < self.max_size:
+                worktree_name = self._reserve_new_worktree()
+                self._provisioning.add(worktree_name)
+                names.append(worktree_name)
+
+        if len(names) < count:
+            logger.warning(f"Cannot expand pool by {count}: at max capacity {self.max_size}")
+        if not names:
+            return 0
+
+        workers = min(max_workers or self.DEFAULT_ACQUIRE_WORKERS, len(names))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worktree-expand") as executor:
+            futures = {
+                name: executor.submit(self._prepare_worktree, name, True)
+                for name in names
+            }
 
-                worktree_name = f"{self.WORKTREE_PREFIX}-{self._total_created:03d}"
-                try:
-                    self._create_worktree(worktree_name)
-                    self._available.add(worktree_name)
-                    self._total_created += 1
+        added = 0
+        with self._transaction():
+            for worktree_name, future in futures.items():
+                self._provisioning.discard(worktree_name)
+                if future.exception() is None:
+                    self._ready.add(worktree_name)
                     added += 1
-                except Exception as e:
-                    logger.error(f"Failed to expand pool: {e}")
-                    break
+                else:
+                    logger.error(f"Failed to expand pool: {future.exception()}")
+                    self._discard_worktree(worktree_name)
+            self._cond.notify_all()
 
             logger.info(f"Expanded pool by {added} worktrees (total: {self._total_created})")
-            return added
+        return added
 
     def shrink_pool(self, count: int = 1) -> int:
         """
@@ -357,50 +1337,156 @@ class WorktreePool:
         Returns:
             Number of worktrees actually removed
         """
+        with self._transaction():
+            # Prefer dropping dirty worktrees over ready ones
+            candidates = sorted(self._dirty) + sorted(self._ready)
+            if not candidates:
+                logger.info("No available worktrees to remove")
+                return 0
+
+            chosen = candidates[:count]
+            removed = self._remove_worktrees(chosen)
+            for worktree_name in removed:
+                self._dirty.discard(worktree_name)
+                self._ready.discard(worktree_name)
+            self._total_created -= len(removed)
+
+            logger.info(f"Shrunk pool by {len(removed)} worktrees (total: {self._total_created})")
+            return len(removed)
+
+    def record_session_demand(self) -> int:
+        """
+        Close the demand window: store this session's peak in the history
+
+        Returns:
+            Peak concurrent demand recorded (0 if nothing was acquired)
+        """
+        with self._transaction():
+            peak = self._session_peak
+            if peak > 0:
+                self._demand_history.append(peak)
+                del self._demand_history[:-self.autoscale_policy.history_size]
+            self._session_peak = 0
+        return peak
+
+    def demand_percentile(self, percentile: Optional[float] = None) -> int:
+        """
+        Observed session demand at a percentile (nearest-rank)
+
+        Args:
+            percentile: Percentile in 0-100 (default: policy percentile)
+
+        Returns:
+            Demand in worktrees, 0 if no history
+        """
         with self._lock:
-            removed = 0
-            for i in range(count):
-                if not self._available:
-                    logger.info("No available worktrees to remove")
-                    break
-
-                worktree_name = self._available.pop()
-                if self._remove_worktree(worktree_name):
-                    self._total_created -= 1
-                    removed += 1
-                else:
-                    # Put back if removal failed
-                    self._available.add(worktree_name)
-                    break
+            history = sorted(self._demand_history)
+        if not history:
+            return 0
+
+        pct = self.autoscale_policy.percentile if percentile is None else percentile
+        rank = max(1, -(-len(history) * pct // 100))  # ceil without float drift
+        return history[min(int(rank), len(history)) - 1]
+
+    def _estimate_worktree_size(self) -> Optional[int]:
+        """
+        Estimate disk usage of one worktree in bytes (cached)
+
+        Measures an existing pooled worktree, falling back to the base repo
+        checkout (both excluding .git).
+        """
+        if self._worktree_size is not None:
+            return self._worktree_size
 
-            logger.info(f"Shrunk pool by {removed} worktrees (total: {self._total_created})")
-            return removed
+        with self._lock:
+            candidates = [self._worktree_paths[name] for name in sorted(self._available)
+                          if name in self._worktree_paths]
+
+        for root in candidates + [self.base_repo]:
+            if not root.is_dir():
+                continue
+            total = 0
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if d != ".git"]
+                for filename in filenames:
+                    try:
+                        total += os.lstat(os.path.join(dirpath, filename)).st_size
+                    except OSError:
+                        pass
+            self._worktree_size = max(total, 1)
+            return self._worktree_size
+
+        return None
+
+    def autoscale(self, expected_demand: int = 0) -> Dict:
+        """
+        Size the pool from recorded demand before a session
+
+        Grows max_size and pre-creates ready worktrees up to the policy
+        percentile of past session peaks (or expected_demand, if larger),
+        capped by the policy max_size and disk budget. Idle worktrees
+        beyond the disk budget are removed.
+
+        Args:
+            expected_demand: Worktrees the caller is about to acquire in total
+
+        Returns:
+            Dictionary with target, created, trimmed and max_size
+        """
+        policy = self.autoscale_policy
+        target = min(max(self.demand_percentile(), expected_demand), policy.max_size)
+
+        budget_count = None
+        if policy.disk_budget_mb is not None:
+            size = self._estimate_worktree_size()
+            if size:
+                budget_count = int(policy.disk_budget_mb * 1024 * 1024 // size)
+                target = min(target, budget_count)
+
+        with self._transaction():
+            if target > self.max_size:
+                logger.info(f"Autoscale: raising max_size {self.max_size} -> {target}")
+                self.max_size = target
+            missing = target - self._total_created
+            excess = self._total_created - budget_count if budget_count is not None else 0
+
+        created = self.expand_pool(missing) if missing > 0 else 0
+        trimmed = self.shrink_pool(excess) if excess > 0 else 0
+
+        logger.info(
+            f"Autoscaled pool: target={target}, created={created}, trimmed={trimmed}, "
+            f"total={self._total_created}"
+        )
+        return {
+            "target": target,
+            "created": created,
+            "trimmed": trimmed,
+            "max_size": self.max_size,
+        }
 
     def persist_state(self) -> bool:
         """
         Save pool state to disk for session persistence
 
+        With shared_state the local view is merged into the on-disk state;
+        otherwise the on-disk state is replaced. Either way the file is
+        written atomically under the inter-process lock.
+
         Returns:
             True if save successful
         """
-        with self._lock:
-            state = WorktreePoolState(
-                pool_dir=str(self.pool_dir),
-                base_repo=str(self.base_repo),
-                max_size=self.max_size,
-                available_worktrees=list(self._available),
-                allocated_worktrees=dict(self._allocated),
-                total_worktrees=self._total_created
-            )
-
-            try:
-                with open(self.state_file, 'w') as f:
-                    json.dump(state.to_dict(), f, indent=2)
-                logger.info(f"Persisted pool state to {self.state_file}")
-                return True
-            except Exception as e:
-                logger.error(f"Failed to persist pool state: {e}")
-                return False
+        try:
+            if self.shared_state:
+                with self._transaction():
+                    pass
+            else:
+                with self._lock, self._file_lock():
+                    self._write_state()
+            logger.info(f"Persisted pool state to {self.state_file}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to persist pool state: {e}")
+            return False
 
     def load_state(self) -> bool:
         """
@@ -414,10 +1500,11 @@ class WorktreePool:
             return False
 
         try:
-            with open(self.state_file, 'r') as f:
-                state_dict = json.load(f)
+            with self._file_lock():
+                state = self._read_state()
 
-            state = WorktreePoolState.from_dict(state_dict)
+            if state is None:
+                return False
 
             # Validate state matches current configuration
             if state.base_repo != str(self.base_repo):
@@ -429,20 +1516,17 @@ class WorktreePool:
 
             # Restore state
             with self._lock:
-                self._available = set(state.available_worktrees)
-                self._allocated = dict(state.allocated_worktrees)
-                self._total_created = state.total_worktrees
-                self.max_size = max(self.max_size, state.max_size)  # Use larger max_size
+                self._merge_state(state)
 
-                # Rebuild worktree paths by checking filesystem
-                for worktree_name in (self._available | set(self._allocated.values())):
+                # Check worktrees still exist on the filesystem
+                for worktree_name in self._available:
                     worktree_path = self.pool_dir / worktree_name
-                    if worktree_path.exists():
-                        self._worktree_paths[worktree_name] = worktree_path
-                    else:
+                    if not worktree_path.exists():
                         logger.warning(f"Worktree missing: {worktree_path}, will recreate on next acquire")
                         # Remove from tracking
-                        self._available.discard(worktree_name)
+                        self._dirty.discard(worktree_name)
+                        self._ready.discard(worktree_name)
+                        self._worktree_paths.pop(worktree_name, None)
                         # Note: allocated worktrees will be recreated on next acquire
 
             logger.info(
@@ -459,30 +1543,50 @@ class WorktreePool:
         """
         Remove all worktrees from the pool
 
+        Allocations are dropped and every tree (including stray pool
+        directories a crashed session left behind) is deleted in one
+        concurrent pass followed by a single metadata prune. Safe to call
+        repeatedly.
+
         Warning: This is destructive and removes all pooled worktrees
         """
-        with self._lock:
-            # Release all allocated worktrees
-            for hypothesis_id in list(self._allocated.keys()):
-                self.release(hypothesis_id)
+        self.stop_provisioner()
+        self.stop_reaper()
+
+        with self._transaction():
+            # Drop allocations in place (release() would re-take the lock)
+            for hypothesis_id, worktree_name in self._allocated.items():
+                logger.info(f"Dropping allocation of {worktree_name} by {hypothesis_id}")
 
-            # Remove all worktrees
-            all_worktrees = list(self._worktree_paths.keys())
-            for worktree_name in all_worktrees:
-                self._remove_worktree(worktree_name)
+            # Untracked leftovers are removed along with tracked worktrees
+            for path in self.pool_dir.glob(f"{self.WORKTREE_PREFIX}-*"):
+                if path.is_dir():
+                    self._worktree_paths.setdefault(path.name, path)
+
+            removed = self._remove_worktrees(list(self._worktree_paths))
+            logger.info(f"Removed {len(removed)} pooled worktrees")
 
             # Clear state
-            self._available.clear()
+            self._dirty.clear()
+            self._resetting.clear()
+            self._ready.clear()
+            self._provisioning.clear()
+            self._acquiring.clear()
+            self._foreign_claims.clear()
             self._allocated.clear()
+            self._leases.clear()
             self._worktree_paths.clear()
+            self._worktree_heads.clear()
+            self._worktree_sparse.clear()
             self._total_created = 0
 
-            # Remove state file
+        # Remove state file
+        with self._lock, self._file_lock():
             if self.state_file.exists():
                 self.state_file.unlink()
                 logger.info("Removed pool state file")
 
-            logger.info("Cleaned up all worktrees from pool")
+        logger.info("Cleaned up all worktrees from pool")
 
     def get_stats(self) -> Dict:
         """
@@ -491,15 +1595,43 @@ class WorktreePool:
         Returns:
             Dictionary with pool metrics
         """
+        with self._stats_lock:
+            reset_stats = {
+                "resets": self._reset_count,
+                "clean_resets": self._reset_clean_count,
+                "reset_time_total": round(self._reset_total_time, 3),
+                "reset_time_avg": round(self._reset_total_time / self._reset_count, 3) if self._reset_count else 0.0,
+                "reset_time_max": round(self._reset_max_time, 3),
+            }
+
+        backend_stats = self.backend.get_stats()
+
         with self._lock:
             return {
                 "total_worktrees": self._total_created,
                 "available": len(self._available),
+                "ready": len(self._ready),
+                "dirty": len(self._dirty),
+                "resetting": len(self._resetting),
+                "provisioning": len(self._provisioning),
                 "allocated": len(self._allocated),
+                "foreign_claims": len(self._foreign_claims),
+                "leases_reaped": self._leases_reaped,
+                "lease_ttl": self.lease_ttl,
+                "session_peak_demand": self._session_peak,
+                "demand_history": list(self._demand_history),
+                "shared_state": self.shared_state,
                 "max_size": self.max_size,
+                "prewarm": self.prewarm,
+                "reset_on_release": self.reset_on_release,
+                "commits": len(set(self._worktree_heads.values())),
+                "sparse_worktrees": len(self._worktree_sparse),
                 "capacity_used": f"{(self._total_created / self.max_size * 100):.1f}%",
                 "pool_dir": str(self.pool_dir),
-                "base_repo": str(self.base_repo)
+                "base_repo": str(self.base_repo),
+                "incremental_reset": self.incremental_reset,
+                "backend": backend_stats,
+                **reset_stats
             }
 
     def __repr__(self) -> str:
@@ -519,6 +1651,8 @@ class WorktreePool:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - persist state"""
+        """Context manager exit - stop background threads and persist state"""
+        self.stop_provisioner()
+        self.stop_reaper()
         self.persist_state()
         return False
@@ -9,6 +9,7 @@ Usage:
     from shared.git_utils import create_worktree, WorktreeContext
     from shared.subprocess_utils import run_command, CommandResult
     from shared.logging_utils import setup_logging, get_logger
+    from shared.duration_model import DurationModel
 
 Author: Extracted from parallel-orchestrator codebase
 Date: 2025-12-30
@@ -17,9 +18,19 @@ Date: 2025-12-30
 # Git utilities
 from .git_utils import (
     get_current_branch,
+    resolve_ref,
+    checkout_detached,
+    sparse_directories,
+    set_sparse_checkout,
+    get_sparse_directories,
     create_worktree,
     remove_worktree,
+    remove_worktrees,
+    prune_worktrees,
+    delete_tree_dirs,
     reset_worktree,
+    reset_dirty_paths,
+    get_dirty_paths,
     list_worktrees,
     count_worktrees,
     WorktreeContext,
@@ -48,12 +59,25 @@ from .logging_utils import (
     ColoredFormatter
 )
 
+# Learned durations
+from .duration_model import DurationModel
+
 __all__ = [
     # Git
     'get_current_branch',
+    'resolve_ref',
+    'checkout_detached',
+    'sparse_directories',
+    'set_sparse_checkout',
+    'get_sparse_directories',
     'create_worktree',
     'remove_worktree',
+    'remove_worktrees',
+    'prune_worktrees',
+    'delete_tree_dirs',
     'reset_worktree',
+    'reset_dirty_paths',
+    'get_dirty_paths',
     'list_worktrees',
     'count_worktrees',
     'WorktreeContext',
@@ -76,6 +100,9 @@ __all__ = [
     'configure_third_party_loggers',
     'Colors',
     'ColoredFormatter',
+
+    # Durations
+    'DurationModel',
 ]
 
 __version__ = '1.0.0'
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Learned Duration Model
+
+SQLite-backed history of test durations and parallelization overhead.
+Replaces hand-entered estimates (Hypothesis.estimated_test_time) and fixed
+overhead constants with the median of recent observations:
+
+    - Test time per test command (keyed by a hash of the command)
+    - Per-worktree overhead per phase (acquire, setup, release) and pool
+      state: "cold" when worktrees had to be created, "warm" when reused
+
+Predictions fall back to the caller's default (or the historical constants)
+until samples exist. The database uses WAL mode and short-lived connections,
+so several processes and threads can record concurrently.
+
+Usage:
+    model = DurationModel(worktree_dir / "durations.db")
+    model.record_test(DurationModel.command_key("pytest tests/test_x.py"), 12.3)
+    model.predict_test_time(key, default=hyp.estimated_test_time)
+    model.predict_worktree_overhead("warm")
+"""
+
+import hashlib
+import logging
+import sqlite3
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class DurationModel:
+    """Records observed durations and predicts them from recent history"""
+
+    DB_FILE = "durations.db"
+    HISTORY = 20  # Samples per key used for predictions
+    POOL_STATES = ("cold", "warm")
+
+    # Historical constants, used until a phase has been observed:
+    # 7s base + 16s per worktree (8s create + 5s setup + 3s cleanup)
+    BASE_OVERHEAD = 7.0
+    DEFAULT_PHASE_OVERHEAD = {"acquire": 8.0, "setup": 5.0, "release": 3.0}
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS test_durations (
+            command_key TEXT NOT NULL,
+            duration REAL NOT NULL,
+            outcome TEXT NOT NULL DEFAULT '',
+            recorded_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_test_durations_key
+            ON test_durations (command_key, recorded_at);
+        CREATE TABLE IF NOT EXISTS overhead (
+            phase TEXT NOT NULL,
+            pool_state TEXT NOT NULL,
+            seconds REAL NOT NULL,
+            recorded_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_overhead_phase
+            ON overhead (phase, pool_state, recorded_at);
+    """
+
+    def __init__(self, db_path: Union[str, Path], history: int = HISTORY):
+        """
+        Initialize duration model
+
+        Args:
+            db_path: SQLite database file (created if missing)
+            history: Number of most recent samples used per prediction
+        """
+        self.db_path = Path(db_path)
+        self.history = history
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self._SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection, committing on success"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def command_key(command: str) -> str:
+        """
+        Stable key for a test command
+
+        Args:
+            command: Test command line
+
+        Returns:
+            Hex digest identifying the command
+        """
+        return hashlib.sha256(command.strip().encode()).hexdigest()[:16]
+
+    def record_test(self, command_key: str, duration: float, outcome: str = "") -> None:
+        """
+        Record an observed test duration
+
+        Args:
+            command_key: Key from command_key()
+            duration: Wall-clock seconds the test ran
+            outcome: Optional result label (e.g. "pass", "fail")
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO test_durations (command_key, duration, outcome, recorded_at) "
+                "VALUES (?, ?, ?, ?)",
+                (command_key, duration, outcome, time.time())
+            )
+
+    def record_overhead(self, phase: str, pool_state: str, seconds: float) -> None:
+        """
+        Record observed per-worktree overhead
+
+        Args:
+            phase: "acquire", "setup" or "release"
+            pool_state: "cold" or "warm"
+            seconds: Seconds per worktree spent in the phase
+
+        Raises:
+            ValueError: If pool_state is unknown
+        """
+        if pool_state not in self.POOL_STATES:
+            raise ValueError(f"Unknown pool_state {pool_state!r}, expected one of {self.POOL_STATES}")
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO overhead (phase, pool_state, seconds, recorded_at) VALUES (?, ?, ?, ?)",
+                (phase, pool_state, seconds, time.time())
+            )
+
+    def _recent_median(self, query: str, params: tuple) -> Optional[float]:
+        """Median of the most recent samples returned by a query"""
+        with self._connect() as conn:
+            rows = conn.execute(query, params + (self.history,)).fetchall()
+        if not rows:
+            return None
+        return statistics.median(row[0] for row in rows)
+
+    def predict_test_time(self, command_key: str, default: float = 0.0) -> float:
+        """
+        Predict how long a test command takes
+
+        Args:
+            command_key: Key from command_key()
+            default: Value returned when the command was never observed
+
+        Returns:
+            Median of recent durations, or default
+        """
+        learned = self._recent_median(
+            "SELECT duration FROM test_durations WHERE command_key = ? "
+            "ORDER BY recorded_at DESC LIMIT ?",
+            (command_key,)
+        )
+        return default if learned is None else learned
+
+    def predict_phase_overhead(self, phase: str, pool_state: str,
+                               default: Optional[float] = None) -> float:
+        """
+        Predict per-worktree overhead of one phase
+
+        Args:
+            phase: "acquire", "setup" or "release"
+            pool_state: "cold" or "warm"
+            default: Fallback (default: DEFAULT_PHASE_OVERHEAD[phase])
+
+        Returns:
+            Median of recent samples, or the fallback
+        """
+        learned = self._recent_median(
+            "SELECT seconds FROM overhead WHERE phase = ? AND pool_state = ? "
+            "ORDER BY recorded_at DESC LIMIT ?",
+            (phase, pool_state)
+        )
+        if learned is not None:
+            return learned
+        return default if default is not None else self.DEFAULT_PHASE_OVERHEAD.get(phase, 0.0)
+
+    def predict_worktree_overhead(self, pool_state: str = "cold") -> float:
+        """
+        Predict total overhead per worktree (acquire + setup + release)
+
+        Args:
+            pool_state: "cold" or "warm"
+
+        Returns:
+            Seconds of overhead per worktree
+        """
+        return sum(
+            self.predict_phase_overhead(phase, pool_state)
+            for phase in self.DEFAULT_PHASE_OVERHEAD
+        )
+
+    def get_stats(self) -> Dict:
+        """
+        Get model statistics
+
+        Returns:
+            Dictionary with sample counts and predicted overheads
+        """
+        with self._connect() as conn:
+            commands, test_samples = conn.execute(
+                "SELECT COUNT(DISTINCT command_key), COUNT(*) FROM test_durations"
+            ).fetchone()
+            overhead_samples = conn.execute("SELECT COUNT(*) FROM overhead").fetchone()[0]
+
+        return {
+            "db_path": str(self.db_path),
+            "commands": commands,
+            "test_samples": test_samples,
+            "overhead_samples": overhead_samples,
+            "worktree_overhead": {
+                state: round(self.predict_worktree_overhead(state), 3)
+                for state in self.POOL_STATES
+            },
+        }
+
+    def __repr__(self) -> str:
+        """String representation"""
+        stats = self.get_stats()
+        return (
+            f"DurationModel(commands={stats['commands']}, "
+            f"test_samples={stats['test_samples']}, overhead_samples={stats['overhead_samples']})"
+        )
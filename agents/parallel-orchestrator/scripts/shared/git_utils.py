@@ -6,14 +6,23 @@ Shared utilities for git worktree management and operations.
 Extracted from worktree_orchestrator.py and task-splitter.py.
 """
 
+import os
+import shutil
 import subprocess
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Iterable, Optional, List, Dict, Tuple
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# `git worktree add` reads every entry under .git/worktrees and fails on one
+# that a concurrent add is still writing; registration is serialized per
+# process, the (slow) checkout is not.
+_worktree_add_lock = threading.Lock()
+
 
 class GitOperationError(Exception):
     """Raised when git operation fails"""
@@ -49,14 +58,180 @@ def get_current_branch(repo_path: Path) -> str:
         raise GitOperationError(f"Failed to get current branch: {e.stderr}") from e
 
 
-def create_worktree(repo_path: Path, worktree_path: Path, branch: Optional[str] = None) -> Path:
+def resolve_ref(repo_path: Path, ref: str = "HEAD") -> str:
+    """
+    Resolve a ref (branch, tag, SHA, HEAD) to a full commit SHA.
+
+    Args:
+        repo_path: Path to git repository or worktree
+        ref: Ref to resolve (default: HEAD)
+
+    Returns:
+        Full commit SHA
+
+    Raises:
+        GitOperationError: If ref cannot be resolved to a commit
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Failed to resolve ref {ref}: {e.stderr}")
+        raise GitOperationError(f"Failed to resolve ref {ref}: {e.stderr}") from e
+
+
+def checkout_detached(worktree_path: Path, commit: str) -> None:
+    """
+    Move a worktree to a commit in detached HEAD mode.
+
+    Only files that differ between the current HEAD and the target commit
+    are rewritten, which makes this much cheaper than recreating the tree.
+
+    Args:
+        worktree_path: Path to worktree
+        commit: Commit SHA (or ref) to check out
+
+    Raises:
+        GitOperationError: If checkout fails
+    """
+    try:
+        subprocess.run(
+            ["git", "checkout", "--quiet", "--detach", commit],
+            cwd=worktree_path,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        logger.debug(f"Checked out {commit[:12]} in {worktree_path}")
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Failed to checkout {commit} in {worktree_path}: {e.stderr}")
+        raise GitOperationError(f"Failed to checkout {commit}: {e.stderr}") from e
+
+
+def sparse_directories(paths: Iterable[str]) -> List[str]:
+    """
+    Derive cone-mode sparse-checkout directories from a set of repo paths.
+
+    Files map to their parent directory; directories nested inside another
+    selected directory are dropped. Top-level files are always checked out
+    in cone mode, so they need no entry.
+
+    Args:
+        paths: Repo-relative file or directory paths (directories end in '/')
+
+    Returns:
+        Sorted, de-duplicated list of directories
+    """
+    dirs = set()
+    for path in paths:
+        path = path.strip()
+        # Paths without a trailing slash are treated as files
+        is_dir = path.endswith("/")
+        path = path.strip("/")
+        if not path or path == ".":
+            continue
+        directory = path if is_dir else str(Path(path).parent)
+        if directory not in ("", "."):
+            dirs.add(directory)
+
+    selected: List[str] = []
+    for directory in sorted(dirs):
+        if not any(directory.startswith(parent + "/") for parent in selected):
+            selected.append(directory)
+    return selected
+
+
+def set_sparse_checkout(worktree_path: Path, directories: Optional[List[str]]) -> None:
+    """
+    Restrict a worktree to a cone-mode sparse checkout, or restore a full one.
+
+    Sparse settings are per-worktree (git enables extensions.worktreeConfig),
+    so the main repository and other worktrees are unaffected.
+
+    Args:
+        worktree_path: Path to worktree
+        directories: Directories to materialize; None disables sparse checkout
+
+    Raises:
+        GitOperationError: If git cannot apply the sparse checkout
+    """
+    if directories is None:
+        cmd = ["git", "sparse-checkout", "disable"]
+        stdin = None
+    else:
+        cmd = ["git", "sparse-checkout", "set", "--cone", "--stdin"]
+        stdin = "".join(f"{d}\n" for d in directories)
+
+    try:
+        subprocess.run(
+            cmd,
+            cwd=worktree_path,
+            input=stdin,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        logger.debug(f"Sparse checkout in {worktree_path}: {directories if directories is not None else 'full'}")
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Failed to set sparse checkout in {worktree_path}: {e.stderr}")
+        raise GitOperationError(f"Failed to set sparse checkout: {e.stderr}") from e
+
+
+def get_sparse_directories(worktree_path: Path) -> Optional[List[str]]:
+    """
+    Get the cone-mode sparse-checkout directories of a worktree.
+
+    Args:
+        worktree_path: Path to worktree
+
+    Returns:
+        List of directories, or None if the worktree is a full checkout
+    """
+    result = subprocess.run(
+        ["git", "config", "--bool", "core.sparseCheckout"],
+        cwd=worktree_path,
+        capture_output=True,
+        text=True
+    )
+    if result.stdout.strip() != "true":
+        return None
+
+    result = subprocess.run(
+        ["git", "sparse-checkout", "list"],
+        cwd=worktree_path,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def create_worktree(
+    repo_path: Path,
+    worktree_path: Path,
+    branch: Optional[str] = None,
+    sparse_paths: Optional[List[str]] = None
+) -> Path:
     """
     Create a git worktree.
 
+    Worktrees share the main repository's object store; with sparse_paths
+    only the directories holding those paths (plus top-level files) are
+    written to disk. If git cannot set up the sparse checkout, a full
+    checkout is made instead.
+
     Args:
         repo_path: Path to main repository
         worktree_path: Path where worktree should be created
         branch: Optional branch to checkout (default: current branch in detached mode)
+        sparse_paths: Optional repo-relative paths the worktree needs
 
     Returns:
         Path to created worktree
@@ -75,24 +250,36 @@ def create_worktree(repo_path: Path, worktree_path: Path, branch: Optional[str]
     try:
         if branch:
             # Create worktree with specific branch
-            subprocess.run(
-                ["git", "worktree", "add", str(worktree_path), branch],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            add_args = [str(worktree_path), branch]
         else:
             # Create worktree in detached mode from current branch
             current_branch = get_current_branch(repo_path)
+            add_args = [str(worktree_path), "-d", current_branch]
+
+        with _worktree_add_lock:
             subprocess.run(
-                ["git", "worktree", "add", str(worktree_path), "-d", current_branch],
+                ["git", "worktree", "add", "--no-checkout", *add_args],
                 cwd=repo_path,
                 capture_output=True,
                 text=True,
                 check=True
             )
 
+        if sparse_paths is not None:
+            try:
+                set_sparse_checkout(worktree_path, sparse_directories(sparse_paths))
+            except GitOperationError:
+                logger.warning(f"Sparse checkout unavailable for {worktree_path}, using full checkout")
+
+        # Populate index and working tree outside the lock
+        subprocess.run(
+            ["git", "reset", "--hard", "-q"],
+            cwd=worktree_path,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+
         logger.info(f"Created worktree: {worktree_path}")
         return worktree_path
 
@@ -136,7 +323,205 @@ def remove_worktree(repo_path: Path, worktree_path: Path, force: bool = False) -
         logger.warning(f"Failed to remove worktree {worktree_path}: {e.stderr}")
 
 
-def reset_worktree(worktree_path: Path) -> None:
+def prune_worktrees(repo_path: Path) -> None:
+    """
+    Drop the administrative entries (.git/worktrees/<name>) of every
+    worktree whose directory no longer exists.
+
+    Args:
+        repo_path: Path to main repository
+
+    Raises:
+        GitOperationError: If pruning fails (non-fatal, logs warning)
+    """
+    try:
+        # Serialized with `git worktree add`, which must not see an entry
+        # disappear while it scans .git/worktrees
+        with _worktree_add_lock:
+            subprocess.run(
+                ["git", "worktree", "prune"],
+                cwd=repo_path,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+        logger.debug(f"Pruned worktree metadata in {repo_path}")
+
+    except subprocess.CalledProcessError as e:
+        # Non-fatal - stale entries are pruned by the next cleanup or git gc
+        logger.warning(f"Failed to prune worktrees in {repo_path}: {e.stderr}")
+
+
+def delete_tree_dirs(paths: Iterable[Path], max_workers: int = 8) -> int:
+    """
+    Delete directory trees concurrently (missing paths are skipped).
+
+    Args:
+        paths: Directories to delete
+        max_workers: Maximum directories deleted concurrently
+
+    Returns:
+        Number of directories that failed to delete (each logs a warning)
+    """
+    existing = [Path(p) for p in paths if os.path.lexists(p)]
+    if not existing:
+        return 0
+
+    def delete(path: Path) -> bool:
+        try:
+            shutil.rmtree(path)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to delete {path}: {e}")
+            return False
+
+    workers = max(1, min(max_workers, len(existing)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tree-delete") as executor:
+        return sum(not ok for ok in executor.map(delete, existing))
+
+
+def remove_worktrees(
+    repo_path: Path,
+    worktree_paths: Iterable[Path],
+    max_workers: int = 8
+) -> List[Path]:
+    """
+    Remove many git worktrees at once.
+
+    Directories are deleted concurrently, then a single `git worktree prune`
+    drops all their metadata, instead of one `git worktree remove --force`
+    subprocess per worktree. Missing directories are skipped (and their
+    stale metadata pruned), so repeating a cleanup is harmless.
+
+    Args:
+        repo_path: Path to main repository
+        worktree_paths: Worktrees to remove (local changes are discarded)
+        max_workers: Maximum directories deleted concurrently
+
+    Returns:
+        Paths that no longer exist
+    """
+    paths = [Path(p) for p in worktree_paths]
+    delete_tree_dirs(paths, max_workers=max_workers)
+    prune_worktrees(repo_path)
+
+    removed = [p for p in paths if not p.exists()]
+    logger.info(f"Removed {len(removed)}/{len(paths)} worktrees")
+    return removed
+
+
+def get_dirty_paths(worktree_path: Path) -> Tuple[List[str], List[str]]:
+    """
+    List paths that differ from HEAD in a worktree.
+
+    Parses `git status --porcelain -z`, so paths with spaces or newlines
+    are handled exactly. Renames report both the old and the new path.
+
+    Args:
+        worktree_path: Path to worktree
+
+    Returns:
+        Tuple of (changed tracked paths, untracked paths), relative to worktree
+
+    Raises:
+        GitOperationError: If git status fails
+    """
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "-z"],
+            cwd=worktree_path,
+            capture_output=True,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode("utf-8", errors="replace")
+        logger.error(f"Failed to get worktree status: {stderr}")
+        raise GitOperationError(f"Failed to get worktree status: {stderr}") from e
+
+    tracked: List[str] = []
+    untracked: List[str] = []
+
+    entries = result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        i += 1
+        if len(entry) < 4:
+            continue
+
+        status, path = entry[:2], entry[3:]
+        if status == "??":
+            untracked.append(path)
+            continue
+
+        tracked.append(path)
+        # Renames and copies are followed by the original path
+        if status[0] in "RC":
+            tracked.append(entries[i])
+            i += 1
+
+    return tracked, untracked
+
+
+def reset_dirty_paths(worktree_path: Path, keep: Iterable[str] = ()) -> int:
+    """
+    Reset only the paths that differ from HEAD (incremental reset).
+
+    Runs `git status` once; a clean worktree costs nothing more. Modified,
+    staged and deleted files are restored from HEAD and untracked files or
+    directories are removed, matching `reset_worktree` without rewriting
+    the whole tree.
+
+    Args:
+        worktree_path: Path to worktree to reset
+        keep: Top-level untracked names to leave in place (e.g. harness
+            artifacts shared by several test runs)
+
+    Returns:
+        Number of paths that were restored or removed
+
+    Raises:
+        GitOperationError: If reset fails
+    """
+    tracked, untracked = get_dirty_paths(worktree_path)
+    keep = set(keep)
+    untracked = [p for p in untracked if p.rstrip("/").split("/", 1)[0] not in keep]
+
+    if tracked:
+        try:
+            subprocess.run(
+                ["git", "--literal-pathspecs", "restore", "--source=HEAD",
+                 "--staged", "--worktree", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                cwd=worktree_path,
+                input="\0".join(tracked).encode("utf-8", errors="surrogateescape"),
+                capture_output=True,
+                check=True
+            )
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode("utf-8", errors="replace")
+            logger.error(f"Failed to restore dirty paths: {stderr}")
+            raise GitOperationError(f"Failed to restore dirty paths: {stderr}") from e
+
+    # Untracked entries are removed directly (equivalent to git clean -fd)
+    for rel_path in untracked:
+        target = worktree_path / rel_path
+        try:
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+            else:
+                target.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Failed to remove untracked path {target}: {e}")
+            raise GitOperationError(f"Failed to remove untracked path {target}: {e}") from e
+
+    dirty = len(tracked) + len(untracked)
+    logger.debug(f"Incremental reset of {worktree_path}: {dirty} path(s)")
+    return dirty
+
+
+def reset_worktree(worktree_path: Path, incremental: bool = False) -> Optional[int]:
     """
     Reset worktree to clean state (discard all changes).
 
@@ -144,10 +529,19 @@ def reset_worktree(worktree_path: Path) -> None:
 
     Args:
         worktree_path: Path to worktree to reset
+        incremental: Only touch dirty paths (see `reset_dirty_paths`)
+
+    Returns:
+        Number of dirty paths reset in incremental mode, None for a full reset
 
     Raises:
         GitOperationError: If reset fails
     """
+    if incremental:
+        dirty = reset_dirty_paths(worktree_path)
+        logger.info(f"Reset worktree: {worktree_path} ({dirty} dirty path(s))")
+        return dirty
+
     try:
         # Discard all changes
         subprocess.run(
@@ -168,6 +562,7 @@ def reset_worktree(worktree_path: Path) -> None:
         )
 
         logger.info(f"Reset worktree: {worktree_path}")
+        return None
 
     except subprocess.CalledProcessError as e:
         logger.error(f"Failed to reset worktree: {e.stderr}")
@@ -19,8 +19,13 @@ import argparse
 import subprocess
 import time
 from pathlib import Path
+from functools import lru_cache
 from typing import Optional, Dict, List, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
+
+# Learned worktree overhead shared with parallel_test
+sys.path.insert(0, str(Path(__file__).parent))
+from shared.duration_model import DurationModel
 
 try:
     import anthropic
@@ -61,9 +66,34 @@ class ParallelConfig:
     complexity_per_loc_estimate: float = 0.001  # Per line of code
     complexity_per_dependency: float = 0.05   # Per cross-file dependency
 
+    # Learned timings (DurationModel database written by parallel_test runs)
+    duration_db: Optional[str] = None         # Overrides worktree_creation_time when set
+    pool_dir: Optional[str] = None            # Worktree pool whose idle trees are acquired warm
+
 
 DEFAULT_CONFIG = ParallelConfig()
 
+# State file parallel_test.worktree_pool.WorktreePool keeps in its pool directory
+POOL_STATE_FILE = ".worktree_pool.json"
+
+
+def default_worktree_dir() -> Optional[Path]:
+    """
+    Worktree directory parallel_test uses for the current repository.
+
+    parallel_test keeps worktrees, its pool and the DurationModel database
+    next to the repository root, so this resolves the same directory from
+    anywhere inside the repository. None outside a git repository.
+    """
+    result = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+    return Path(result.stdout.strip()).parent / "worktrees"
+
 
 # ============================================================================
 # AGENT AND SKILL MATCHING
@@ -325,23 +355,62 @@ class OverheadAnalysis:
     reasoning: str
 
 
+@lru_cache(maxsize=None)
+def _load_duration_model(db_path: str) -> Optional[DurationModel]:
+    """Open a DurationModel database, or None if it does not exist."""
+    if not Path(db_path).exists():
+        return None
+    return DurationModel(db_path)
+
+
+@lru_cache(maxsize=None)
+def idle_pool_worktrees(pool_dir: str) -> int:
+    """Number of free worktrees in a parallel_test pool (0 if there is none)."""
+    try:
+        with open(Path(pool_dir) / POOL_STATE_FILE) as f:
+            return len(json.load(f).get("available_worktrees", []))
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def worktree_creation_time(config: ParallelConfig = DEFAULT_CONFIG, pool_state: str = "cold") -> float:
+    """
+    Seconds to get a worktree ready for a session.
+
+    Uses the median observed "acquire" time for the pool state ("cold": a
+    fresh worktree, "warm": an idle pooled one) from config.duration_db when
+    available. Falls back to the static config.worktree_creation_time, and a
+    warm estimate without warm samples to the cold one.
+    """
+    model = _load_duration_model(config.duration_db) if config.duration_db else None
+    if model is None:
+        return config.worktree_creation_time
+    cold = model.predict_phase_overhead("acquire", "cold", default=config.worktree_creation_time)
+    if pool_state == "cold":
+        return cold
+    return model.predict_phase_overhead("acquire", pool_state, default=cold)
+
+
 def calculate_overhead(num_splits: int, config: ParallelConfig = DEFAULT_CONFIG) -> float:
     """Calculate total overhead in seconds for a given number of splits."""
     if num_splits <= 1:
         return 0.0
 
-    # Fixed overhead per session
-    per_session = (
-        config.worktree_creation_time +
-        config.session_startup_time +
-        config.context_building_time
+    # Idle pooled worktrees are acquired warm, the rest are created cold
+    warm = min(idle_pool_worktrees(config.pool_dir), num_splits) if config.pool_dir else 0
+    worktree_overhead = (
+        warm * worktree_creation_time(config, "warm") +
+        (num_splits - warm) * worktree_creation_time(config, "cold")
     )
 
+    # Fixed overhead per session
+    per_session = config.session_startup_time + config.context_building_time
+
     # Merge overhead (sequential, not parallel)
     merge_overhead = num_splits * config.merge_time_per_branch
 
     # Total overhead
-    total = (per_session * num_splits) + merge_overhead
+    total = worktree_overhead + (per_session * num_splits) + merge_overhead
 
     return total
 
@@ -998,9 +1067,19 @@ def main():
         action="store_true",
         help="Show detailed overhead analysis"
     )
+    parser.add_argument(
+        "--duration-db",
+        default=None,
+        help="Learned timings database (default: worktrees/durations.db next to the repo root, if present)"
+    )
 
     args = parser.parse_args()
-    config = DEFAULT_CONFIG
+    worktree_dir = default_worktree_dir()
+    duration_db = args.duration_db
+    if duration_db is None and worktree_dir and (worktree_dir / DurationModel.DB_FILE).exists():
+        duration_db = str(worktree_dir / DurationModel.DB_FILE)
+    pool_dir = str(worktree_dir / "pool") if worktree_dir and (worktree_dir / "pool").is_dir() else None
+    config = replace(DEFAULT_CONFIG, duration_db=duration_db, pool_dir=pool_dir)
 
     # Repository analysis mode
     if args.analyze_repo:
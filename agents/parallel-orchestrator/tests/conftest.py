@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures
+
+Tests that exercise real git commands build on a throwaway repository.
+"""
+
+import subprocess
+import pytest
+from pathlib import Path
+
+
+@pytest.fixture
+def make_git_repo():
+    """Factory creating a git repository with a single commit of module.py"""
+    def create(repo: Path) -> Path:
+        repo.mkdir(parents=True)
+
+        def git(*args):
+            subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+        git("init", "-q")
+        git("config", "user.email", "test@example.com")
+        git("config", "user.name", "Test")
+        (repo / "module.py").write_text("VALUE = 1\n")
+        git("add", "module.py")
+        git("commit", "-q", "-m", "initial")
+        return repo
+
+    return create
+
+
+@pytest.fixture
+def git_repo(tmp_path, make_git_repo):
+    """Create a git repository with a single commit"""
+    return make_git_repo(tmp_path / "repo")
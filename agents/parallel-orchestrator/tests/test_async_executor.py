@@ -6,12 +6,16 @@ Verifies AsyncIO implementation maintains same behavior as ThreadPoolExecutor ve
 """
 
 import asyncio
+import time
 import pytest
 import tempfile
 import shutil
 from pathlib import Path
-from scripts.parallel_test.async_test_executor import AsyncTestExecutor
+from typing import List
+from scripts.parallel_test.async_test_executor import AsyncTestExecutor, BackgroundLoop
 from scripts.parallel_test.config import Hypothesis, TestResult, FalsificationConfig
+from scripts.parallel_test.utils import pack_hypotheses
+from scripts.shared.duration_model import DurationModel
 
 
 @pytest.fixture
@@ -58,6 +62,24 @@ exit {exit_code}
     return script_path
 
 
+def add_clean_tree_scripts(worktree: Path, hypothesis_ids: List[str]) -> Path:
+    """Helper to add test scripts that each need a clean tree to a git repository"""
+    (worktree / ".falsification").mkdir()
+
+    for hyp_id in hypothesis_ids:
+        # Fails unless it starts on a clean tree and has it to itself
+        create_test_script(worktree, hyp_id)
+        script = worktree / ".falsification" / f"test_{hyp_id}.sh"
+        script.write_text(
+            "#!/bin/bash\n"
+            "grep -qx 'VALUE = 1' module.py && [ ! -e scratch ] || exit 1\n"
+            "echo 'VALUE = 2' > module.py\n"
+            "touch scratch\n"
+            "sleep 0.2\n"
+        )
+    return worktree
+
+
 class TestAsyncTestExecutor:
     """Test AsyncTestExecutor functionality"""
 
@@ -78,6 +100,61 @@ class TestAsyncTestExecutor:
         assert result.exit_code == 0
         assert result.duration > 0
 
+    def test_output_streamed_to_log(self, temp_worktree):
+        """Test large output keeps a bounded head/tail and the full log on disk"""
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=10, output_buffer_bytes=1024))
+        hyp = Hypothesis(id="test_log", description="Test hypothesis", estimated_test_time=1.0)
+
+        script_path = temp_worktree / ".falsification" / f"test_{hyp.id}.sh"
+        script_path.write_text("#!/bin/bash\necho FIRST\nseq 1 100000\necho LAST\necho oops >&2\n")
+        script_path.chmod(0o755)
+
+        result = executor.execute_single(hyp, temp_worktree)
+
+        assert result.result == TestResult.PASS
+        assert len(result.stdout) < 2048
+        assert result.stdout.startswith("FIRST")
+        assert result.stdout.rstrip().endswith("LAST")
+        assert "bytes omitted" in result.stdout
+        assert result.stderr == "oops\n"
+
+        full_log = Path(result.stdout_log).read_text()
+        assert full_log.splitlines()[-1] == "LAST"
+        assert len(full_log) == result.metrics["stdout_bytes"]
+        assert Path(result.stderr_log).read_text() == "oops\n"
+
+    def test_resource_usage_metrics(self, executor, temp_worktree):
+        """Test CPU, RSS and I/O of the whole test process tree are recorded"""
+        hyp = Hypothesis(id="test_cpu", description="Test hypothesis", estimated_test_time=1.0)
+
+        script_path = temp_worktree / ".falsification" / f"test_{hyp.id}.sh"
+        script_path.write_text(
+            "#!/bin/bash\n"
+            "bash -c 'i=0; while [ $i -lt 100000 ]; do i=$((i+1)); done'\n"
+            "exit 1\n"
+        )
+        script_path.chmod(0o755)
+
+        result = executor.execute_single(hyp, temp_worktree)
+
+        assert result.result == TestResult.FAIL
+        assert result.exit_code == 1
+        assert result.metrics["cpu_user"] + result.metrics["cpu_system"] > 0.05
+        assert result.metrics["max_rss_mb"] > 0
+        assert "io_read_blocks" in result.metrics
+        assert "io_write_blocks" in result.metrics
+
+    def test_resource_usage_disabled(self, temp_worktree):
+        """Test tests run directly when resource collection is off"""
+        executor = AsyncTestExecutor(FalsificationConfig(collect_resource_usage=False))
+        hyp = Hypothesis(id="test_plain", description="Test hypothesis", estimated_test_time=1.0)
+        create_test_script(temp_worktree, hyp.id, exit_code=0)
+
+        result = executor.execute_single(hyp, temp_worktree)
+
+        assert result.result == TestResult.PASS
+        assert "cpu_user" not in result.metrics
+
     def test_execute_single_fail(self, executor, temp_worktree):
         """Test single test execution that fails"""
         hyp = Hypothesis(
@@ -113,6 +190,58 @@ class TestAsyncTestExecutor:
         assert result.result == TestResult.TIMEOUT
         assert result.exit_code == 124
 
+    def test_timeout_kills_process_group(self, temp_worktree):
+        """Test timeout escalates to SIGKILL and reaps background children"""
+        config = FalsificationConfig(test_timeout=1, kill_grace_period=0.5)
+        executor = AsyncTestExecutor(config)
+        hyp = Hypothesis(id="test_orphan", description="Test hypothesis", estimated_test_time=1.0)
+
+        pid_file = temp_worktree / "child.pid"
+        script_path = temp_worktree / ".falsification" / f"test_{hyp.id}.sh"
+        script_path.write_text(
+            "#!/bin/bash\n"
+            "trap '' TERM\n"
+            f"sleep 60 &\necho $! > {pid_file}\n"
+            "sleep 60\n"
+        )
+        script_path.chmod(0o755)
+
+        start = time.time()
+        result = executor.execute_single(hyp, temp_worktree)
+
+        assert result.result == TestResult.TIMEOUT
+        assert time.time() - start < 5
+        # Killed orphans may linger briefly as zombies until init reaps them
+        stat = Path(f"/proc/{int(pid_file.read_text())}/stat")
+        assert not stat.exists() or stat.read_text().split(")")[-1].split()[0] == "Z"
+
+    def test_sync_api_reuses_background_loop(self, executor, temp_worktree):
+        """Test repeated sync calls share one persistent event loop"""
+        hyp = Hypothesis(id="test_loop", description="Test hypothesis", estimated_test_time=1.0)
+        create_test_script(temp_worktree, hyp.id, exit_code=0)
+
+        executor.execute_single(hyp, temp_worktree)
+        loop = BackgroundLoop.get().loop
+        executor.execute_single(hyp, temp_worktree)
+
+        assert BackgroundLoop.get().loop is loop
+        assert loop.is_running()
+
+    def test_sync_api_inside_running_loop(self, executor, temp_worktree):
+        """Test sync wrappers work when called from an async host"""
+        hyp = Hypothesis(id="test_host", description="Test hypothesis", estimated_test_time=1.0)
+        create_test_script(temp_worktree, hyp.id, exit_code=1)
+
+        async def host():
+            single = executor.execute_single(hyp, temp_worktree)
+            parallel = executor.execute_parallel([hyp], {hyp.id: temp_worktree})
+            return single, parallel
+
+        single, parallel = asyncio.run(host())
+
+        assert single.result == TestResult.FAIL
+        assert parallel[0].result == TestResult.FAIL
+
     def test_execute_single_missing_script(self, executor, temp_worktree):
         """Test single test execution with missing script"""
         hyp = Hypothesis(
@@ -173,6 +302,210 @@ class TestAsyncTestExecutor:
             for temp_dir in temp_dirs:
                 shutil.rmtree(temp_dir)
 
+    def test_execute_parallel_bounded_concurrency(self, tmp_path):
+        """Test max_concurrent_tests limits running tests and reports queue wait"""
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=10, max_concurrent_tests=2))
+        log = tmp_path / "running.log"
+        hypotheses = []
+        worktrees = {}
+
+        for i in range(4):
+            worktree = tmp_path / f"wt_{i}"
+            (worktree / ".falsification").mkdir(parents=True)
+            hyp = Hypothesis(id=f"test_{i:03d}", description="Test hypothesis", estimated_test_time=1.0)
+            script = worktree / ".falsification" / f"test_{hyp.id}.sh"
+            # Record concurrently running tests (one line per running test)
+            script.write_text(
+                f"#!/bin/bash\necho start >> {log}\nsleep 0.3\necho end >> {log}\n"
+            )
+            script.chmod(0o755)
+            hypotheses.append(hyp)
+            worktrees[hyp.id] = worktree
+
+        results = executor.execute_parallel(hypotheses, worktrees)
+
+        running = peak = 0
+        for line in log.read_text().split():
+            running += 1 if line == "start" else -1
+            peak = max(peak, running)
+        assert peak == 2
+
+        waits = sorted(r.metrics["queue_wait"] for r in results)
+        assert waits[1] < 0.1
+        assert waits[2] >= 0.25
+
+    def test_execute_parallel_priority_order(self, tmp_path):
+        """Test highest score starts first, shortest job first among ties"""
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=10, max_concurrent_tests=1))
+        hypotheses = [
+            Hypothesis(id="low", description="d", estimated_test_time=1.0, confidence_score=0.1),
+            Hypothesis(id="high_slow", description="d", estimated_test_time=9.0, confidence_score=0.8),
+            Hypothesis(id="high_fast", description="d", estimated_test_time=2.0, confidence_score=0.8),
+        ]
+        worktrees = {}
+        for hyp in hypotheses:
+            worktree = tmp_path / hyp.id
+            (worktree / ".falsification").mkdir(parents=True)
+            create_test_script(worktree, hyp.id)
+            worktrees[hyp.id] = worktree
+
+        results = executor.execute_parallel(hypotheses, worktrees)
+
+        order = [r.hypothesis_id for r in sorted(results, key=lambda r: r.metrics["dispatch_rank"])]
+        assert order == ["high_fast", "high_slow", "low"]
+
+    def test_early_stop_on_isolated_root_cause(self, tmp_path):
+        """Test the rank cutoff cancels lower-ranked tests once the top one is supported"""
+        executor = AsyncTestExecutor(
+            FalsificationConfig(test_timeout=30, max_concurrent_tests=2, early_stop_rank_cutoff=True)
+        )
+        hypotheses = [
+            Hypothesis(id="cause", description="d", estimated_test_time=1.0, confidence_score=0.9),
+            Hypothesis(id="slow_a", description="d", estimated_test_time=1.0, confidence_score=0.5),
+            Hypothesis(id="slow_b", description="d", estimated_test_time=1.0, confidence_score=0.4),
+        ]
+        worktrees = {}
+        for hyp in hypotheses:
+            worktree = tmp_path / hyp.id
+            (worktree / ".falsification").mkdir(parents=True)
+            if hyp.id == "cause":
+                create_test_script(worktree, hyp.id, exit_code=1, sleep_time=0.2)
+            else:
+                create_test_script(worktree, hyp.id, sleep_time=20)
+            worktrees[hyp.id] = worktree
+
+        start = time.time()
+        results = executor.execute_parallel(hypotheses, worktrees)
+
+        assert time.time() - start < 10
+        assert [r.hypothesis_id for r in results] == ["cause"]
+        assert sorted(executor.cancelled_ids) == ["slow_a", "slow_b"]
+        assert "cause" in executor.early_stop_reason
+        assert executor.provisional
+
+    def test_early_stop_waits_for_lower_ranked_support(self, tmp_path):
+        """Test early_stop keeps tests that could still be supported"""
+        executor = AsyncTestExecutor(
+            FalsificationConfig(test_timeout=30, max_concurrent_tests=2, early_stop=True)
+        )
+        hypotheses = [
+            Hypothesis(id="cause", description="d", estimated_test_time=1.0, confidence_score=0.9),
+            Hypothesis(id="also", description="d", estimated_test_time=1.0, confidence_score=0.5),
+        ]
+        worktrees = {}
+        for hyp, sleep_time in zip(hypotheses, (0.1, 0.5)):
+            worktree = tmp_path / hyp.id
+            (worktree / ".falsification").mkdir(parents=True)
+            create_test_script(worktree, hyp.id, exit_code=1, sleep_time=sleep_time)
+            worktrees[hyp.id] = worktree
+
+        results = executor.execute_parallel(hypotheses, worktrees)
+
+        # The lower-ranked hypothesis is supported too: "refine", not "fix"
+        assert [r.hypothesis_id for r in results] == ["cause", "also"]
+        assert executor.early_stop_reason is None
+        assert not executor.provisional
+
+    def test_early_stop_once_outcome_settled(self, tmp_path):
+        """Test early_stop cancels the rest once two hypotheses are supported"""
+        executor = AsyncTestExecutor(
+            FalsificationConfig(test_timeout=30, max_concurrent_tests=3, early_stop=True)
+        )
+        hypotheses = [
+            Hypothesis(id=hyp_id, description="d", estimated_test_time=1.0, confidence_score=score)
+            for hyp_id, score in [("a", 0.9), ("b", 0.8), ("slow", 0.7)]
+        ]
+        worktrees = {}
+        for hyp in hypotheses:
+            worktree = tmp_path / hyp.id
+            (worktree / ".falsification").mkdir(parents=True)
+            if hyp.id == "slow":
+                create_test_script(worktree, hyp.id, sleep_time=20)
+            else:
+                create_test_script(worktree, hyp.id, exit_code=1, sleep_time=0.1)
+            worktrees[hyp.id] = worktree
+
+        start = time.time()
+        results = executor.execute_parallel(hypotheses, worktrees)
+
+        assert time.time() - start < 10
+        assert sorted(r.hypothesis_id for r in results) == ["a", "b"]
+        assert executor.cancelled_ids == ["slow"]
+        assert not executor.provisional
+
+    def test_early_stop_after_k_results(self, tmp_path):
+        """Test run stops after the first K decisive results"""
+        executor = AsyncTestExecutor(
+            FalsificationConfig(test_timeout=30, max_concurrent_tests=1, early_stop_after=1)
+        )
+        hypotheses = [
+            Hypothesis(id=f"test_{i}", description="d", estimated_test_time=1.0 + i)
+            for i in range(3)
+        ]
+        worktrees = {}
+        for hyp in hypotheses:
+            worktree = tmp_path / hyp.id
+            (worktree / ".falsification").mkdir(parents=True)
+            create_test_script(worktree, hyp.id)
+            worktrees[hyp.id] = worktree
+
+        results = executor.execute_parallel(hypotheses, worktrees)
+
+        assert [r.hypothesis_id for r in results] == ["test_0"]
+        assert executor.cancelled_ids == ["test_1", "test_2"]
+
+    def test_stream_yields_as_completed(self, tmp_path):
+        """Test stream() yields fast results before slow tests finish"""
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=30, max_concurrent_tests=2))
+        hypotheses = [
+            Hypothesis(id="slow", description="d", estimated_test_time=1.0),
+            Hypothesis(id="fast", description="d", estimated_test_time=1.0),
+        ]
+        worktrees = {}
+        for hyp, sleep_time in zip(hypotheses, (1.0, 0.1)):
+            worktree = tmp_path / hyp.id
+            (worktree / ".falsification").mkdir(parents=True)
+            create_test_script(worktree, hyp.id, sleep_time=sleep_time)
+            worktrees[hyp.id] = worktree
+
+        async def consume():
+            start = time.monotonic()
+            arrivals = []
+            async for result in executor.stream(hypotheses, worktrees):
+                arrivals.append((result.hypothesis_id, time.monotonic() - start))
+            return arrivals
+
+        arrivals = asyncio.run(consume())
+
+        assert [hyp_id for hyp_id, _ in arrivals] == ["fast", "slow"]
+        assert arrivals[0][1] < 0.8
+
+    def test_stream_break_cancels_outstanding(self, tmp_path):
+        """Test leaving the stream early cancels tests still running"""
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=30, max_concurrent_tests=2))
+        hypotheses = [
+            Hypothesis(id="fast", description="d", estimated_test_time=1.0),
+            Hypothesis(id="slow", description="d", estimated_test_time=2.0),
+        ]
+        worktrees = {}
+        for hyp, sleep_time in zip(hypotheses, (0.1, 30)):
+            worktree = tmp_path / hyp.id
+            (worktree / ".falsification").mkdir(parents=True)
+            create_test_script(worktree, hyp.id, sleep_time=sleep_time)
+            worktrees[hyp.id] = worktree
+
+        async def first_result():
+            stream = executor.stream(hypotheses, worktrees)
+            async for result in stream:
+                await stream.aclose()
+                return result
+
+        start = time.monotonic()
+        result = asyncio.run(first_result())
+
+        assert result.hypothesis_id == "fast"
+        assert time.monotonic() - start < 10
+
     def test_should_parallelize_single_hypothesis(self, executor):
         """Test should_parallelize with single hypothesis"""
         hypotheses = [
@@ -181,6 +514,70 @@ class TestAsyncTestExecutor:
 
         assert executor.should_parallelize(hypotheses) is False
 
+    def test_should_parallelize_learned_durations(self, config, tmp_path):
+        """Test learned test times and warm overhead drive the decision"""
+        model = DurationModel(tmp_path / "durations.db")
+        executor = AsyncTestExecutor(config, duration_model=model)
+        hypotheses = [
+            Hypothesis(id=f"test_{i:03d}", description="Test", test_strategy=f"pytest -k case{i}",
+                       estimated_test_time=60.0)
+            for i in range(3)
+        ]
+
+        # Static estimates: 180s sequential vs 60 + 7 + 48 = 115s parallel
+        assert executor.should_parallelize(hypotheses) is True
+
+        # The tests really take 10s each: 30s sequential vs 10 + 7 + 48 = 65s
+        for hyp in hypotheses:
+            model.record_test(DurationModel.command_key(hyp.test_strategy), 10.0)
+        assert executor.predict_test_time(hypotheses[0]) == 10.0
+        assert executor.should_parallelize(hypotheses) is False
+
+        # With a warm pool overhead is 1s per worktree: 10 + 7 + 3 = 20s
+        for phase in ("acquire", "setup", "release"):
+            model.record_overhead(phase, "warm", 1.0 / 3)
+        assert executor.should_parallelize(hypotheses, pool_state="warm") is True
+
+    def test_durations_recorded(self, config, temp_worktree, tmp_path):
+        """Test completed tests are recorded in the duration model"""
+        model = DurationModel(tmp_path / "durations.db")
+        executor = AsyncTestExecutor(config, duration_model=model)
+        hyp = Hypothesis(id="test_rec", description="Test", test_strategy="true", estimated_test_time=60.0)
+        create_test_script(temp_worktree, hyp.id, exit_code=0, sleep_time=0.2)
+
+        result = executor.execute_single(hyp, temp_worktree)
+
+        assert executor.predict_test_time(hyp) == pytest.approx(result.duration)
+        assert model.get_stats()["test_samples"] == 1
+
+    def test_dispatch_predicts_once_per_hypothesis(self, tmp_path):
+        """Test scheduling and early stopping reuse each hypothesis's dispatch key"""
+        model = DurationModel(tmp_path / "durations.db")
+        executor = AsyncTestExecutor(
+            FalsificationConfig(test_timeout=30, max_concurrent_tests=1, early_stop_rank_cutoff=True),
+            duration_model=model
+        )
+        predicted = []
+        predict = model.predict_test_time
+        model.predict_test_time = lambda key, default: predicted.append(key) or predict(key, default)
+
+        hypotheses = [
+            Hypothesis(id=f"h{i}", description="d", test_strategy=f"check {i}",
+                       estimated_test_time=1.0, confidence_score=0.5 - i / 10)
+            for i in range(4)
+        ]
+        worktrees = {}
+        for hyp in hypotheses:
+            worktree = tmp_path / hyp.id
+            (worktree / ".falsification").mkdir(parents=True)
+            create_test_script(worktree, hyp.id, exit_code=0 if hyp.id != "h1" else 1)
+            worktrees[hyp.id] = worktree
+
+        results = executor.execute_parallel(hypotheses, worktrees)
+
+        assert [r.hypothesis_id for r in results] == ["h0", "h1"]
+        assert sorted(predicted) == sorted(DurationModel.command_key(h.test_strategy) for h in hypotheses)
+
     def test_should_parallelize_worthwhile(self, executor):
         """Test should_parallelize when parallel is worthwhile"""
         hypotheses = [
@@ -237,5 +634,126 @@ class TestAsyncTestExecutor:
         assert result.exit_code == 0
 
 
+class TestBatching:
+    """Test packing short hypotheses into shared worktrees"""
+
+    def test_pack_first_fit_decreasing(self):
+        """Test longest-first packing within the per-worktree budget"""
+        hypotheses = [
+            Hypothesis(id=hyp_id, description="d", estimated_test_time=t)
+            for hyp_id, t in [("a", 20.0), ("b", 50.0), ("c", 30.0), ("d", 40.0), ("e", 10.0)]
+        ]
+
+        batches = pack_hypotheses(hypotheses, max_seconds=60)
+
+        assert [[h.id for h in batch] for batch in batches] == [["b", "e"], ["d", "a"], ["c"]]
+
+    def test_pack_isolates_mutating_and_long_tests(self):
+        """Test mutating or over-budget hypotheses run alone"""
+        hypotheses = [
+            Hypothesis(id="long", description="d", estimated_test_time=90.0),
+            Hypothesis(id="mut", description="d", estimated_test_time=5.0, mutates_worktree=True),
+            Hypothesis(id="s1", description="d", estimated_test_time=5.0),
+            Hypothesis(id="s2", description="d", estimated_test_time=5.0),
+        ]
+
+        batches = pack_hypotheses(hypotheses, max_seconds=60)
+
+        assert [[h.id for h in batch] for batch in batches] == [["long"], ["mut"], ["s1", "s2"]]
+
+    def test_pack_disabled(self):
+        """Test batch_max_seconds=0 gives every hypothesis its own worktree"""
+        executor = AsyncTestExecutor(FalsificationConfig())
+        hypotheses = [Hypothesis(id=f"h{i}", description="d", estimated_test_time=1.0) for i in range(3)]
+
+        assert executor.plan_batches(hypotheses) == [[h] for h in hypotheses]
+
+    def test_should_parallelize_counts_worktrees(self):
+        """Test batching cuts the per-worktree overhead in the decision"""
+        hypotheses = [
+            Hypothesis(id=f"test_{i:03d}", description="Test", estimated_test_time=10.0)
+            for i in range(12)
+        ]
+
+        # Unbatched: 120s sequential vs 10 + 7 + (16*12) = 209s parallel
+        assert AsyncTestExecutor(FalsificationConfig()).should_parallelize(hypotheses) is False
+
+        # Three worktrees of 40s: 40 + 7 + (16*3) = 95s parallel
+        executor = AsyncTestExecutor(FalsificationConfig(batch_max_seconds=40))
+        assert len(executor.plan_batches(hypotheses)) == 3
+        assert executor.should_parallelize(hypotheses) is True
+
+    def test_shared_worktree_serialized_and_reset(self, git_repo):
+        """Test tests sharing a worktree run one at a time on a clean tree"""
+        worktree = add_clean_tree_scripts(git_repo, ["h0", "h1", "h2"])
+        hypotheses = [
+            Hypothesis(id=f"h{i}", description="d", estimated_test_time=1.0) for i in range(3)
+        ]
+
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=30, max_concurrent_tests=3))
+        results = executor.execute_parallel(hypotheses, {h.id: worktree for h in hypotheses})
+
+        assert [r.result for r in results] == [TestResult.PASS] * 3
+        assert sorted(r.metrics.get("reset_paths", 0) for r in results) == [0, 2, 2]
+
+    def test_shared_worktrees_run_concurrently(self, tmp_path, make_git_repo):
+        """Test each shared worktree stays busy and every queued test runs"""
+        shared = {
+            name: add_clean_tree_scripts(make_git_repo(tmp_path / name), [f"{name}{i}" for i in range(3)])
+            for name in ("a", "b")
+        }
+        hypotheses = [
+            Hypothesis(id=f"{name}{i}", description="d", estimated_test_time=1.0)
+            for i in range(3) for name in ("a", "b")
+        ]
+        worktrees = {hyp.id: shared[hyp.id[0]] for hyp in hypotheses}
+
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=30, max_concurrent_tests=3))
+        start = time.monotonic()
+        results = executor.execute_parallel(hypotheses, worktrees)
+        elapsed = time.monotonic() - start
+
+        assert sorted(r.hypothesis_id for r in results) == sorted(h.id for h in hypotheses)
+        assert all(r.result == TestResult.PASS for r in results)
+        # Both worktrees stay busy: three 0.2s rounds, not six
+        assert elapsed < 6 * 0.2
+
+    def test_sequential_shared_worktree_reset(self, git_repo):
+        """Test batched hypotheses run one by one each see a clean tree"""
+        worktree = add_clean_tree_scripts(git_repo, ["h0", "h1"])
+        hypotheses = [Hypothesis(id=f"h{i}", description="d", estimated_test_time=1.0) for i in range(2)]
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=30))
+
+        # As run_session does: reset before every test after the first
+        first = executor.execute_single(hypotheses[0], worktree)
+        second = executor.execute_single(hypotheses[1], worktree, reset=True)
+
+        assert first.result == second.result == TestResult.PASS
+        assert second.metrics["reset_paths"] == 2
+        assert (worktree / ".falsification" / "test_h0.sh").exists()
+
+        # Without the reset the second test sees the first one's changes
+        assert executor.execute_single(hypotheses[0], worktree).result == TestResult.FAIL
+
+    def test_shared_worktree_reset_keeps_environment(self, tmp_path, git_repo):
+        """Test a materialized environment link survives resets between batched tests"""
+        worktree = add_clean_tree_scripts(git_repo, ["h0", "h1"])
+        env = tmp_path / "env-cache" / ".venv"
+        env.mkdir(parents=True)
+        (worktree / ".venv").symlink_to(env)
+        for hyp_id in ("h0", "h1"):
+            script = worktree / ".falsification" / f"test_{hyp_id}.sh"
+            script.write_text("#!/bin/bash\n[ -L .venv ] || exit 1\n" + script.read_text().split("\n", 1)[1])
+        hypotheses = [Hypothesis(id=f"h{i}", description="d", estimated_test_time=1.0) for i in range(2)]
+
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=30, max_concurrent_tests=2))
+        results = executor.execute_parallel(hypotheses, {h.id: worktree for h in hypotheses})
+
+        assert [r.result for r in results] == [TestResult.PASS] * 2
+        assert sorted(r.metrics.get("reset_paths", 0) for r in results) == [0, 2]
+        assert (worktree / ".venv").is_symlink()
+        assert env.exists()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
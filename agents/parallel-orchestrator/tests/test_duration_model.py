@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for DurationModel
+"""
+
+import pytest
+from scripts.shared.duration_model import DurationModel
+
+
+@pytest.fixture
+def model(tmp_path):
+    """Create DurationModel with an empty database"""
+    return DurationModel(tmp_path / "durations.db", history=3)
+
+
+class TestDurationModel:
+    """Test DurationModel functionality"""
+
+    def test_predict_test_time_default(self, model):
+        """Test unobserved commands fall back to the default"""
+        assert model.predict_test_time(DurationModel.command_key("pytest -x"), default=42.0) == 42.0
+
+    def test_predict_test_time_median_of_recent(self, model):
+        """Test prediction is the median of the most recent samples"""
+        key = DurationModel.command_key("pytest -x")
+        for duration in (100.0, 10.0, 12.0, 11.0):
+            model.record_test(key, duration)
+
+        # history=3: the 100s outlier has aged out
+        assert model.predict_test_time(key, default=42.0) == 11.0
+        assert model.predict_test_time(DurationModel.command_key("make test"), default=5.0) == 5.0
+
+    def test_overhead_per_pool_state(self, model):
+        """Test warm and cold overhead are learned separately"""
+        assert model.predict_worktree_overhead("cold") == 16.0
+
+        model.record_overhead("acquire", "warm", 0.5)
+        model.record_overhead("setup", "warm", 0.25)
+        model.record_overhead("release", "warm", 0.25)
+        model.record_overhead("acquire", "cold", 6.0)
+
+        assert model.predict_worktree_overhead("warm") == 1.0
+        # Unobserved cold phases keep their static defaults (5s setup + 3s release)
+        assert model.predict_worktree_overhead("cold") == 14.0
+
+        with pytest.raises(ValueError):
+            model.record_overhead("acquire", "lukewarm", 1.0)
+
+    def test_persists_across_instances(self, model):
+        """Test samples are shared through the database file"""
+        key = DurationModel.command_key("pytest -x")
+        model.record_test(key, 7.0)
+
+        other = DurationModel(model.db_path)
+        assert other.predict_test_time(key) == 7.0
+        assert other.get_stats()["test_samples"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
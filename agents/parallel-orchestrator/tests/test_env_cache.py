@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for EnvironmentCache
+
+Uses a trivial setup command that creates a .venv directory and counts builds.
+"""
+
+import pytest
+from pathlib import Path
+from scripts.parallel_test.env_cache import EnvironmentCache, EnvironmentCacheError
+
+SETUP = "mkdir .venv && echo ok > .venv/marker && echo build >> ../builds.log"
+
+
+def make_worktree(root: Path, name: str, requirements: str = "requests==2.0\n") -> Path:
+    """Create a fake worktree with a requirements file"""
+    worktree = root / name
+    worktree.mkdir()
+    (worktree / "requirements.txt").write_text(requirements)
+    return worktree
+
+
+class TestEnvironmentCache:
+    """Test EnvironmentCache functionality"""
+
+    def test_build_once_then_link(self, tmp_path):
+        """Test second worktree with the same lockfile reuses the build"""
+        cache = EnvironmentCache(tmp_path / "cache", setup_command=SETUP)
+        wt_a = make_worktree(tmp_path, "a")
+        wt_b = make_worktree(tmp_path, "b")
+
+        assert cache.prepare(wt_a) == cache.prepare(wt_b)
+
+        assert (tmp_path / "cache" / "builds.log").read_text().count("build") == 1
+        assert (wt_b / ".venv").is_symlink()
+        assert (wt_b / ".venv" / "marker").read_text() == "ok\n"
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_lockfile_change_rebuilds(self, tmp_path):
+        """Test different lockfile contents get separate environments"""
+        cache = EnvironmentCache(tmp_path / "cache", setup_command=SETUP)
+        first = cache.prepare(make_worktree(tmp_path, "a"))
+        second = cache.prepare(make_worktree(tmp_path, "b", "requests==3.0\n"))
+
+        assert first != second
+        assert cache.get_stats()["misses"] == 2
+
+    def test_no_lockfiles(self, tmp_path):
+        """Test worktree without lockfiles is skipped"""
+        cache = EnvironmentCache(tmp_path / "cache", setup_command=SETUP)
+        worktree = tmp_path / "empty"
+        worktree.mkdir()
+
+        assert cache.prepare(worktree) is None
+        assert not (worktree / ".venv").exists()
+
+    def test_hardlink_mode(self, tmp_path):
+        """Test hardlink mode creates an independent directory tree"""
+        cache = EnvironmentCache(tmp_path / "cache", setup_command=SETUP, link_mode="hardlink")
+        worktree = make_worktree(tmp_path, "a")
+        env_hash = cache.prepare(worktree)
+
+        marker = worktree / ".venv" / "marker"
+        assert not (worktree / ".venv").is_symlink()
+        assert marker.stat().st_ino == (cache.entry_path(env_hash) / ".venv" / "marker").stat().st_ino
+
+    def test_failed_build_raises(self, tmp_path):
+        """Test failing setup command raises and leaves no partial entry"""
+        cache = EnvironmentCache(tmp_path / "cache", setup_command="exit 3")
+        worktree = make_worktree(tmp_path, "a")
+
+        with pytest.raises(EnvironmentCacheError):
+            cache.prepare(worktree)
+        assert not cache.entry_path(cache.lockfile_hash(worktree)).exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for HypothesisManager
+"""
+
+import pytest
+from scripts.parallel_test.hypothesis_manager import HypothesisManager
+from scripts.parallel_test.config import FalsificationConfig, Hypothesis, HypothesisStatus
+
+
+def make_hypothesis(hyp_id: str, probability: float = 0.5) -> Hypothesis:
+    """Helper to build a valid hypothesis"""
+    return Hypothesis(
+        id=hyp_id,
+        description=f"Hypothesis {hyp_id}",
+        test_strategy="true",
+        estimated_test_time=1.0,
+        probability=probability
+    )
+
+
+@pytest.fixture
+def manager():
+    """Manager with room for ten hypotheses"""
+    return HypothesisManager(FalsificationConfig(max_hypotheses=10))
+
+
+class TestHypothesisManager:
+    """Test HypothesisManager indexes"""
+
+    def test_lookup_by_id(self, manager):
+        """Test accepted hypotheses are found by ID and duplicates rejected"""
+        hyp = make_hypothesis("a")
+
+        assert manager.accept_hypothesis(hyp)
+        assert not manager.accept_hypothesis(make_hypothesis("a"))
+        assert manager.get_by_id("a") is hyp
+        assert manager.get_by_id("missing") is None
+        assert len(manager) == 1
+
+    def test_status_index_follows_updates(self, manager):
+        """Test status queries reflect every update"""
+        for hyp_id in "abc":
+            manager.accept_hypothesis(make_hypothesis(hyp_id))
+
+        assert manager.update_status("b", HypothesisStatus.TESTING)
+        assert manager.update_status("b", HypothesisStatus.SUPPORTED, {"exit_code": 1})
+        assert not manager.update_status("missing", HypothesisStatus.FALSIFIED)
+
+        assert [h.id for h in manager.get_by_status(HypothesisStatus.PENDING)] == ["a", "c"]
+        assert manager.get_by_status(HypothesisStatus.TESTING) == []
+        assert [h.id for h in manager.get_by_status(HypothesisStatus.SUPPORTED)] == ["b"]
+        assert manager.get_by_id("b").test_results == {"exit_code": 1}
+
+    def test_next_for_testing(self, manager):
+        """Test the next pending hypothesis follows ranking"""
+        for hyp_id, probability in [("low", 0.1), ("high", 0.9), ("mid", 0.5)]:
+            manager.accept_hypothesis(make_hypothesis(hyp_id, probability))
+        manager.rank_hypotheses()
+        manager.limit_to_top_k(3)
+
+        manager.update_status("high", HypothesisStatus.FALSIFIED)
+        assert manager.get_next_for_testing().id == "mid"
+
+        for hyp_id in ("mid", "low"):
+            manager.update_status(hyp_id, HypothesisStatus.FALSIFIED)
+        assert manager.get_next_for_testing() is None
+
+    def test_next_for_testing_ignores_status_order(self, manager):
+        """Test the next pending hypothesis follows ranking, not status arrival"""
+        for hyp_id, probability in [("low", 0.1), ("mid", 0.5), ("high", 0.9)]:
+            manager.accept_hypothesis(make_hypothesis(hyp_id, probability))
+        manager.limit_to_top_k(3)
+
+        # "high" returns to PENDING last, behind "low" in the status index
+        manager.update_status("high", HypothesisStatus.TESTING)
+        manager.update_status("mid", HypothesisStatus.FALSIFIED)
+        manager.update_status("high", HypothesisStatus.PENDING)
+
+        assert [h.id for h in manager.get_by_status(HypothesisStatus.PENDING)] == ["low", "high"]
+        assert manager.get_next_for_testing().id == "high"
+
+    def test_limit_and_clear_drop_indexes(self, manager):
+        """Test hypotheses leaving the pool leave the indexes"""
+        for hyp_id, probability in [("a", 0.9), ("b", 0.1), ("c", 0.5)]:
+            manager.accept_hypothesis(make_hypothesis(hyp_id, probability))
+
+        manager.limit_to_top_k(2)
+
+        assert manager.get_by_id("b") is None
+        assert not manager.update_status("b", HypothesisStatus.SUPPORTED)
+        assert {h.id for h in manager.get_by_status(HypothesisStatus.PENDING)} == {"a", "c"}
+
+        manager.clear_pool()
+        assert manager.get_by_id("a") is None
+        assert manager.get_by_status(HypothesisStatus.PENDING) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for ResultCache
+
+Uses a real git repository so HEAD and dirty-tree hashing are exercised.
+"""
+
+import os
+import subprocess
+import pytest
+from pathlib import Path
+from scripts.parallel_test.async_test_executor import AsyncTestExecutor
+from scripts.parallel_test.config import FalsificationConfig, Hypothesis, TestExecutionResult, TestResult
+from scripts.parallel_test.result_cache import ResultCache
+from scripts.parallel_test.worktree_orchestrator import WorktreeConfig, WorktreeOrchestrator
+
+
+@pytest.fixture
+def git_repo(git_repo):
+    """Add a test script to the shared repository"""
+    falsification_dir = git_repo / ".falsification"
+    falsification_dir.mkdir()
+    script = falsification_dir / "test_h1.sh"
+    script.write_text(f"#!/bin/bash\ncd {git_repo}\necho run >> .falsification/runs.log\nexit 1\n")
+    script.chmod(0o755)
+    return git_repo
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create ResultCache with an empty database"""
+    return ResultCache(tmp_path / "results.db")
+
+
+def make_result(hyp_id: str = "h1", result: TestResult = TestResult.FAIL) -> TestExecutionResult:
+    """Helper to build a test result"""
+    return TestExecutionResult(hypothesis_id=hyp_id, result=result, duration=3.0,
+                               stdout="boom\n", exit_code=1, metrics={"confidence": 0.85})
+
+
+class TestResultCache:
+    """Test ResultCache functionality"""
+
+    def test_key_tracks_code_changes(self, cache, git_repo):
+        """Test key changes with uncommitted edits but not with harness files"""
+        script = git_repo / ".falsification" / "test_h1.sh"
+        clean = cache.cache_key(git_repo, script)
+
+        (git_repo / ".falsification" / "runs.log").write_text("run\n")
+        assert cache.cache_key(git_repo, script) == clean
+
+        (git_repo / "module.py").write_text("VALUE = 2\n")
+        dirty = cache.cache_key(git_repo, script)
+        assert dirty != clean
+
+        (git_repo / "module.py").write_text("VALUE = 1\n")
+        assert cache.cache_key(git_repo, script) == clean
+
+    def test_key_ignores_worktree_location(self, cache, git_repo, tmp_path):
+        """Test identical tests in different worktrees share a key"""
+        other = tmp_path / "other"
+        subprocess.run(["git", "worktree", "add", "-q", "--detach", str(other)],
+                       cwd=git_repo, check=True, capture_output=True)
+        (other / ".falsification").mkdir()
+        script = git_repo / ".falsification" / "test_h1.sh"
+        other_script = other / ".falsification" / "test_h1.sh"
+        other_script.write_text(script.read_text().replace(str(git_repo), str(other)))
+
+        assert cache.cache_key(other, other_script) == cache.cache_key(git_repo, script)
+
+    def test_key_ignores_descriptive_header(self, cache, git_repo, tmp_path):
+        """Test rewording or renumbering a hypothesis keeps its key, its command doesn't"""
+        config = WorktreeConfig(
+            base_repo=git_repo,
+            worktree_dir=tmp_path / "worktrees",
+            use_pool=False,
+            learn_durations=False,
+            result_cache=False
+        )
+        hypotheses = [
+            Hypothesis(id="h1", description="Cache is stale", test_strategy="pytest -k cache"),
+            Hypothesis(id="h7", description="Stale cache entries", test_strategy="pytest -k cache",
+                       expected_behavior="fails"),
+            Hypothesis(id="h8", description="Cache is stale", test_strategy="pytest -k stale"),
+        ]
+
+        with WorktreeOrchestrator(config) as orch:
+            for hyp in hypotheses:
+                assert orch.setup_test_environment(git_repo, hyp)
+
+        keys = [
+            cache.cache_key(git_repo, git_repo / ".falsification" / f"test_{hyp.id}.sh")
+            for hyp in hypotheses
+        ]
+        assert keys[0] == keys[1]
+        assert keys[2] != keys[0]
+
+    def test_untracked_dirs_hashed_by_relative_path_and_content(self, cache, git_repo, tmp_path):
+        """Test the same untracked directory in two worktrees gives one key"""
+        other = tmp_path / "other"
+        subprocess.run(["git", "worktree", "add", "-q", "--detach", str(other)],
+                       cwd=git_repo, check=True, capture_output=True)
+        (other / ".falsification").mkdir()
+        script = git_repo / ".falsification" / "test_h1.sh"
+        other_script = other / ".falsification" / "test_h1.sh"
+        other_script.write_text(script.read_text().replace(str(git_repo), str(other)))
+
+        for worktree, mtime in ((git_repo, 1_000_000), (other, 2_000_000)):
+            fixture = worktree / "fixtures" / "data.txt"
+            fixture.parent.mkdir()
+            fixture.write_text("one\n")
+            os.utime(fixture, (mtime, mtime))
+        assert cache.cache_key(other, other_script) == cache.cache_key(git_repo, script)
+
+        # Same size, different content
+        (other / "fixtures" / "data.txt").write_text("two\n")
+        assert cache.cache_key(other, other_script) != cache.cache_key(git_repo, script)
+
+    def test_key_none_outside_git(self, cache, tmp_path):
+        """Test non-git directories are not cached"""
+        script = tmp_path / "test.sh"
+        script.write_text("exit 0\n")
+        assert cache.cache_key(tmp_path, script) is None
+
+    def test_put_get(self, cache):
+        """Test decisive results round-trip and others are not stored"""
+        assert cache.put("k1", make_result()) is True
+        assert cache.put("k2", make_result(result=TestResult.TIMEOUT)) is False
+
+        hit = cache.get("k1")
+        assert hit.result == TestResult.FAIL
+        assert hit.stdout == "boom\n"
+        assert hit.metrics["cache_hit"] is True
+        assert cache.get("k2") is None
+        assert cache.get_stats()["hits"] == 1
+
+    def test_ttl_expiry(self, tmp_path):
+        """Test entries older than the TTL are not returned"""
+        cache = ResultCache(tmp_path / "results.db", ttl_seconds=0)
+        cache.put("k1", make_result())
+        assert cache.get("k1") is None
+
+    def test_lru_eviction(self, tmp_path):
+        """Test least recently used entries are evicted beyond max_entries"""
+        cache = ResultCache(tmp_path / "results.db", max_entries=2)
+        cache.put("k1", make_result())
+        cache.put("k2", make_result())
+        assert cache.get("k1") is not None  # k2 is now least recently used
+        cache.put("k3", make_result())
+
+        assert cache.get("k2") is None
+        assert cache.get("k1") is not None
+        assert cache.get_stats()["entries"] == 2
+
+    def test_executor_skips_cached_test(self, cache, git_repo):
+        """Test a repeated test is served from the cache until the code changes"""
+        executor = AsyncTestExecutor(FalsificationConfig(test_timeout=10), result_cache=cache)
+        hyp = Hypothesis(id="h1", description="Test hypothesis")
+        runs = git_repo / ".falsification" / "runs.log"
+
+        first = executor.execute_single(hyp, git_repo)
+        second = executor.execute_single(hyp, git_repo)
+
+        assert first.result == second.result == TestResult.FAIL
+        assert "cache_hit" not in first.metrics
+        assert second.metrics["cache_hit"] is True
+        assert runs.read_text().count("run") == 1
+
+        (git_repo / "module.py").write_text("VALUE = 2\n")
+        third = executor.execute_single(hyp, git_repo)
+        assert "cache_hit" not in third.metrics
+        assert runs.read_text().count("run") == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for ResultsAnalyzer
+"""
+
+import pytest
+from scripts.parallel_test.results_analyzer import ResultsAnalyzer
+from scripts.parallel_test.hypothesis_manager import HypothesisManager
+from scripts.parallel_test.config import (
+    FalsificationConfig, Hypothesis, HypothesisStatus, TestResult, TestExecutionResult
+)
+
+
+def make_result(hyp_id: str, result: TestResult, duration: float = 2.0, **metrics) -> TestExecutionResult:
+    """Helper to build a test result"""
+    return TestExecutionResult(
+        hypothesis_id=hyp_id,
+        result=result,
+        duration=duration,
+        exit_code=0 if result == TestResult.PASS else 1,
+        metrics=metrics
+    )
+
+
+def usage(cpu_user: float, cpu_system: float, rss: float, reads: int = 0, writes: int = 0) -> dict:
+    """Helper for rusage metrics"""
+    return {
+        "cpu_user": cpu_user,
+        "cpu_system": cpu_system,
+        "max_rss_mb": rss,
+        "io_read_blocks": reads,
+        "io_write_blocks": writes,
+    }
+
+
+class TestResultsAnalyzer:
+    """Test ResultsAnalyzer functionality"""
+
+    def test_report_aggregates_resource_usage(self):
+        """Test report ranks hypotheses by CPU time and totals usage"""
+        hypotheses = [Hypothesis(id=f"h{i}", description=f"Hypothesis {i}") for i in range(3)]
+        results = [
+            make_result("h0", TestResult.PASS, **usage(0.5, 0.1, 50.0, 8, 0)),
+            make_result("h1", TestResult.FAIL, **usage(1.5, 0.5, 200.0, 0, 16)),
+            make_result("h2", TestResult.TIMEOUT),  # killed: no rusage
+        ]
+
+        report = ResultsAnalyzer().generate_report(hypotheses, results)
+        summary = report.resource_usage
+
+        assert summary["measured_tests"] == 2
+        assert summary["cpu_time_total"] == pytest.approx(2.6)
+        assert summary["avg_cpu_utilization"] == pytest.approx(0.65)
+        assert summary["peak_rss_mb"] == 200.0
+        assert summary["io_blocks_total"] == 24
+        assert [t["hypothesis_id"] for t in summary["per_test"]] == ["h1", "h0"]
+        assert summary["per_test"][0]["cpu_utilization"] == 1.0
+        assert summary["suggested_max_concurrent"] >= 1
+        assert report.to_dict()["resource_usage"] == summary
+
+    def test_suggested_concurrency_scales_with_utilization(self):
+        """Test CPU-heavy tests get a lower suggested concurrency than idle ones"""
+        analyzer = ResultsAnalyzer()
+        busy = analyzer.summarize_resource_usage([make_result("a", TestResult.PASS, 1.0, **usage(1.0, 0.0, 1.0))])
+        idle = analyzer.summarize_resource_usage([make_result("a", TestResult.PASS, 1.0, **usage(0.1, 0.0, 1.0))])
+
+        assert idle["suggested_max_concurrent"] > busy["suggested_max_concurrent"]
+
+    def test_incremental_analysis(self):
+        """Test counts and recommendation update as results arrive"""
+        hypotheses = [Hypothesis(id=f"h{i}", description=f"Hypothesis {i}") for i in range(3)]
+        analysis = ResultsAnalyzer().incremental(hypotheses)
+
+        summary = analysis.add(make_result("h0", TestResult.PASS))
+        assert summary["falsified"] == 1
+        assert summary["pending"] == ["h1", "h2"]
+        assert summary["recommended_action"] == "Waiting for 2 pending test(s)"
+        assert summary["provisional"] is True
+
+        summary = analysis.add(make_result("h2", TestResult.FAIL))
+        assert summary["supported"] == 1
+        assert summary["recommended_action"] == "Focus on implementing fix for: Hypothesis 2"
+        assert summary["provisional"] is True
+
+        # Duplicates are ignored
+        assert analysis.add(make_result("h2", TestResult.FAIL))["supported"] == 1
+
+        summary = analysis.add(make_result("h1", TestResult.PASS))
+        assert summary["falsified"] == 2
+        assert summary["provisional"] is False
+        assert analysis.complete
+
+        report = analysis.report()
+        assert [h.id for h in report.supported] == ["h2"]
+        assert len(report.test_results) == 3
+        assert not report.provisional
+
+    def test_report_with_untested_hypotheses_is_provisional(self):
+        """Test a report missing results is provisional until the action is settled"""
+        hypotheses = [Hypothesis(id=f"h{i}", description=f"Hypothesis {i}") for i in range(3)]
+        analyzer = ResultsAnalyzer()
+
+        # h2 could still be supported and turn "fix" into "refine"
+        report = analyzer.generate_report(hypotheses, [make_result("h0", TestResult.FAIL)])
+        assert report.provisional
+        assert "h1, h2" in report.next_steps[0]
+        assert report.to_dict()["provisional"] is True
+
+        report = analyzer.generate_report(
+            hypotheses, [make_result("h0", TestResult.FAIL), make_result("h1", TestResult.FAIL)]
+        )
+        assert report.recommended_action == "Refine hypotheses to isolate single root cause"
+        assert not report.provisional
+
+    def test_no_resource_usage(self):
+        """Test results without rusage produce an empty summary"""
+        analyzer = ResultsAnalyzer()
+        assert analyzer.summarize_resource_usage([make_result("a", TestResult.PASS)]) == {}
+
+        report = analyzer.generate_report([Hypothesis(id="a", description="A")], [make_result("a", TestResult.PASS)])
+        assert "Resource Usage" not in analyzer.export_report(report, "markdown")
+
+    def test_report_updates_manager_indexes(self):
+        """Test classifications reach the manager's status indexes"""
+        manager = HypothesisManager(FalsificationConfig(max_hypotheses=10))
+        hypotheses = [
+            Hypothesis(id=f"h{i}", description=f"Hypothesis {i}", estimated_test_time=1.0)
+            for i in range(3)
+        ]
+        for hyp in hypotheses:
+            manager.accept_hypothesis(hyp)
+        analyzer = ResultsAnalyzer(hypothesis_manager=manager)
+
+        analyzer.generate_report(hypotheses, [
+            make_result("h0", TestResult.PASS),
+            make_result("h1", TestResult.FAIL),
+        ])
+
+        assert [h.id for h in manager.get_by_status(HypothesisStatus.FALSIFIED)] == ["h0"]
+        assert [h.id for h in manager.get_by_status(HypothesisStatus.SUPPORTED)] == ["h1"]
+        assert [h.id for h in manager.get_by_status(HypothesisStatus.PENDING)] == ["h2"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Tests for worktree backends
+
+Uses a throwaway git repository so backends run real git commands.
+"""
+
+import os
+import subprocess
+import pytest
+from pathlib import Path
+from scripts.parallel_test.worktree_backend import (
+    CopyOnWriteBackend,
+    GitOperationError,
+    GitWorktreeBackend,
+    WorktreeBackend,
+    make_backend
+)
+from scripts.parallel_test.worktree_pool import WorktreePool
+from scripts.parallel_test.worktree_orchestrator import WorktreeConfig, WorktreeOrchestrator
+from scripts.parallel_test.config import Hypothesis
+
+
+def git(cwd: Path, *args) -> str:
+    """Run git and return stripped stdout"""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def reflink_available(directory: Path) -> bool:
+    """Check whether cp can share extents under a directory"""
+    directory.mkdir(parents=True, exist_ok=True)
+    source = directory / "reflink_probe"
+    source.write_text("probe")
+    result = subprocess.run(
+        ["cp", "--reflink=always", str(source), str(directory / "reflink_probe_copy")],
+        capture_output=True
+    )
+    return result.returncode == 0
+
+
+AS_ROOT = hasattr(os, "geteuid") and os.geteuid() == 0
+
+
+@pytest.fixture
+def git_repo(git_repo):
+    """Add two commits of pkg/module.py and an executable script to the shared repository"""
+    (git_repo / "pkg").mkdir()
+    (git_repo / "pkg" / "module.py").write_text("VALUE = 1\n")
+    (git_repo / "run.sh").write_text("#!/bin/sh\necho ok\n")
+    (git_repo / "run.sh").chmod(0o755)
+    git(git_repo, "add", ".")
+    git(git_repo, "commit", "-q", "-m", "add package")
+    (git_repo / "pkg" / "module.py").write_text("VALUE = 2\n")
+    git(git_repo, "commit", "-q", "-am", "second")
+    return git_repo
+
+
+class TestCopyOnWriteBackend:
+    """Test CopyOnWriteBackend functionality"""
+
+    @pytest.mark.parametrize("mode", CopyOnWriteBackend.MODES)
+    def test_creates_clean_checkout(self, git_repo, tmp_path, mode):
+        """Test materialized tree is a clean git checkout at the commit"""
+        if mode == "reflink" and AS_ROOT and not reflink_available(tmp_path / "probe"):
+            pytest.skip("reflink unsupported here and the hardlink fallback is refused as root")
+        backend = CopyOnWriteBackend(tmp_path / "templates", mode=mode)
+        first = git(git_repo, "rev-parse", "HEAD~1")
+
+        wt = backend.create(git_repo, tmp_path / "wt", commit=first)
+
+        assert (wt / "pkg" / "module.py").read_text() == "VALUE = 1\n"
+        assert git(wt, "rev-parse", "HEAD") == first
+        assert git(wt, "status", "--porcelain") == ""
+        assert (wt / "run.sh").stat().st_mode & 0o111
+        assert backend.get_stats()["created"] == 1
+
+    def test_trees_are_isolated(self, git_repo, tmp_path):
+        """Test replacing a file or moving HEAD leaves other trees untouched"""
+        backend = CopyOnWriteBackend(tmp_path / "templates", mode="hardlink")
+        wt_a = backend.create(git_repo, tmp_path / "a")
+        wt_b = backend.create(git_repo, tmp_path / "b")
+
+        git(wt_a, "checkout", "-q", "--detach", "HEAD~1")
+        script = wt_a / "run.sh"
+        script.unlink()
+        script.write_text("#!/bin/sh\nexit 1\n")
+
+        assert (wt_b / "pkg" / "module.py").read_text() == "VALUE = 2\n"
+        assert (wt_b / "run.sh").read_text() == "#!/bin/sh\necho ok\n"
+        assert git(wt_b, "status", "--porcelain") == ""
+        assert git(wt_b, "rev-parse", "HEAD") == git(git_repo, "rev-parse", "HEAD")
+
+    def test_template_built_once_per_commit(self, git_repo, tmp_path):
+        """Test trees at the same commit share one template"""
+        backend = CopyOnWriteBackend(tmp_path / "templates", mode="hardlink")
+        backend.create(git_repo, tmp_path / "a")
+        backend.create(git_repo, tmp_path / "b")
+
+        stats = backend.get_stats()
+        assert stats["templates_built"] == 1
+        assert stats["modes_used"] == {"hardlink": 2}
+
+    def test_evicts_least_recently_used_template(self, git_repo, tmp_path):
+        """Test templates beyond max_templates are removed"""
+        backend = CopyOnWriteBackend(tmp_path / "templates", mode="hardlink", max_templates=1)
+        first = git(git_repo, "rev-parse", "HEAD~1")
+
+        backend.create(git_repo, tmp_path / "a", commit=first)
+        backend.create(git_repo, tmp_path / "b")
+
+        assert not backend.is_built(first)
+        assert backend.get_stats()["templates"] == 1
+        # Trees made from an evicted template stay usable
+        assert (tmp_path / "a" / "pkg" / "module.py").read_text() == "VALUE = 1\n"
+
+    def test_shares_inodes(self, tmp_path):
+        """Test only hardlink trees (or a reflink fallback) report shared inodes"""
+        assert not GitWorktreeBackend().shares_inodes
+        assert CopyOnWriteBackend(tmp_path / "hardlink", mode="hardlink").shares_inodes
+
+        reflink = CopyOnWriteBackend(tmp_path / "reflink", mode="reflink")
+        assert reflink.shares_inodes is not reflink_available(tmp_path / "probe")
+        assert not list((tmp_path / "reflink").iterdir())
+
+    def test_reflink_fallback(self, git_repo, tmp_path):
+        """Test reflink falls back to hardlink, but never as root"""
+        if reflink_available(tmp_path / "templates"):
+            pytest.skip("filesystem supports reflink")
+        backend = CopyOnWriteBackend(tmp_path / "templates", mode="reflink")
+
+        if AS_ROOT:
+            with pytest.raises(GitOperationError):
+                backend.create(git_repo, tmp_path / "wt")
+            assert not (tmp_path / "wt").exists()
+        else:
+            backend.create(git_repo, tmp_path / "wt")
+            assert backend.get_stats()["modes_used"] == {"hardlink": 1}
+
+    @pytest.mark.parametrize("backend_name", ["git", "hardlink"])
+    def test_existing_tree_reset_to_commit(self, git_repo, tmp_path, backend_name):
+        """Test a leftover tree is cleaned and moved to the requested commit"""
+        backend = make_backend(backend_name, template_dir=tmp_path / "templates")
+        first = git(git_repo, "rev-parse", "HEAD~1")
+        wt = backend.create(git_repo, tmp_path / "wt")
+        (wt / "scratch.txt").write_text("left over")
+        (wt / "run.sh").unlink()
+
+        reused = backend.create(git_repo, tmp_path / "wt", commit=first)
+
+        assert reused == wt
+        assert git(wt, "rev-parse", "HEAD") == first
+        assert git(wt, "status", "--porcelain") == ""
+        assert (wt / "pkg" / "module.py").read_text() == "VALUE = 1\n"
+
+    @pytest.mark.parametrize("backend_name", ["git", "hardlink"])
+    def test_existing_plain_directory_replaced(self, git_repo, tmp_path, backend_name):
+        """Test a directory that is not a checkout is replaced by a fresh tree"""
+        backend = make_backend(backend_name, template_dir=tmp_path / "templates")
+        (tmp_path / "wt").mkdir()
+        (tmp_path / "wt" / "junk.txt").write_text("junk")
+
+        wt = backend.create(git_repo, tmp_path / "wt")
+
+        assert not (wt / "junk.txt").exists()
+        assert git(wt, "rev-parse", "HEAD") == git(git_repo, "rev-parse", "HEAD")
+
+    def test_remove(self, git_repo, tmp_path):
+        """Test remove deletes the tree but keeps the template"""
+        backend = CopyOnWriteBackend(tmp_path / "templates", mode="hardlink")
+        wt = backend.create(git_repo, tmp_path / "wt")
+
+        backend.remove(git_repo, wt)
+
+        assert not wt.exists()
+        assert backend.get_stats()["templates"] == 1
+
+    def test_make_backend(self, tmp_path):
+        """Test backend factory validates names"""
+        assert isinstance(make_backend("git"), GitWorktreeBackend)
+        assert make_backend("reflink", template_dir=tmp_path).mode == "reflink"
+        with pytest.raises(ValueError):
+            make_backend("hardlink")
+        with pytest.raises(ValueError):
+            make_backend("overlay", template_dir=tmp_path)
+
+    def test_incomplete_backend_cannot_be_instantiated(self):
+        """Test a backend missing remove() fails on construction, not mid-run"""
+        class CreateOnly(WorktreeBackend):
+            def create(self, repo_path, worktree_path, commit=None, sparse_paths=None):
+                return worktree_path
+
+        with pytest.raises(TypeError):
+            CreateOnly()
+
+
+class TestBackendIntegration:
+    """Test pool and orchestrator with a copy-on-write backend"""
+
+    def test_pool_reuses_hardlink_tree(self, git_repo, tmp_path):
+        """Test pooled copy trees are reset and moved between commits"""
+        backend = CopyOnWriteBackend(tmp_path / "templates", mode="hardlink")
+        pool = WorktreePool(git_repo, tmp_path / "pool", max_size=1, auto_load=False, backend=backend)
+        try:
+            wt = pool.acquire("hyp_1", sparse_paths=["pkg/module.py"])
+            (wt / "scratch.txt").write_text("dirty")
+            pool.release("hyp_1")
+
+            reused = pool.acquire("hyp_2", ref="HEAD~1")
+
+            assert reused == wt
+            assert not (wt / "scratch.txt").exists()
+            assert (wt / "pkg" / "module.py").read_text() == "VALUE = 1\n"
+            assert pool.get_stats()["backend"]["backend"] == "hardlink"
+        finally:
+            pool.stop_provisioner()
+            pool.stop_reaper()
+
+    def test_orchestrator_direct_mode(self, git_repo, tmp_path):
+        """Test WorktreeConfig.worktree_backend selects the backend"""
+        config = WorktreeConfig(
+            base_repo=git_repo,
+            worktree_dir=tmp_path / "worktrees",
+            use_pool=False,
+            worktree_backend="hardlink",
+            learn_durations=False,
+            result_cache=False
+        )
+        hyp = Hypothesis(id="h1", description="d", test_strategy="true", expected_behavior="ok")
+
+        with WorktreeOrchestrator(config) as orch:
+            worktrees = orch.create_worktrees([hyp])
+            wt = worktrees["h1"]
+            assert git(wt, "status", "--porcelain") == ""
+            assert isinstance(orch.backend, CopyOnWriteBackend)
+
+        assert not wt.exists()
+        assert (tmp_path / "worktrees" / "templates").is_dir()
+
+    def test_orchestrator_refuses_hardlink_for_mutating_hypotheses(self, git_repo, tmp_path):
+        """Test hypotheses that change tracked files never get shared-inode trees"""
+        config = WorktreeConfig(
+            base_repo=git_repo,
+            worktree_dir=tmp_path / "worktrees",
+            use_pool=False,
+            worktree_backend="hardlink",
+            learn_durations=False,
+            result_cache=False
+        )
+        hyp = Hypothesis(id="h1", description="d", test_strategy="true", mutates_worktree=True)
+
+        with WorktreeOrchestrator(config) as orch:
+            assert orch.backend.shares_inodes
+            with pytest.raises(ValueError, match="h1"):
+                orch.create_worktrees([hyp])
+            assert orch.active_worktrees == {}
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for WorktreeOrchestrator test environment setup
+
+Uses a throwaway git repository with direct (unpooled) worktrees.
+"""
+
+import json
+import os
+import subprocess
+import pytest
+from scripts.parallel_test.config import Hypothesis
+from scripts.parallel_test.worktree_orchestrator import WorktreeConfig, WorktreeOrchestrator
+
+
+@pytest.fixture
+def orchestrator(git_repo, tmp_path):
+    """Direct-mode orchestrator without persistent caches"""
+    config = WorktreeConfig(
+        base_repo=git_repo,
+        worktree_dir=tmp_path / "worktrees",
+        use_pool=False,
+        learn_durations=False,
+        result_cache=False
+    )
+    with WorktreeOrchestrator(config) as orch:
+        yield orch
+
+
+class TestSetupTestEnvironments:
+    """Test batched test environment setup"""
+
+    def test_config_survives_quotes(self, orchestrator):
+        """Test configs are valid JSON for descriptions with quotes and backslashes"""
+        hyp = Hypothesis(
+            id="h1",
+            description='Parser rejects "quoted" keys \\ and $VARS',
+            test_strategy='test "$(echo ok)" = ok',
+            expected_behavior="it's fine"
+        )
+        worktrees = orchestrator.create_worktrees([hyp])
+
+        assert orchestrator.setup_test_environment(worktrees["h1"], hyp)
+
+        config = json.loads((worktrees["h1"] / ".falsification" / "config_h1.json").read_text())
+        assert config["description"] == hyp.description
+        assert config["test_strategy"] == hyp.test_strategy
+        assert config["expected_behavior"] == hyp.expected_behavior
+
+    def test_batch_setup_reports_latency(self, orchestrator):
+        """Test one pass sets up every worktree and reports per-worktree latency"""
+        hypotheses = [
+            Hypothesis(id=f"h{i}", description=f"d{i}", test_strategy=f"exit {i % 2}")
+            for i in range(4)
+        ]
+        worktrees = orchestrator.create_worktrees(hypotheses)
+
+        latencies = orchestrator.setup_test_environments(worktrees, hypotheses)
+
+        assert set(latencies) == {h.id for h in hypotheses}
+        assert all(t >= 0 for t in latencies.values())
+        stats = orchestrator.get_setup_stats()
+        assert stats["count"] == 4
+        assert set(stats["per_worktree"]) == set(latencies)
+
+        for hyp in hypotheses:
+            script = worktrees[hyp.id] / ".falsification" / f"test_{hyp.id}.sh"
+            assert os.access(script, os.X_OK)
+            result = subprocess.run([str(script)], capture_output=True, text=True)
+            assert result.returncode == int(hyp.id[1:]) % 2
+            assert "Testing hypothesis: " + hyp.id in result.stdout
+
+    def test_batch_setup_skips_failures(self, orchestrator, tmp_path):
+        """Test a failed setup is omitted while the rest succeed"""
+        good = Hypothesis(id="good", description="d", test_strategy="true")
+        bad = Hypothesis(id="bad", description="d", test_strategy="true")
+        worktrees = orchestrator.create_worktrees([good])
+        worktrees["bad"] = tmp_path / "missing" / "worktree"
+
+        latencies = orchestrator.setup_test_environments(worktrees, [good, bad])
+
+        assert list(latencies) == ["good"]
+
+
+class TestSharedWorktrees:
+    """Test batches of hypotheses sharing one worktree"""
+
+    def test_batch_shares_worktree(self, orchestrator):
+        """Test batch members map to one worktree, others get their own"""
+        a, b, c = (Hypothesis(id=i, description="d", test_strategy="true") for i in "abc")
+
+        worktrees = orchestrator.create_worktrees([a, b, c], batches=[[a, b]])
+
+        assert worktrees["a"] == worktrees["b"] != worktrees["c"]
+        latencies = orchestrator.setup_test_environments(worktrees, [a, b, c])
+        assert latencies["a"] == latencies["b"]
+        for hyp_id in ("a", "b"):
+            assert (worktrees["a"] / ".falsification" / f"test_{hyp_id}.sh").exists()
+
+    def test_shared_worktree_removed_with_last_member(self, orchestrator):
+        """Test a shared worktree outlives all but its last hypothesis"""
+        a, b = (Hypothesis(id=i, description="d", test_strategy="true") for i in "ab")
+        worktrees = orchestrator.create_worktrees([a, b], batches=[[a, b]])
+
+        orchestrator.cleanup_worktrees(["a"])
+        assert worktrees["b"].is_dir()
+        assert orchestrator.list_active_worktrees() == ["b"]
+
+        orchestrator.cleanup_worktrees(["b"])
+        assert not worktrees["b"].exists()
+
+class TestPoolAutoscale:
+    """Test pooled-mode autoscaling limits"""
+
+    def test_autoscale_stays_within_pool_size(self, git_repo, tmp_path):
+        """Test autoscaling never grows the pool past pool_size by default"""
+        config = WorktreeConfig(
+            base_repo=git_repo,
+            worktree_dir=tmp_path / "worktrees",
+            pool_size=2,
+            pool_autoscale=True,
+            learn_durations=False,
+            result_cache=False
+        )
+        hypotheses = [Hypothesis(id=f"h{i}", description="d", test_strategy="true") for i in range(3)]
+
+        with WorktreeOrchestrator(config) as orch:
+            worktrees = orch.create_worktrees(hypotheses)
+
+            assert orch._pool.max_size == 2
+            assert len(worktrees) == 2
+
+    def test_autoscale_max_raises_limit(self, git_repo, tmp_path):
+        """Test an explicit pool_autoscale_max lets the pool grow to demand"""
+        config = WorktreeConfig(
+            base_repo=git_repo,
+            worktree_dir=tmp_path / "worktrees",
+            pool_size=2,
+            pool_autoscale=True,
+            pool_autoscale_max=4,
+            learn_durations=False,
+            result_cache=False
+        )
+        hypotheses = [Hypothesis(id=f"h{i}", description="d", test_strategy="true") for i in range(3)]
+
+        with WorktreeOrchestrator(config) as orch:
+            assert len(orch.create_worktrees(hypotheses)) == 3
+            assert orch._pool.max_size == 3
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Tests for WorktreePool
+
+Uses a throwaway git repository so pool operations run real git commands.
+"""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from pathlib import Path
+from scripts.parallel_test.worktree_pool import AutoscalePolicy, WorktreePool
+
+
+def wait_for(predicate, timeout: float = 30.0) -> bool:
+    """Poll predicate until it is true or timeout expires"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def pool_dir(tmp_path):
+    """Directory for pooled worktrees"""
+    return tmp_path / "pool"
+
+
+class TestWorktreePool:
+    """Test WorktreePool functionality"""
+
+    def test_acquire_and_release(self, git_repo, pool_dir):
+        """Test basic acquire/release cycle"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=2, auto_load=False)
+
+        wt = pool.acquire("hyp_1")
+        assert (wt / "module.py").exists()
+        assert pool.get_stats()["allocated"] == 1
+
+        assert pool.release("hyp_1") is True
+        stats = pool.get_stats()
+        assert stats["allocated"] == 0
+        assert stats["available"] == 1
+
+    def test_pool_exhausted(self, git_repo, pool_dir):
+        """Test acquire beyond capacity raises RuntimeError"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        pool.acquire("hyp_1")
+
+        with pytest.raises(RuntimeError):
+            pool.acquire("hyp_2")
+
+    def test_reused_worktree_is_reset(self, git_repo, pool_dir):
+        """Test released worktree is clean when acquired again"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+
+        wt = pool.acquire("hyp_1")
+        (wt / "module.py").write_text("VALUE = 2\n")
+        (wt / "scratch.txt").write_text("leftover")
+        pool.release("hyp_1")
+
+        wt = pool.acquire("hyp_2")
+        assert (wt / "module.py").read_text() == "VALUE = 1\n"
+        assert not (wt / "scratch.txt").exists()
+
+    def test_incremental_reset_restores_dirty_paths(self, git_repo, pool_dir):
+        """Test incremental reset restores modified, staged and untracked paths"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+
+        wt = pool.acquire("hyp_1")
+        (wt / "module.py").unlink()
+        (wt / "staged.py").write_text("x")
+        subprocess.run(["git", "add", "staged.py"], cwd=wt, check=True)
+        (wt / "nested" / "dir").mkdir(parents=True)
+        (wt / "nested" / "dir" / "file name.txt").write_text("leftover")
+        pool.release("hyp_1")
+
+        wt = pool.acquire("hyp_2")
+        status = subprocess.run(
+            ["git", "status", "--porcelain"], cwd=wt, capture_output=True, text=True, check=True
+        )
+        assert status.stdout == ""
+        assert (wt / "module.py").read_text() == "VALUE = 1\n"
+
+    def test_reset_timings_in_stats(self, git_repo, pool_dir):
+        """Test reset timings and clean-reset count appear in stats"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+
+        pool.acquire("hyp_1")  # Fresh worktree: no reset needed
+        pool.release("hyp_1")
+        pool.acquire("hyp_2")  # Untouched worktree: clean reset
+
+        stats = pool.get_stats()
+        assert stats["resets"] == 1
+        assert stats["clean_resets"] == 1
+        assert stats["reset_time_max"] >= stats["reset_time_avg"] > 0
+
+    def test_acquire_many(self, git_repo, pool_dir):
+        """Test concurrent batch acquire returns distinct worktrees"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=3, auto_load=False)
+
+        worktrees = pool.acquire_many(["hyp_1", "hyp_2", "hyp_3"], max_workers=3)
+
+        assert set(worktrees) == {"hyp_1", "hyp_2", "hyp_3"}
+        assert len(set(worktrees.values())) == 3
+        assert all((wt / "module.py").exists() for wt in worktrees.values())
+        assert pool.get_stats()["allocated"] == 3
+
+    def test_acquire_many_omits_exhausted(self, git_repo, pool_dir):
+        """Test batch acquire skips hypotheses beyond pool capacity"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=2, auto_load=False)
+
+        worktrees = pool.acquire_many(["hyp_1", "hyp_2", "hyp_3"])
+
+        assert len(worktrees) == 2
+        assert pool.get_stats()["total_worktrees"] == 2
+
+    def test_prewarm_provisions_ready_worktrees(self, git_repo, pool_dir):
+        """Test provisioner creates worktrees in the background"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=4, auto_load=False, prewarm=2)
+        try:
+            assert wait_for(lambda: pool.get_stats()["ready"] == 2)
+
+            wt = pool.acquire("hyp_1")
+            assert (wt / "module.py").exists()
+
+            # Provisioner refills the ready set after the acquire
+            assert wait_for(lambda: pool.get_stats()["ready"] == 2)
+            assert pool.get_stats()["total_worktrees"] == 3
+        finally:
+            pool.stop_provisioner()
+
+    def test_prewarm_resets_released_worktrees(self, git_repo, pool_dir):
+        """Test provisioner resets dirty worktrees instead of creating new ones"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False, prewarm=1)
+        try:
+            assert wait_for(lambda: pool.get_stats()["ready"] == 1)
+
+            wt = pool.acquire("hyp_1")
+            (wt / "scratch.txt").write_text("leftover")
+            pool.release("hyp_1")
+
+            assert wait_for(lambda: pool.get_stats()["ready"] == 1)
+            assert not (wt / "scratch.txt").exists()
+            assert pool.get_stats()["total_worktrees"] == 1
+        finally:
+            pool.stop_provisioner()
+
+    def test_idle_provisioner_does_not_rewrite_state(self, git_repo, pool_dir):
+        """Test polling without a provisioning job leaves the state file alone"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=2, auto_load=False, prewarm=1)
+        try:
+            assert wait_for(lambda: pool.get_stats()["ready"] == 1)
+            time.sleep(pool.POLL_INTERVAL)
+            before = pool.state_file.stat()
+
+            time.sleep(3 * pool.POLL_INTERVAL)
+
+            after = pool.state_file.stat()
+            assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+        finally:
+            pool.stop_provisioner()
+
+
+    def test_reset_on_release(self, git_repo, pool_dir):
+        """Test released worktree is reset in background before reuse"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=2, auto_load=False, reset_on_release=True)
+        try:
+            wt = pool.acquire("hyp_1")
+            (wt / "scratch.txt").write_text("leftover")
+            pool.release("hyp_1")
+
+            # Released tree is dirty/resetting, never ready before reset finishes
+            assert wait_for(lambda: pool.get_stats()["ready"] == 1)
+            stats = pool.get_stats()
+            assert stats["dirty"] == 0
+            assert stats["resetting"] == 0
+            assert not (wt / "scratch.txt").exists()
+
+            # Next acquire reuses the clean tree without resetting again
+            resets = stats["resets"]
+            assert pool.acquire("hyp_2") == wt
+            assert pool.get_stats()["resets"] == resets
+        finally:
+            pool.stop_provisioner()
+
+
+    def test_acquire_follows_base_head(self, git_repo, pool_dir):
+        """Test reused worktree moves to new base commit instead of staying stale"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        pool.acquire("hyp_1")
+        pool.release("hyp_1")
+
+        (git_repo / "module.py").write_text("VALUE = 2\n")
+        subprocess.run(["git", "commit", "-qam", "second"], cwd=git_repo, check=True)
+
+        wt = pool.acquire("hyp_2")
+        assert (wt / "module.py").read_text() == "VALUE = 2\n"
+        assert pool.get_stats()["total_worktrees"] == 1
+
+    def test_leftover_worktree_is_reset(self, git_repo, pool_dir):
+        """Test a tree left on disk without pool state is cleaned and moved to HEAD"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        wt = pool.acquire("hyp_1")
+        (wt / "module.py").write_text("dirty\n")
+        (wt / "scratch.txt").write_text("left over")
+        # Forget the pool (e.g. crashed session) but keep its tree
+        pool.state_file.unlink()
+
+        (git_repo / "module.py").write_text("VALUE = 2\n")
+        subprocess.run(["git", "commit", "-qam", "second"], cwd=git_repo, check=True)
+
+        fresh = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        reused = fresh.acquire("hyp_2")
+
+        assert reused == wt
+        assert (wt / "module.py").read_text() == "VALUE = 2\n"
+        assert not (wt / "scratch.txt").exists()
+
+    def test_leftover_plain_directory_is_replaced(self, git_repo, pool_dir):
+        """Test a non-worktree directory in a worktree's place is recreated"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        wt = pool.acquire("hyp_1")
+        pool.release("hyp_1")
+        pool.cleanup_all()
+        wt.mkdir(parents=True)
+        (wt / "junk.txt").write_text("junk")
+
+        fresh = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        reused = fresh.acquire("hyp_2")
+
+        assert reused == wt
+        assert (wt / "module.py").read_text() == "VALUE = 1\n"
+        assert not (wt / "junk.txt").exists()
+
+    def test_acquire_with_ref(self, git_repo, pool_dir):
+        """Test one pool serves several commits via ref"""
+        first = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=git_repo, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        (git_repo / "module.py").write_text("VALUE = 2\n")
+        subprocess.run(["git", "commit", "-qam", "second"], cwd=git_repo, check=True)
+
+        pool = WorktreePool(git_repo, pool_dir, max_size=2, auto_load=False)
+        old = pool.acquire("hyp_old", ref=first)
+        new = pool.acquire("hyp_new")
+
+        assert (old / "module.py").read_text() == "VALUE = 1\n"
+        assert (new / "module.py").read_text() == "VALUE = 2\n"
+        assert pool.get_stats()["commits"] == 2
+
+    def test_heads_persisted(self, git_repo, pool_dir):
+        """Test worktree HEAD SHAs survive persist/load"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        pool.acquire("hyp_1")
+        pool.release("hyp_1")
+        pool.persist_state()
+
+        reloaded = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=True)
+        assert reloaded.get_stats()["commits"] == 1
+
+    def test_shared_state_prevents_double_allocation(self, git_repo, pool_dir):
+        """Test two pools on one directory never hand out the same worktree"""
+        first = WorktreePool(git_repo, pool_dir, max_size=2, auto_load=False)
+        second = WorktreePool(git_repo, pool_dir, max_size=2, auto_load=False)
+
+        wt_a = first.acquire("hyp_a")
+        wt_b = second.acquire("hyp_b")
+        assert wt_a != wt_b
+
+        with pytest.raises(RuntimeError):
+            first.acquire("hyp_c")
+
+        # Released by one session, reusable by the other
+        second.release("hyp_b")
+        assert first.acquire("hyp_c") == wt_b
+
+    def test_shared_state_keeps_each_max_size(self, git_repo, pool_dir):
+        """Test a larger pool sharing the state never raises another's limit"""
+        large = WorktreePool(git_repo, pool_dir, max_size=4, auto_load=False)
+        large.acquire("hyp_a")
+
+        small = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=True)
+        with pytest.raises(RuntimeError):
+            small.acquire("hyp_b")
+
+        assert small.max_size == 1
+        assert json.loads(small.state_file.read_text())["max_size"] == 4
+
+    def test_shared_state_across_processes(self, git_repo, pool_dir):
+        """Test concurrent processes allocate distinct worktrees"""
+        script = (
+            "import sys\n"
+            "from scripts.parallel_test.worktree_pool import WorktreePool\n"
+            "pool = WorktreePool(sys.argv[1], sys.argv[2], max_size=4, auto_load=False)\n"
+            "print(pool.acquire(sys.argv[3]))\n"
+        )
+        root = Path(__file__).resolve().parent.parent
+        procs = [
+            subprocess.Popen(
+                [sys.executable, "-c", script, str(git_repo), str(pool_dir), f"hyp_{i}"],
+                cwd=root, stdout=subprocess.PIPE, text=True
+            )
+            for i in range(3)
+        ]
+        paths = [proc.communicate(timeout=60)[0].strip() for proc in procs]
+
+        assert all(proc.returncode == 0 for proc in procs)
+        assert len(set(paths)) == 3
+
+        pool = WorktreePool(git_repo, pool_dir, max_size=4, auto_load=False)
+        pool.persist_state()
+        assert pool.get_stats()["allocated"] == 3
+        assert list(pool_dir.glob("*.tmp")) == []
+
+    def test_dead_owner_lease_is_reclaimed(self, git_repo, pool_dir):
+        """Test allocation left by a crashed process returns to the pool"""
+        script = (
+            "import sys\n"
+            "from scripts.parallel_test.worktree_pool import WorktreePool\n"
+            "pool = WorktreePool(sys.argv[1], sys.argv[2], max_size=1, auto_load=False)\n"
+            "pool.acquire('hyp_crashed')\n"
+        )
+        root = Path(__file__).resolve().parent.parent
+        subprocess.run(
+            [sys.executable, "-c", script, str(git_repo), str(pool_dir)], cwd=root, check=True
+        )
+
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=True)
+        wt = pool.acquire("hyp_1")
+
+        assert (wt / "module.py").exists()
+        stats = pool.get_stats()
+        assert stats["leases_reaped"] == 1
+        assert stats["allocated"] == 1
+
+    def test_expired_lease_is_reclaimed(self, git_repo, pool_dir):
+        """Test lease without heartbeat expires after lease_ttl"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False, lease_ttl=0.2)
+        pool.stop_reaper()  # No heartbeat: simulate a hung owner
+        pool.acquire("hyp_1")
+
+        assert pool.reap_expired_leases() == 0
+        time.sleep(0.3)
+        assert pool.reap_expired_leases() == 1
+        assert pool.get_stats()["dirty"] == 1
+
+    def test_heartbeat_keeps_lease_alive(self, git_repo, pool_dir):
+        """Test renewed lease is not reclaimed"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False, lease_ttl=0.3)
+        try:
+            pool.acquire("hyp_1")
+            time.sleep(0.5)
+            assert pool.reap_expired_leases() == 0
+            assert pool.get_stats()["allocated"] == 1
+        finally:
+            pool.stop_reaper()
+
+    def test_autoscale_grows_to_demand_percentile(self, git_repo, pool_dir):
+        """Test recorded session peaks drive pre-growth of the next session"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        pool._demand_history = [1, 2, 3, 3]
+
+        result = pool.autoscale()
+
+        assert result["target"] == 3
+        assert result["created"] == 3
+        stats = pool.get_stats()
+        assert stats["max_size"] == 3
+        assert stats["ready"] == 3
+
+    def test_record_session_demand(self, git_repo, pool_dir):
+        """Test peak concurrent demand is recorded and persisted"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=3, auto_load=False)
+        pool.acquire_many(["hyp_1", "hyp_2"])
+        pool.release("hyp_1")
+        pool.acquire("hyp_3")
+
+        assert pool.record_session_demand() == 2
+        assert pool.demand_percentile() == 2
+
+        reloaded = WorktreePool(git_repo, pool_dir, max_size=3, auto_load=True)
+        assert reloaded.get_stats()["demand_history"] == [2]
+
+    def test_autoscale_trims_beyond_disk_budget(self, git_repo, pool_dir):
+        """Test idle worktrees over the disk budget are removed"""
+        pool = WorktreePool(
+            git_repo, pool_dir, max_size=3, auto_load=False,
+            autoscale_policy=AutoscalePolicy(disk_budget_mb=0.00002)  # ~2 tiny worktrees
+        )
+        pool.expand_pool(3)
+        pool._worktree_size = 10
+
+        result = pool.autoscale()
+
+        assert result["trimmed"] == 1
+        assert pool.get_stats()["total_worktrees"] == 2
+
+    def test_sparse_checkout(self, git_repo, pool_dir):
+        """Test sparse acquire materializes only the needed directories"""
+        for name in ("pkg_a", "pkg_b"):
+            (git_repo / name).mkdir()
+            (git_repo / name / "code.py").write_text(f"NAME = {name!r}\n")
+        subprocess.run(["git", "add", "."], cwd=git_repo, check=True)
+        subprocess.run(["git", "commit", "-qm", "packages"], cwd=git_repo, check=True)
+
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        wt = pool.acquire("hyp_1", sparse_paths=["pkg_a/code.py"])
+
+        assert (wt / "pkg_a" / "code.py").exists()
+        assert not (wt / "pkg_b").exists()
+        assert (wt / "module.py").exists()  # Top-level files always present
+        assert pool.get_stats()["sparse_worktrees"] == 1
+
+        # Reusing the tree without sparse paths restores a full checkout
+        pool.release("hyp_1")
+        wt = pool.acquire("hyp_2")
+        assert (wt / "pkg_b" / "code.py").exists()
+        assert pool.get_stats()["sparse_worktrees"] == 0
+
+
+    def test_cleanup_all_with_allocations(self, git_repo, pool_dir):
+        """Test cleanup_all releases allocations without deadlocking"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=3, auto_load=False)
+        worktrees = list(pool.acquire_many(["hyp_1", "hyp_2", "hyp_3"]).values())
+
+        cleaner = threading.Thread(target=pool.cleanup_all, daemon=True)
+        cleaner.start()
+        cleaner.join(timeout=30)
+
+        assert not cleaner.is_alive()
+        assert not any(wt.exists() for wt in worktrees)
+        assert pool.get_stats()["total_worktrees"] == 0
+        # One prune dropped every worktree's metadata
+        listed = subprocess.run(
+            ["git", "worktree", "list", "--porcelain"], cwd=git_repo,
+            capture_output=True, text=True, check=True
+        ).stdout
+        assert listed.count("worktree ") == 1
+        assert not (git_repo / ".git" / "worktrees").exists() or \
+            not any((git_repo / ".git" / "worktrees").iterdir())
+
+    def test_cleanup_all_is_idempotent(self, git_repo, pool_dir):
+        """Test repeated cleanup also removes untracked leftover trees"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=1, auto_load=False)
+        pool.acquire("hyp_1")
+        pool.cleanup_all()
+
+        stray = pool_dir / f"{WorktreePool.WORKTREE_PREFIX}-099"
+        stray.mkdir()
+        pool.cleanup_all()
+
+        assert not stray.exists()
+        assert not pool.state_file.exists()
+
+    def test_release_many(self, git_repo, pool_dir):
+        """Test bulk release returns every allocation to the pool"""
+        pool = WorktreePool(git_repo, pool_dir, max_size=2, auto_load=False)
+        pool.acquire_many(["hyp_1", "hyp_2"])
+
+        assert pool.release_many(["hyp_1", "hyp_2", "unknown"]) == 2
+        assert pool.get_stats()["allocated"] == 0
+        assert pool.get_stats()["available"] == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])